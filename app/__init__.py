@@ -40,7 +40,7 @@ from werkzeug.exceptions import HTTPException as WerkzeugHTTPException
 from werkzeug.exceptions import abort
 from werkzeug.local import LocalProxy
 
-from app import proxy_fix
+from app import batch_loader, json_codec, proxy_fix, request_timing
 from app.articles.routing import gca_url_for
 from app.asset_fingerprinter import asset_fingerprinter
 from app.commands import setup_commands
@@ -63,6 +63,7 @@ from app.navigation import (
     MainNavigation,
     OrgNavigation,
 )
+from app.notify_client import cache_encoding, request_memo
 from app.notify_client.api_key_api_client import api_key_api_client
 from app.notify_client.billing_api_client import billing_api_client
 from app.notify_client.complaint_api_client import complaint_api_client
@@ -73,6 +74,7 @@ from app.notify_client.invite_api_client import invite_api_client
 from app.notify_client.job_api_client import job_api_client
 from app.notify_client.letter_branding_client import letter_branding_client
 from app.notify_client.letter_jobs_client import letter_jobs_client
+from app.notify_client.local_cache import local_cache
 from app.notify_client.notification_api_client import notification_api_client
 from app.notify_client.org_invite_api_client import org_invite_api_client
 from app.notify_client.organisations_api_client import organisations_client
@@ -141,12 +143,17 @@ def create_app(application):
 
     init_app(application)
 
+    # Time every Redis command so it can be included in the request timings
+    redis_client.redis_store.provider_class = request_timing.TimedRedis
+
     for client in (
         # Gubbins
         csrf,
         login_manager,
         proxy_fix,
         request_helper,
+        json_codec,
+        cache_encoding,
         cache,
         # API clients
         api_key_api_client,
@@ -177,6 +184,7 @@ def create_app(application):
         statsd_client,
         zendesk_client,
         redis_client,
+        local_cache,
         bounce_rate_client,
     ):
         client.init_app(application)
@@ -241,12 +249,18 @@ def create_app(application):
 
 
 def init_app(application):
+    # Must run before anything that calls the API so it doesn't throw away their memoised responses
+    application.before_request(request_memo.reset)
+    application.before_request(batch_loader.reset)
+    request_timing.init_app(application)
     application.after_request(useful_headers_after_request)
     application.after_request(save_service_or_org_after_request)
     application.before_request(load_service_before_request)
     application.before_request(load_organisation_before_request)
     application.before_request(request_helper.check_proxy_header_before_request)
     application.before_request(load_request_nonce)
+    application.teardown_request(request_memo.reset)
+    application.teardown_request(batch_loader.reset)
 
     @application.before_request
     def make_session_permanent():
@@ -4,6 +4,7 @@ import requests
 from flask import abort, current_app, json
 from werkzeug.exceptions import Forbidden, NotFound
 
+from app import request_timing
 from app.articles import (
     GC_ARTICLES_AUTH_API_ENDPOINT,
     GC_ARTICLES_AUTH_TOKEN_CACHE_KEY,
@@ -14,6 +15,7 @@ from app.articles import (
     get_current_locale,
 )
 from app.extensions import redis_client
+from app.notify_client.cache_stats import HIT, MISS, SET, cache_stats
 
 
 def get_content(endpoint: str, params={}, auth_required=False, cacheable=True) -> Union[dict, None]:
@@ -23,7 +25,8 @@ def get_content(endpoint: str, params={}, auth_required=False, cacheable=True) -
 
     try:
         url = f"https://{base_url}/wp-json/{endpoint}"
-        response = requests.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+        with request_timing.timed(request_timing.HTTP):
+            response = requests.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
         parsed = json.loads(response.content.decode("utf-8"))
 
         if response.status_code == 403:
@@ -39,7 +42,9 @@ def get_content(endpoint: str, params={}, auth_required=False, cacheable=True) -
         """Long-term "Fallback" cache"""
         if cacheable:
             current_app.logger.info(f"Saving to cache: {cache_key}")
-            redis_client.set(cache_key, json.dumps(parsed), ex=GC_ARTICLES_FALLBACK_CACHE_TTL)
+            encoded = json.dumps(parsed)
+            redis_client.set(cache_key, encoded, ex=GC_ARTICLES_FALLBACK_CACHE_TTL)
+            cache_stats.record(SET, cache_key, len(encoded))
 
         return parsed
     except Forbidden:
@@ -49,12 +54,14 @@ def get_content(endpoint: str, params={}, auth_required=False, cacheable=True) -
         cached = redis_client.get(cache_key)
         if cached is not None:
             current_app.logger.info(f"Cache hit: {cache_key}")
+            cache_stats.record(HIT, cache_key, len(cached))
             obj = json.loads(cached)
             if isinstance(obj, list):
                 return obj[0]
             return obj
 
         current_app.logger.info(f"Cache miss: {cache_key}")
+        cache_stats.record(MISS, cache_key)
         return None
     except Exception as err:
         current_app.logger.info(err)
@@ -78,7 +85,8 @@ def validate_token(token):
 
     headers = {"Authorization": "Bearer {}".format(token)}
 
-    res = requests.post(url=url, headers=headers, timeout=REQUEST_TIMEOUT)
+    with request_timing.timed(request_timing.HTTP):
+        res = requests.post(url=url, headers=headers, timeout=REQUEST_TIMEOUT)
 
     return res.status_code == 200
 
@@ -96,7 +104,8 @@ def authenticate(username, password, base_endpoint) -> Union[str, None]:
 
     try:
         """Otherwise get a fresh one"""
-        res = requests.post(url=url, data={"username": username, "password": password}, timeout=REQUEST_TIMEOUT)
+        with request_timing.timed(request_timing.HTTP):
+            res = requests.post(url=url, data={"username": username, "password": password}, timeout=REQUEST_TIMEOUT)
 
         parsed = json.loads(res.text)
 
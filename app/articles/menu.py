@@ -9,6 +9,7 @@ from app.articles import (
 )
 from app.articles.api import get_content
 from app.extensions import redis_client
+from app.notify_client.cache_stats import HIT, MISS, SET, cache_stats
 
 
 def get_nav_items() -> Optional[list]:
@@ -27,11 +28,15 @@ def _get_nav_wp(locale: str) -> Optional[list]:
     cached = redis_client.get(cache_key)
     if cached is not None:
         current_app.logger.info(f"Cache hit: {cache_key}")
+        cache_stats.record(HIT, cache_key, len(cached))
         nav_response = json.loads(cached)
     else:
+        cache_stats.record(MISS, cache_key)
         nav_response = get_content(nav_url)
         if nav_response is not None:
-            redis_client.set(cache_key, json.dumps(nav_response), ex=GC_ARTICLES_NAV_CACHE_TTL)
+            encoded = json.dumps(nav_response)
+            redis_client.set(cache_key, encoded, ex=GC_ARTICLES_NAV_CACHE_TTL)
+            cache_stats.record(SET, cache_key, len(encoded))
             current_app.logger.info(f"Saving menu to cache: {cache_key}")
         else:
             return []
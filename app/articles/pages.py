@@ -9,6 +9,7 @@ from app.articles import (
 )
 from app.articles.api import get_content
 from app.extensions import redis_client
+from app.notify_client.cache_stats import HIT, MISS, SET, cache_stats
 
 
 def get_page_by_slug_with_cache(endpoint: str, params={"slug": ""}) -> Union[dict, None]:
@@ -20,13 +21,17 @@ def get_page_by_slug_with_cache(endpoint: str, params={"slug": ""}) -> Union[dic
 
     if cached is not None:
         current_app.logger.info(f"Cache hit: {cache_key}")
+        cache_stats.record(HIT, cache_key, len(cached))
         response = json.loads(cached)
     else:
+        cache_stats.record(MISS, cache_key)
         response = get_page_by_slug(endpoint, params)
 
         if response is not None:
             current_app.logger.info(f"Saving menu to cache: {cache_key}")
-            redis_client.set(cache_key, json.dumps(response), ex=GC_ARTICLES_DEFAULT_CACHE_TTL)
+            encoded = json.dumps(response)
+            redis_client.set(cache_key, encoded, ex=GC_ARTICLES_DEFAULT_CACHE_TTL)
+            cache_stats.record(SET, cache_key, len(encoded))
 
     return response
 
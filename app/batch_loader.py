@@ -0,0 +1,78 @@
+"""
+Load many things of the same kind from the API together, rather than one call at a time.
+
+Pages that list things often make an API call for each row, for example fetching the statistics
+for every API key a service has. A `BatchLoader` collects the keys it is asked for and resolves
+them in one go, either with a single call to a bulk endpoint (`load_many`) or by making the
+individual calls (`load_one`) concurrently with `app.fan_out.gather`:
+
+    api_key_statistics = BatchLoader(
+        "api_key_statistics", load_one=lambda key_id: api_key_api_client.get_api_key_statistics(key_id=key_id)
+    )
+
+    for api_key, statistics in zip(api_keys, api_key_statistics.load_many(api_key["id"] for api_key in api_keys)):
+        ...
+
+Code that knows which keys will be needed later can `prime` them, so that the first `load` fetches
+all of them at once. Results are kept on `flask.g` for the rest of the request.
+"""
+
+from functools import partial
+
+from flask import g, has_request_context
+
+from app.fan_out import gather
+
+_LOADERS = "_batch_loaders"
+
+
+class BatchLoader:
+    def __init__(self, name, load_one=None, load_many=None):
+        if (load_one is None) == (load_many is None):
+            raise TypeError("BatchLoader needs exactly one of load_one or load_many")
+
+        self.name = name
+        self._load_one = load_one
+        self._load_many = load_many
+
+    def _state(self):
+        loaders = g.setdefault(_LOADERS, {})
+        # Results so far, and keys waiting to be fetched with the next batch
+        return loaders.setdefault(self.name, ({}, {}))
+
+    def prime(self, keys):
+        if not has_request_context():
+            return
+
+        results, pending = self._state()
+        pending.update(dict.fromkeys(key for key in keys if key not in results))
+
+    def load(self, key):
+        return self.load_many([key])[0]
+
+    def load_many(self, keys):
+        keys = list(keys)
+
+        if not has_request_context():
+            results = self._fetch(list(dict.fromkeys(keys)), concurrently=False)
+            return [results[key] for key in keys]
+
+        results, pending = self._state()
+        to_fetch = [key for key in dict.fromkeys(keys + list(pending)) if key not in results]
+        if to_fetch:
+            results.update(self._fetch(to_fetch))
+            pending.clear()
+
+        return [results[key] for key in keys]
+
+    def _fetch(self, keys, concurrently=True):
+        if self._load_many:
+            return self._load_many(keys)
+        if not concurrently:
+            return {key: self._load_one(key) for key in keys}
+
+        return dict(zip(keys, gather(*(partial(self._load_one, key) for key in keys))))
+
+
+def reset(exception=None):
+    g.pop(_LOADERS, None)
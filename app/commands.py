@@ -1,4 +1,9 @@
-from flask import current_app
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import click
+from flask import current_app, g
 
 
 def list_routes():
@@ -7,5 +12,136 @@ def list_routes():
         print("{:10} {}".format(", ".join(rule.methods - set(["OPTIONS", "HEAD"])), rule.rule))  # noqa
 
 
+class RateLimiter:
+    """Spaces out calls to `wait` so that no more than `rate` return each second."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._next = time.monotonic()
+        self._lock = Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _most_active_services(count):
+    from app.notify_client.service_api_client import service_api_client
+
+    services = service_api_client.get_live_services_data()["data"]
+    services.sort(key=lambda service: (service["sms_totals"] or 0) + (service["email_totals"] or 0), reverse=True)
+    return [service["service_id"] for service in services[:count]]
+
+
+def _warming_tasks(service_ids, articles):
+    # Imported here rather than at the top, as this module is imported by app/__init__.py before the clients are
+    from app.articles.menu import get_nav_items
+    from app.articles.pages import get_page_by_slug_with_cache
+    from app.articles.routing import GC_ARTICLES_ROUTES
+    from app.notify_client.email_branding_client import email_branding_client
+    from app.notify_client.organisations_api_client import organisations_client
+    from app.notify_client.service_api_client import service_api_client
+    from app.notify_client.template_category_api_client import template_category_api_client
+    from app.notify_client.template_folder_api_client import template_folder_api_client
+
+    tasks = [
+        ("template_categories", template_category_api_client.get_all_template_categories),
+        ("organisations", organisations_client.get_organisations),
+        ("email_branding-None", email_branding_client.get_all_email_branding),
+    ]
+    for service_id in service_ids:
+        tasks += [
+            ("service-{}".format(service_id), lambda service_id=service_id: service_api_client.get_service(service_id)),
+            (
+                "service-{}-templates".format(service_id),
+                lambda service_id=service_id: service_api_client.get_service_templates(service_id),
+            ),
+            (
+                "service-{}-template-folders".format(service_id),
+                lambda service_id=service_id: template_folder_api_client.get_template_folders(service_id),
+            ),
+        ]
+
+    if articles:
+        for lang in current_app.config["LANGUAGES"]:
+
+            def warm_nav(lang=lang):
+                with current_app.test_request_context(query_string={"lang": lang}):
+                    get_nav_items()
+
+            tasks.append(("gc-articles nav {}".format(lang), warm_nav))
+            for routes in GC_ARTICLES_ROUTES.values():
+                slug = routes[lang].lstrip("/")
+
+                def warm_page(slug=slug, lang=lang):
+                    with current_app.test_request_context(query_string={"lang": lang}):
+                        get_page_by_slug_with_cache("wp/v2/pages", params={"slug": slug, "lang": lang})
+
+                tasks.append(("gc-articles {}/{}".format(lang, slug), warm_page))
+
+    return tasks
+
+
+def _run_task(app, limiter, name, warm):
+    limiter.wait()
+    start = time.monotonic()
+    with app.test_request_context():
+        # Usually set by a `before_request` hook, which a test request context doesn’t run
+        g.current_service = None
+        try:
+            warm()
+            error = None
+        except Exception as e:
+            error = e
+    return name, time.monotonic() - start, error
+
+
+@click.option("--services", default=100, show_default=True, help="How many of the most active services to warm.")
+@click.option("--concurrency", default=4, show_default=True, help="How many API calls to make at once.")
+@click.option("--rate", default=10.0, show_default=True, help="Most API calls to start each second, 0 for no limit.")
+@click.option("--articles/--no-articles", default=True, show_default=True, help="Whether to warm GC Articles pages.")
+def warm_cache(services, concurrency, rate, articles):
+    """
+    Fill the Redis cache with the values most requests need, like the most active services and
+    their templates, after Redis has failed over or a platform admin has cleared the cache.
+    Values already cached are left as they are.
+    """
+    app = current_app._get_current_object()
+    start = time.monotonic()
+
+    with app.test_request_context():
+        g.current_service = None
+        service_ids = _most_active_services(services) if services else []
+    tasks = _warming_tasks(service_ids, articles)
+    click.echo("Warming {} keys for {} services".format(len(tasks), len(service_ids)))
+
+    limiter = RateLimiter(rate)
+    timings, failures = [], []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(_run_task, app, limiter, name, warm) for name, warm in tasks]
+        for done, future in enumerate(futures, start=1):
+            name, elapsed, error = future.result()
+            if error:
+                failures.append(name)
+                click.echo("[{}/{}] {} failed after {:.2f}s: {}".format(done, len(tasks), name, elapsed, error), err=True)
+            else:
+                timings.append((elapsed, name))
+                click.echo("[{}/{}] {} in {:.2f}s".format(done, len(tasks), name, elapsed))
+
+    click.echo(
+        "Warmed {} keys in {:.1f}s, {} failed".format(len(timings), time.monotonic() - start, len(failures)),
+    )
+    for elapsed, name in sorted(timings, reverse=True)[:5]:
+        click.echo("  slowest: {} {:.2f}s".format(name, elapsed))
+
+    if failures:
+        raise click.ClickException("Failed to warm {} keys".format(len(failures)))
+
+
 def setup_commands(application):
     application.cli.command("list-routes")(list_routes)
+    application.cli.command("warm-cache")(warm_cache)
@@ -35,7 +35,29 @@ class Config(object):
     ADMIN_CLIENT_USER_NAME = "notify-admin"
     ANTIVIRUS_API_HOST = os.environ.get("ANTIVIRUS_API_HOST")
     ANTIVIRUS_API_KEY = os.environ.get("ANTIVIRUS_API_KEY")
+    # Per-route circuit breakers for the Notify API, see `app.notify_client.retry`
+    API_CIRCUIT_BREAKER_ENABLED = env.bool("API_CIRCUIT_BREAKER_ENABLED", True)
+    API_CIRCUIT_BREAKER_FAILURE_THRESHOLD = env.int("API_CIRCUIT_BREAKER_FAILURE_THRESHOLD", 5)
+    API_CIRCUIT_BREAKER_RESET_TIMEOUT = env.int("API_CIRCUIT_BREAKER_RESET_TIMEOUT", 30)
+    # Revalidate reads that opt in with `cache.revalidate` using conditional GETs. Only worth turning
+    # on once the API sends `ETag` or `Last-Modified`
+    API_CONDITIONAL_GET_ENABLED = env.bool("API_CONDITIONAL_GET_ENABLED", False)
+    API_CONNECT_TIMEOUT = env.float("API_CONNECT_TIMEOUT", 5)
+    # Number of independent API calls a view can make at once, see `app.fan_out.gather`
+    API_FAN_OUT_POOL_SIZE = env.int("API_FAN_OUT_POOL_SIZE", 8)
+    # Reuse identical API GET responses within a single request
+    API_GET_MEMO_ENABLED = env.bool("API_GET_MEMO_ENABLED", True)
     API_HOST_NAME = os.environ.get("API_HOST_NAME")
+    # Keep-alive connection pool shared by the Notify API clients in each worker
+    API_POOL_BLOCK = env.bool("API_POOL_BLOCK", False)
+    API_POOL_IDLE_TIMEOUT = env.int("API_POOL_IDLE_TIMEOUT", 50)  # below the load balancer's 60 second idle timeout
+    API_POOL_SIZE = env.int("API_POOL_SIZE", 20)
+    API_READ_TIMEOUT = env.float("API_READ_TIMEOUT", 30)
+    # Overall time allowed for an API request, including any retries
+    API_REQUEST_DEADLINE = env.float("API_REQUEST_DEADLINE", 45)
+    API_RETRY_ATTEMPTS = env.int("API_RETRY_ATTEMPTS", 3)
+    API_RETRY_BACKOFF_BASE = env.float("API_RETRY_BACKOFF_BASE", 0.1)
+    API_RETRY_BACKOFF_MAX = env.float("API_RETRY_BACKOFF_MAX", 2)
     ASSET_DOMAIN = os.getenv("ASSET_DOMAIN", "assets.notification.canada.ca")
     ASSET_PATH = "/static/"
     ASSETS_DEBUG = False
@@ -46,12 +68,21 @@ class Config(object):
 
     BULK_SEND_AWS_BUCKET = os.getenv("BULK_SEND_AWS_BUCKET")
 
+    # Cached values at least this many characters long are compressed, see app/notify_client/cache_encoding.py
+    CACHE_COMPRESSION_ENABLED = env.bool("CACHE_COMPRESSION_ENABLED", False)
+    CACHE_COMPRESSION_THRESHOLD = env.int("CACHE_COMPRESSION_THRESHOLD", 16 * 1024)
+    # Flask-Caching, for `cache.memoize`, shared between workers through Redis, see app/memoize_cache.py
+    CACHE_TYPE = "app.memoize_cache.SharedCache"
+    CACHE_KEY_PREFIX = "memoize-"
+    CACHE_LOCAL_TIMEOUT = env.int("CACHE_LOCAL_TIMEOUT", 60)
     CHECK_PROXY_HEADER = False
     CONTACT_EMAIL = os.environ.get("CONTACT_EMAIL", "assistance+notification@cds-snc.ca")
     CSV_MAX_ROWS = env.int("CSV_MAX_ROWS", 50_000)
     CSV_MAX_ROWS_BULK_SEND = env.int("CSV_MAX_ROWS_BULK_SEND", 100_000)
     CSV_UPLOAD_BUCKET_NAME = os.getenv("CSV_UPLOAD_BUCKET_NAME", "notification-alpha-canada-ca-csv-upload")
     DANGEROUS_SALT = os.environ.get("DANGEROUS_SALT")
+    # How long everyone viewing a service’s dashboard shares the same partials, see app/notify_client/dashboard_snapshot.py
+    DASHBOARD_SNAPSHOT_TTL = env.int("DASHBOARD_SNAPSHOT_TTL", 5)
     DEBUG = False
     DEBUG_KEY = os.environ.get("DEBUG_KEY", "")
     DEFAULT_FREE_SMS_FRAGMENT_LIMITS = {
@@ -95,7 +126,12 @@ class Config(object):
     HTTP_PROTOCOL = "http"
     INVITATION_EXPIRY_SECONDS = 3_600 * 24 * 2  # 2 days - also set on api
     IP_GEOLOCATE_SERVICE = os.environ.get("IP_GEOLOCATE_SERVICE", "").rstrip("/")
+    # "auto" uses orjson when it is installed, see app/json_codec.py
+    JSON_CODEC = os.getenv("JSON_CODEC", "auto")
     LANGUAGES = ["en", "fr"]
+    LOCAL_CACHE_ENABLED = env.bool("LOCAL_CACHE_ENABLED", False)
+    LOCAL_CACHE_MAX_ENTRIES = env.int("LOCAL_CACHE_MAX_ENTRIES", 1000)
+    LOCAL_CACHE_TTL = env.float("LOCAL_CACHE_TTL", 10)
     LOGO_UPLOAD_BUCKET_NAME = os.getenv("ASSET_UPLOAD_BUCKET_NAME", "notification-alpha-canada-ca-asset-upload")
     MAX_FAILED_LOGIN_COUNT = 10
     MOU_BUCKET_NAME = os.getenv("MOU_BUCKET_NAME", "")
@@ -125,6 +161,7 @@ class Config(object):
     SESSION_COOKIE_NAME = "notify_admin_session"
     SESSION_COOKIE_SAMESITE = "Lax"
     SESSION_COOKIE_SECURE = True
+    SERVER_TIMING_HEADER_ENABLED = env.bool("SERVER_TIMING_HEADER_ENABLED", False)
     SESSION_REFRESH_EACH_REQUEST = True
     SHOW_STYLEGUIDE = env.bool("SHOW_STYLEGUIDE", True)
 
@@ -193,11 +230,16 @@ class Test(Development):
     ADMIN_CLIENT_SECRET = os.environ.get("ADMIN_CLIENT_SECRET", "dev-notify-secret-key")
     ANTIVIRUS_API_HOST = "https://test-antivirus"
     ANTIVIRUS_API_KEY = "test-antivirus-secret"
+    API_CIRCUIT_BREAKER_ENABLED = False
+    API_GET_MEMO_ENABLED = False
     API_HOST_NAME = os.environ.get("API_HOST_NAME", "http://localhost:6011")
+    API_RETRY_BACKOFF_BASE = 0
     ASSET_DOMAIN = "static.example.com"
     DANGEROUS_SALT = os.environ.get("DANGEROUS_SALT", "dev-notify-salt")
     DEBUG = True
     DEBUG_KEY = "debug"
+    # Tests compare encoded JSON with the output of `json.dumps`
+    JSON_CODEC = "stdlib"
     MOU_BUCKET_NAME = "test-mou"
     NOTIFY_ENVIRONMENT = "test"
     SECRET_KEY = ["dev-notify-secret-key"]
@@ -0,0 +1,67 @@
+"""
+Run independent API calls concurrently from inside a view.
+
+Most pages make several API calls that don’t depend on each other, and the page takes as long as
+all of them added together. `gather` runs them on a small pool of greenlets and waits once, so the
+page takes about as long as the slowest one.
+
+    weekly_stats, monthly_stats = gather(
+        partial(template_statistics_client.get_template_statistics_for_service, service_id, limit_days=7),
+        partial(service_api_client.get_monthly_notification_stats, service_id, year),
+    )
+
+Each call runs in a copy of the caller's context, so it sees the same Flask app and request
+contexts (and so the same `g`, `current_user` and `current_service`) as the view that started it.
+"""
+
+import contextvars
+
+import gevent
+from flask import current_app
+from gevent.pool import Pool
+
+
+class GatherTimeout(Exception):
+    pass
+
+
+class _Outcome:
+    def __init__(self, call):
+        self.call = call
+        self.context = contextvars.copy_context()
+        self.value = None
+        self.exception = None
+
+    def run(self):
+        try:
+            self.value = self.context.run(self.call)
+        except Exception as e:
+            # Re-raised from `gather` rather than left for gevent to print as an unhandled error
+            self.exception = e
+
+
+def gather(*calls, timeout=None):
+    """
+    Call each of `calls` (functions that take no arguments) concurrently and return their results,
+    in the same order. If any of them raises, the first exception (in argument order) is raised
+    once they have all finished. If they haven't all finished after `timeout` seconds the rest are
+    killed and `GatherTimeout` is raised.
+    """
+    pool_size = min(len(calls), current_app.config["API_FAN_OUT_POOL_SIZE"])
+
+    if pool_size <= 1:
+        return [call() for call in calls]
+
+    outcomes = [_Outcome(call) for call in calls]
+    pool = Pool(pool_size)
+    greenlets = [pool.spawn(outcome.run) for outcome in outcomes]
+
+    if len(gevent.joinall(greenlets, timeout=timeout)) < len(greenlets):
+        pool.kill()
+        raise GatherTimeout("Calls did not all finish within {} seconds".format(timeout))
+
+    for outcome in outcomes:
+        if outcome.exception is not None:
+            raise outcome.exception
+
+    return [outcome.value for outcome in outcomes]
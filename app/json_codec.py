@@ -0,0 +1,91 @@
+"""
+JSON encoding and decoding for Notify API responses and the values we keep in Redis.
+
+Decoding the API's responses and encoding/decoding cached values happens on almost every request,
+and for big payloads like a service's templates it is a noticeable part of the time spent. Code on
+those paths calls `json_codec.dumps` and `json_codec.loads` rather than the `json` module, so the
+implementation can be swapped for a faster one.
+
+`JSON_CODEC` picks the implementation:
+
+- `auto` (the default) uses `orjson` if it is installed, and the standard library otherwise
+- `orjson` always uses `orjson`, failing at start up if it isn’t installed
+- `stdlib` always uses the standard library `json` module
+
+Both give back the same Python values, and `dumps` always returns a `str`. The text they produce can
+differ in whitespace, so nothing should compare encoded JSON as strings.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+AUTO = "auto"
+ORJSON = "orjson"
+STDLIB = "stdlib"
+
+
+class StdlibCodec:
+    name = STDLIB
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj)
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    name = ORJSON
+
+    @staticmethod
+    def dumps(obj):
+        # `json.dumps` turns integer keys into strings, so do the same
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    @staticmethod
+    def loads(data):
+        return orjson.loads(data)
+
+
+CODECS = {
+    STDLIB: StdlibCodec,
+    ORJSON: OrjsonCodec,
+}
+
+_codec = OrjsonCodec if orjson else StdlibCodec
+
+
+def use(name):
+    global _codec
+
+    if name == AUTO:
+        name = ORJSON if orjson else STDLIB
+    if name not in CODECS:
+        raise ValueError("JSON_CODEC must be one of {}, not '{}'".format(", ".join([AUTO, *CODECS]), name))
+    if name == ORJSON and orjson is None:
+        raise ImportError("JSON_CODEC is set to 'orjson' but orjson isn’t installed")
+
+    _codec = CODECS[name]
+
+
+def init_app(app):
+    use(app.config["JSON_CODEC"])
+
+
+def current():
+    return _codec.name
+
+
+def dumps(obj):
+    return _codec.dumps(obj)
+
+
+def loads(data):
+    """Decode a `str` or UTF-8 encoded `bytes`."""
+    return _codec.loads(data)
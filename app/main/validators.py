@@ -13,7 +13,7 @@ from notifications_utils.sanitise_text import SanitiseSMS
 from wtforms import ValidationError
 from wtforms.validators import Email
 
-from app import current_service, formatted_list, service_api_client
+from app import current_service, formatted_list, request_timing, service_api_client
 from app.main._blocked_passwords import blocked_passwords
 from app.utils import Spreadsheet, email_safe, email_safe_name, is_gov_user
 
@@ -172,13 +172,14 @@ def validate_callback_url(service_callback_url, bearer_token):
         raise ValidationError(_l("Enter a URL that starts with https://"))
 
     try:
-        response = requests.post(
-            url=service_callback_url,
-            allow_redirects=True,
-            json={"health_check": True},
-            headers={"Content-Type": "application/json", "Authorization": f"Bearer {bearer_token}"},
-            timeout=2,
-        )
+        with request_timing.timed(request_timing.HTTP):
+            response = requests.post(
+                url=service_callback_url,
+                allow_redirects=True,
+                json={"health_check": True},
+                headers={"Content-Type": "application/json", "Authorization": f"Bearer {bearer_token}"},
+                timeout=2,
+            )
 
         g.callback_response_time = response.elapsed.total_seconds()
 
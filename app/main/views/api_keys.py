@@ -8,6 +8,7 @@ from app import (
     notification_api_client,
     service_api_client,
 )
+from app.batch_loader import BatchLoader
 from app.main import main
 from app.main.forms import (
     CreateKeyForm,
@@ -24,6 +25,10 @@ from app.utils import documentation_url, email_safe, user_has_permissions
 
 dummy_bearer_token = "bearer_token_set"
 
+api_key_statistics = BatchLoader(
+    "api_key_statistics", load_one=lambda key_id: api_key_api_client.get_api_key_statistics(key_id=key_id)
+)
+
 
 @main.route("/services/<service_id>/api")
 @user_has_permissions("manage_api_keys")
@@ -64,8 +69,8 @@ def safelist(service_id):
 @main.route("/services/<service_id>/api/keys")
 @user_has_permissions("manage_api_keys")
 def api_keys(service_id):
-    for item in current_service.api_keys:
-        results = api_key_api_client.get_api_key_statistics(key_id=item["id"])
+    statistics = api_key_statistics.load_many(item["id"] for item in current_service.api_keys)
+    for item, results in zip(current_service.api_keys, statistics):
         item["email_sends"] = results["email_sends"]
         item["sms_sends"] = results["sms_sends"]
         item["total_sends"] = results["total_sends"]
@@ -19,16 +19,20 @@ from werkzeug.utils import redirect
 
 from app import (
     current_service,
+    get_current_locale,
     job_api_client,
     notification_api_client,
     service_api_client,
     template_statistics_client,
 )
 from app.extensions import annual_limit_client, bounce_rate_client
+from app.fan_out import gather
 from app.main import main
 from app.models.enum.bounce_rate_status import BounceRateStatus
 from app.models.enum.notification_statuses import NotificationStatuses
 from app.models.enum.template_types import TemplateType
+from app.notify_client import counters, dashboard_snapshot
+from app.request_timing import call_budget
 from app.statistics_utils import add_rate_to_job, get_formatted_percentage
 from app.utils import (
     DELIVERED_STATUSES,
@@ -65,21 +69,22 @@ def redirect_service_dashboard(service_id):
 @main.route("/services/<service_id>/problem-emails")
 @user_has_permissions("view_activity", "send_messages")
 def problem_emails(service_id):
-    # get the daily stats
-    bounce_rate_data = get_bounce_rate_data_from_redis(service_id)
-
-    problem_one_off_notifications_7days = notification_api_client.get_notifications_for_service(
-        service_id=service_id,
-        template_type=TemplateType.EMAIL.value,
-        status=NotificationStatuses.PERMANENT_FAILURE.value,
-        include_one_off=True,
-        include_jobs=False,
-        page_size=20,
-        limit_days=7,
+    bounce_rate_data, problem_one_off_notifications_7days, jobs_7days = gather(
+        # get the daily stats
+        partial(get_bounce_rate_data_from_redis, service_id),
+        partial(
+            notification_api_client.get_notifications_for_service,
+            service_id=service_id,
+            template_type=TemplateType.EMAIL.value,
+            status=NotificationStatuses.PERMANENT_FAILURE.value,
+            include_one_off=True,
+            include_jobs=False,
+            page_size=20,
+            limit_days=7,
+        ),
+        partial(get_jobs_and_calculate_hard_bounces, service_id, 7),
     )
 
-    jobs_7days = get_jobs_and_calculate_hard_bounces(service_id, 7)
-
     problem_jobs_7days = [job for job in jobs_7days if job["bounce_count"] > 0]
     twenty_four_hours_ago_timestamp = (datetime.now() - timedelta(hours=24)).timestamp()
 
@@ -145,6 +150,7 @@ def get_jobs_and_calculate_hard_bounces(service_id, limit_days):
 
 @main.route("/services/<service_id>")
 @user_has_permissions()
+@call_budget(api=12, redis=25)
 def service_dashboard(service_id):
     if session.get("invited_user"):
         session.pop("invited_user", None)
@@ -156,14 +162,14 @@ def service_dashboard(service_id):
     return render_template(
         "views/dashboard/dashboard.html",
         updates_url=url_for(".service_dashboard_updates", service_id=service_id),
-        partials=get_dashboard_partials(service_id),
+        partials=get_shared_dashboard_partials(service_id),
     )
 
 
 @main.route("/services/<service_id>/dashboard.json")
 @user_has_permissions("view_activity")
 def service_dashboard_updates(service_id):
-    return jsonify(**get_dashboard_partials(service_id))
+    return jsonify(**get_shared_dashboard_partials(service_id))
 
 
 @main.route("/services/<service_id>/template-activity")
@@ -357,6 +363,14 @@ def aggregate_notifications_stats(template_statistics):
     return notifications
 
 
+def get_shared_dashboard_partials(service_id):
+    return dashboard_snapshot.get(
+        service_id,
+        get_current_locale(current_app),
+        partial(get_dashboard_partials, service_id),
+    )
+
+
 def get_dashboard_partials(service_id):
     def aggregate_by_type(data, daily_data):
         counts = {"sms": 0, "email": 0, "letter": 0}
@@ -373,24 +387,29 @@ def get_dashboard_partials(service_id):
         }
         return counts
 
-    all_statistics_weekly = template_statistics_client.get_template_statistics_for_service(service_id, limit_days=7)
-    template_statistics_weekly = aggregate_template_usage(all_statistics_weekly)
-
-    scheduled_jobs, immediate_jobs = [], []
-    if job_api_client.has_jobs(service_id):
-        scheduled_jobs = job_api_client.get_scheduled_jobs(service_id)
-        immediate_jobs = [add_rate_to_job(job) for job in job_api_client.get_immediate_jobs(service_id)]
+    # None of these depend on each other, so fetch them all at once
+    (
+        all_statistics_weekly,
+        (scheduled_jobs, immediate_jobs),
+        # get the daily stats
+        (dashboard_totals_daily, highest_notification_count_daily, all_statistics_daily),
+        bounce_rate_data,
+        # get annual data from fact table (all data this year except today)
+        annual_data,
+    ) = gather(
+        partial(template_statistics_client.get_template_statistics_for_service, service_id, limit_days=7),
+        partial(_get_jobs, service_id),
+        partial(_get_daily_stats, service_id),
+        partial(get_bounce_rate_data_from_redis, service_id),
+        partial(service_api_client.get_monthly_notification_stats, service_id, get_current_financial_year()),
+    )
 
-    # get the daily stats
-    dashboard_totals_daily, highest_notification_count_daily, all_statistics_daily = _get_daily_stats(service_id)
+    template_statistics_weekly = aggregate_template_usage(all_statistics_weekly)
 
     column_width, max_notifiction_count = get_column_properties(number_of_columns=2)
     stats_weekly = aggregate_notifications_stats(all_statistics_weekly)
     dashboard_totals_weekly = (get_dashboard_totals(stats_weekly),)
-    bounce_rate_data = get_bounce_rate_data_from_redis(service_id)
 
-    # get annual data from fact table (all data this year except today)
-    annual_data = service_api_client.get_monthly_notification_stats(service_id, get_current_financial_year())
     annual_data = aggregate_by_type(annual_data, dashboard_totals_daily[0])
 
     return {
@@ -428,6 +447,17 @@ def get_dashboard_partials(service_id):
     }
 
 
+def _get_jobs(service_id):
+    if not job_api_client.has_jobs(service_id):
+        return [], []
+
+    scheduled_jobs, immediate_jobs = gather(
+        partial(job_api_client.get_scheduled_jobs, service_id),
+        partial(job_api_client.get_immediate_jobs, service_id),
+    )
+    return scheduled_jobs, [add_rate_to_job(job) for job in immediate_jobs]
+
+
 def _get_daily_stats(service_id):
     # TODO: get from redis, else fallback to template_statistics_client.get_template_statistics_for_service
     all_statistics_daily = template_statistics_client.get_template_statistics_for_service(service_id, limit_days=1)
@@ -450,19 +480,30 @@ class BounceRate:
 
 
 def get_bounce_rate_data_from_redis(service_id):
-    """This function gets bounce rate from Redis."""
+    """This function gets bounce rate from Redis, once per request."""
+    return counters.remember("bounce-rate-{}".format(service_id), partial(_read_bounce_rate, service_id))
+
+
+def _read_bounce_rate(service_id):
+    # Each of these is a few Redis commands, so make them at the same time rather than one after another
+    bounce_percentage, bounce_total, bounce_status, total_email_volume = gather(
+        partial(bounce_rate_client.get_bounce_rate, service_id),
+        partial(bounce_rate_client.get_total_hard_bounces, service_id),
+        partial(
+            bounce_rate_client.check_bounce_rate_status,
+            service_id=service_id,
+            volume_threshold=current_app.config["BR_DISPLAY_VOLUME_MINIMUM"],
+        ),
+        partial(bounce_rate_client.get_total_notifications, service_id),
+    )
 
     # Populate the bounce stats
     bounce_rate = BounceRate()
-    bounce_rate.bounce_percentage = bounce_rate_client.get_bounce_rate(service_id)
+    bounce_rate.bounce_percentage = bounce_percentage
     bounce_rate.bounce_percentage_display = 100.0 * bounce_rate.bounce_percentage
-    bounce_rate.bounce_total = bounce_rate_client.get_total_hard_bounces(service_id)
-    bounce_status = bounce_rate_client.check_bounce_rate_status(
-        service_id=service_id, volume_threshold=current_app.config["BR_DISPLAY_VOLUME_MINIMUM"]
-    )
+    bounce_rate.bounce_total = bounce_total
     bounce_rate.bounce_status = bounce_status
 
-    total_email_volume = bounce_rate_client.get_total_notifications(service_id)
     if total_email_volume < current_app.config["BR_DISPLAY_VOLUME_MINIMUM"]:
         bounce_rate.below_volume_threshold = True
 
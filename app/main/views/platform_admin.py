@@ -26,7 +26,9 @@ from app.main.forms import (
     RequiredDateFilterForm,
     ReturnedLettersForm,
 )
+from app.notify_client import cache_inspector, generations
 from app.notify_client.api_key_api_client import api_key_api_client
+from app.notify_client.cache_stats import cache_stats, hit_ratio
 from app.statistics_utils import (
     get_formatted_percentage,
     get_formatted_percentage_two_dp,
@@ -567,64 +569,10 @@ def letter_validation_preview(from_platform_admin):
 @main.route("/platform-admin/clear-cache", methods=["GET", "POST"])
 @user_is_platform_admin
 def clear_cache():
-    # note: `service-{uuid}-templates` cache is cleared for both services and templates.
+    # GC Articles are cached by the articles module rather than `cache.set`, so aren’t in a generation family
     CACHE_KEYS = OrderedDict(
         [
-            (
-                "user",
-                [
-                    "user-????????-????-????-????-????????????",
-                ],
-            ),
-            (
-                "service",
-                [
-                    "has_jobs-????????-????-????-????-????????????",
-                    "service-????????-????-????-????-????????????",
-                    "service-????????-????-????-????-????????????-templates",
-                    "service-????????-????-????-????-????????????-data-retention",
-                    "service-????????-????-????-????-????????????-template-folders",
-                ],
-            ),
-            (
-                "template",
-                [
-                    "service-????????-????-????-????-????????????-templates",
-                    "template-????????-????-????-????-????????????-version-*",
-                    "template-????????-????-????-????-????????????-versions",
-                ],
-            ),
-            (
-                "template_category",
-                [
-                    "template_categories",
-                    "template_category-????????-????-????-????-????????????",
-                    "service-????????-????-????-????-????????????-templates",
-                    "template-????????-????-????-????-????????????-version-*",
-                ],
-            ),
-            (
-                "email_branding",
-                [
-                    "email_branding-????????-????-????-????-????????????",
-                    "email_branding-None",
-                ],
-            ),
-            (
-                "letter_branding",
-                [
-                    "letter_branding",
-                    "letter_branding-????????-????-????-????-????????????",
-                ],
-            ),
-            (
-                "organisation",
-                [
-                    "organisations",
-                    "domains",
-                    "live-service-and-organisation-counts",
-                ],
-            ),
+            *generations.FAMILIES.items(),
             ("gc_articles", ["gc-articles--*", "gc-articles-fallback--*"]),
         ]
     )
@@ -635,14 +583,38 @@ def clear_cache():
     if form.validate_on_submit():
         to_delete = form.model_type.data
 
-        num_deleted = max(redis_client.delete_cache_keys_by_pattern(pattern) for pattern in CACHE_KEYS[to_delete])
-        msg = _l("Removed {count} {name} object{plural} from redis")
-        flash(
-            msg.format(count=num_deleted, name=to_delete, plural="s" if num_deleted != 1 else ""),
-            category="default",
-        )
+        if to_delete in generations.FAMILIES:
+            generations.bump(to_delete)
+            flash(_l("Cleared {name} objects from the cache").format(name=to_delete), category="default")
+        else:
+            num_deleted = max(redis_client.delete_cache_keys_by_pattern(pattern) for pattern in CACHE_KEYS[to_delete])
+            msg = _l("Removed {count} {name} object{plural} from redis")
+            flash(
+                msg.format(count=num_deleted, name=to_delete, plural="s" if num_deleted != 1 else ""),
+                category="default",
+            )
+
+    # The last finished inspection is shown until the one under way finishes
+    inspection_in_progress = cache_inspector.load()
+    return render_template(
+        "views/platform-admin/clear-cache.html",
+        form=form,
+        redis_enabled=redis_client.active,
+        cache_stats=sorted(
+            ((family, counts, hit_ratio(counts)) for family, counts in cache_stats.totals().items()),
+            key=lambda item: item[0],
+        ),
+        inspection=cache_inspector.load_completed() or inspection_in_progress,
+        inspection_in_progress=inspection_in_progress,
+    )
 
-    return render_template("views/platform-admin/clear-cache.html", form=form)
+
+@main.route("/platform-admin/clear-cache/inspect", methods=["POST"])
+@user_is_platform_admin
+def inspect_cache():
+    if redis_client.active:
+        cache_inspector.run()
+    return redirect(url_for(".clear_cache"))
 
 
 def sum_service_usage(service):
@@ -18,10 +18,6 @@ from flask_babel import lazy_gettext as _l
 from flask_login import current_user
 from notifications_python_client.errors import HTTPError
 from notifications_utils import SMS_CHAR_COUNT_LIMIT
-from notifications_utils.clients.redis import (
-    email_daily_count_cache_key,
-    sms_daily_count_cache_key,
-)
 from notifications_utils.columns import Columns
 from notifications_utils.recipients import (
     RecipientCSV,
@@ -39,7 +35,6 @@ from app import (
     get_current_locale,
     job_api_client,
     notification_api_client,
-    redis_client,
     service_api_client,
     template_statistics_client,
 )
@@ -53,7 +48,9 @@ from app.main.forms import (
 )
 from app.main.views.dashboard import aggregate_notifications_stats
 from app.models.user import Users
+from app.notify_client import counters
 from app.notify_client.notification_counts_client import notification_counts_client
+from app.request_timing import call_budget
 from app.s3_client.s3_csv_client import (
     copy_bulk_send_file_to_uploads,
     list_bulk_send_uploads,
@@ -77,11 +74,11 @@ from app.utils import (
 
 
 def daily_sms_fragment_count(service_id):
-    return int(redis_client.get(sms_daily_count_cache_key(service_id)) or "0")
+    return counters.daily_counts(service_id)["sms"] or 0
 
 
 def daily_email_count(service_id):
-    return int(redis_client.get(email_daily_count_cache_key(service_id)) or "0")
+    return counters.daily_counts(service_id)["email"] or 0
 
 
 def service_can_bulk_send(service_id):
@@ -637,6 +634,8 @@ def _check_messages(service_id, template_id, upload_id, preview_row, letters_as_
     try:
         # The happy path is that the job doesn’t already exist, so the
         # API will return a 404 and the client will raise HTTPError.
+        # This isn’t cached: it guards against the same file being sent twice, so it has to see a
+        # job created a moment ago.
         job_api_client.get_job(service_id, upload_id)
 
         # the job exists already - so go back to the templates page
@@ -774,6 +773,7 @@ def _check_messages(service_id, template_id, upload_id, preview_row, letters_as_
     methods=["GET"],
 )
 @user_has_permissions("send_messages", restrict_admin_usage=True)
+@call_budget(api=10, redis=20)
 def check_messages(service_id, template_id, upload_id, row_index=2):
     current_lang = get_current_locale(current_app)
     data = _check_messages(service_id, template_id, upload_id, row_index, user_language=current_lang)
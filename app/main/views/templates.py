@@ -1,4 +1,3 @@
-import json
 from datetime import datetime, timedelta
 from string import ascii_uppercase
 
@@ -26,6 +25,7 @@ from notifications_utils.recipients import first_column_headings
 from app import (
     current_service,
     get_current_locale,
+    json_codec,
     service_api_client,
     template_api_prefill_client,
     template_category_api_client,
@@ -58,6 +58,7 @@ from app.models.template_list import (
     TemplateLists,
 )
 from app.notify_client.notification_counts_client import notification_counts_client
+from app.request_timing import call_budget
 from app.template_previews import TemplatePreview, get_page_count_for_letter
 from app.utils import (
     email_or_sms_not_enabled,
@@ -105,14 +106,14 @@ def get_email_preview_template(template, template_id, service_id):
 
 def set_preview_data(data, service_id, template_id=None):
     key = f"template-preview:{service_id}:{template_id}"
-    redis_client.set(key=key, value=json.dumps(data), ex=int(timedelta(days=1).total_seconds()))
+    redis_client.set(key=key, value=json_codec.dumps(data), ex=int(timedelta(days=1).total_seconds()))
 
 
 def get_preview_data(service_id, template_id=None):
     key = f"template-preview:{service_id}:{template_id}"
     data = redis_client.get(key)
     if data:
-        return json.loads(data)
+        return json_codec.loads(data)
     else:
         return dict()
 
@@ -294,6 +295,7 @@ def start_tour(service_id, template_id):
     methods=["GET", "POST"],
 )
 @user_has_permissions()
+@call_budget(api=6, redis=15)
 def choose_template(service_id, template_type="all", template_folder_id=None):
     template_folder = current_service.get_template_folder(template_folder_id)
 
@@ -82,17 +82,18 @@ def redirect_when_logged_in(user, platform_admin):
     else:
         url = url_for("main.show_accounts_or_dashboard")
 
-    if len(user.login_events) > 1:
+    login_events = user.login_events
+    if len(login_events) > 1:
 
         def parse_ua(ua):
             user_agent = parse(ua)
             return str(user_agent)
 
-        session[EVENTS_KEY] = user.login_events
+        session[EVENTS_KEY] = login_events
 
         return render_template(
             "views/login_events.html",
-            events=user.login_events,
+            events=login_events,
             next=url,
             parse_ua=parse_ua,
         )
@@ -0,0 +1,159 @@
+"""
+A Flask-Caching backend for `cache.memoize` that is shared by every worker.
+
+With Flask-Caching’s `SimpleCache` each worker keeps its own copy, so a memoized computation like
+`get_latest_stats` runs once per worker on every pod each time it expires. This backend keeps values
+in Redis under `CACHE_KEY_PREFIX`, so a value computed by one worker is used by all of them. Each
+worker also keeps what it reads in memory for up to `CACHE_LOCAL_TIMEOUT` seconds, so the most used
+values don’t cost a round trip on every call.
+
+When a value is missing, the first worker to ask for it takes a lock (see
+`app.notify_client.single_flight`) and is told it’s a miss, so `memoize` computes it and stores it
+with `set`, which releases the lock. Workers that ask in the meantime wait for that value instead of
+computing it themselves. If computing it fails `set` is never called, so the lock is also released
+at the end of the request, or when the same caller asks for the value again.
+
+Values are pickled, as with Flask-Caching’s own Redis backend. Without Redis the backend is only the
+in-memory cache, which is how `SimpleCache` behaved.
+"""
+
+import logging
+import pickle
+from threading import get_ident
+
+from cachelib import SimpleCache
+from flask_caching.backends.base import BaseCache
+
+from app.extensions import redis_client
+from app.notify_client import single_flight
+
+logger = logging.getLogger(__name__)
+
+
+class SharedCache(BaseCache):
+    def __init__(self, default_timeout=300, key_prefix="memoize-", local_timeout=60, threshold=500):
+        super().__init__(default_timeout=default_timeout)
+        self.key_prefix = key_prefix
+        self.local_timeout = local_timeout
+        self._local = SimpleCache(threshold=threshold, default_timeout=local_timeout)
+        # The token for each lock this worker holds and who took it, released once the value has been stored
+        self._lock_tokens = {}
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(
+            key_prefix=config["CACHE_KEY_PREFIX"],
+            local_timeout=config["CACHE_LOCAL_TIMEOUT"],
+            threshold=config["CACHE_THRESHOLD"],
+        )
+        shared_cache = cls(*args, **kwargs)
+        app.teardown_request(shared_cache.release_locks)
+        return shared_cache
+
+    def _redis_key(self, key):
+        return self.key_prefix + key
+
+    def _local_timeout(self, timeout):
+        return min(timeout, self.local_timeout) if timeout else self.local_timeout
+
+    def _keep_locally(self, key, value, timeout=None):
+        self._local.set(key, value, timeout=self._local_timeout(timeout))
+
+    def _release_lock(self, redis_key):
+        token, _owner = self._lock_tokens.pop(redis_key)
+        single_flight.release(redis_key, token)
+
+    def release_locks(self, exception=None):
+        """Release the locks taken by this caller for values it never stored, like when computing one failed."""
+        for redis_key, (_token, owner) in list(self._lock_tokens.items()):
+            if owner == get_ident():
+                self._release_lock(redis_key)
+
+    def get(self, key):
+        value = self._local.get(key)
+        if value is not None or not redis_client.active:
+            return value
+
+        redis_key = self._redis_key(key)
+        if self._lock_tokens.get(redis_key, (None, None))[1] == get_ident():
+            # Asked again without having stored it, so computing it last time must have failed
+            self._release_lock(redis_key)
+
+        data = redis_client.get(redis_key)
+        if data is None:
+            token = single_flight.acquire(redis_key)
+            if token is not None:
+                # Our caller computes the value and stores it with `set`
+                self._lock_tokens[redis_key] = (token, get_ident())
+                return None
+            data = single_flight.wait_for(redis_key, lambda: redis_client.get(redis_key))
+            if data is None:
+                return None
+
+        value = pickle.loads(data)
+        self._keep_locally(key, value)
+        return value
+
+    def get_many(self, *keys):
+        # Used by `memoize` for the version of each function, which doesn’t need the lock
+        values = [self._local.get(key) for key in keys]
+        missing = [index for index, value in enumerate(values) if value is None]
+        if not missing or not redis_client.active:
+            return values
+
+        try:
+            stored = redis_client.redis_store.mget([self._redis_key(keys[index]) for index in missing])
+        except Exception:
+            logger.exception("Failed to get memoized values from Redis")
+            return values
+
+        for index, data in zip(missing, stored):
+            if data is not None:
+                values[index] = pickle.loads(data)
+                self._keep_locally(keys[index], values[index])
+        return values
+
+    def has(self, key):
+        if self._local.has(key):
+            return True
+        return bool(redis_client.active and redis_client.redis_store.exists(self._redis_key(key)))
+
+    def set(self, key, value, timeout=None):
+        timeout = self._normalize_timeout(timeout)
+        self._keep_locally(key, value, timeout)
+        if not redis_client.active:
+            return True
+
+        redis_key = self._redis_key(key)
+        redis_client.set(redis_key, pickle.dumps(value), ex=timeout or None)
+        if redis_key in self._lock_tokens:
+            self._release_lock(redis_key)
+        return True
+
+    def set_many(self, mapping, timeout=None):
+        for key, value in mapping.items():
+            self.set(key, value, timeout=timeout)
+        return list(mapping.keys())
+
+    def add(self, key, value, timeout=None):
+        timeout = self._normalize_timeout(timeout)
+        if not redis_client.active:
+            return self._local.add(key, value, timeout=self._local_timeout(timeout))
+        return bool(redis_client.set(self._redis_key(key), pickle.dumps(value), ex=timeout or None, nx=True))
+
+    def delete(self, key):
+        self._local.delete(key)
+        if redis_client.active:
+            redis_client.delete(self._redis_key(key))
+        return True
+
+    def delete_many(self, *keys):
+        for key in keys:
+            self.delete(key)
+        return list(keys)
+
+    def clear(self):
+        self._local.clear()
+        if redis_client.active:
+            redis_client.delete_cache_keys_by_pattern(self._redis_key("*"))
+        return True
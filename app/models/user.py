@@ -5,6 +5,7 @@ from flask_login import AnonymousUserMixin, UserMixin, login_user
 from notifications_python_client.errors import HTTPError
 from werkzeug.utils import cached_property
 
+from app.batch_loader import BatchLoader
 from app.models import JSONModel, ModelList
 from app.models.organisation import Organisation
 from app.models.roles_and_permissions import (
@@ -17,6 +18,8 @@ from app.notify_client.org_invite_api_client import org_invite_api_client
 from app.notify_client.user_api_client import user_api_client
 from app.utils import is_gov_user
 
+invited_by_users = BatchLoader("invited_by_users", load_one=lambda user_id: user_api_client.get_user(user_id))
+
 
 def _get_service_id_from_view_args():
     if not request.view_args:
@@ -277,7 +280,7 @@ class User(JSONModel, UserMixin):
     def sort_services(services):
         return sorted(services, key=lambda service: service.name.lower())
 
-    @property
+    @cached_property
     def services(self):
         from app.models.service import Service
 
@@ -475,7 +478,7 @@ class InvitedUser(JSONModel):
 
     @property
     def from_user(self):
-        return User.from_id(self._from_user)
+        return User(invited_by_users.load(self._from_user))
 
     @property
     def sms_auth(self):
@@ -76,6 +76,7 @@ class AdminNavigation(Navigation):
         },
         "clear_cache": {
             "clear_cache",
+            "inspect_cache",
         },
     }
 
@@ -514,6 +515,7 @@ class MainNavigation(Navigation):
         "find_services_by_name",
         "find_users_by_email",
         "find_ids",
+        "inspect_cache",
         "letter_branding",
         "live_api_keys",
         "live_services",
@@ -646,6 +648,7 @@ class OrgNavigation(Navigation):
         "go_to_dashboard_after_tour",
         "inbound_sms_admin",
         "index",
+        "inspect_cache",
         "invite_user",
         "letter_branding",
         "letter_branding_preview_image",
@@ -1,11 +1,26 @@
 import logging
 import re
+import time
 
+import requests
 from flask import abort, has_request_context, request
 from flask_login import current_user
 from notifications_python_client import __version__
 from notifications_python_client.base import BaseAPIClient
-from notifications_python_client.errors import HTTP503Error
+from notifications_python_client.errors import HTTP503Error, HTTPError, InvalidResponse
+
+from app import json_codec, request_timing
+from app.extensions import statsd_client
+from app.notify_client import cache, request_memo
+from app.notify_client.connection_pool import connection_pool
+from app.notify_client.json_stream import StreamedObject
+from app.notify_client.retry import (
+    UNAVAILABLE_STATUS_CODES,
+    RetryPolicy,
+    circuit_breakers,
+    timeout_within_deadline,
+)
+from app.notify_client.routes import metric_name
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +30,9 @@ def _attach_current_user(data):
 
 
 class NotifyAdminAPIClient(BaseAPIClient):
+    retry_policy = RetryPolicy()
+    conditional_get_enabled = False
+
     def __init__(self):
         super().__init__("a" * 73, "b")
 
@@ -24,6 +42,10 @@ class NotifyAdminAPIClient(BaseAPIClient):
         self.api_key = app.config["ADMIN_CLIENT_SECRET"]
         self.route_secret = app.config["ROUTE_SECRET_KEY_1"]
         self.waf_secret = app.config["WAF_SECRET"]
+        connection_pool.init_app(app)
+        self.timeout = connection_pool.timeout
+        self.retry_policy = RetryPolicy.from_config(app.config)
+        self.conditional_get_enabled = app.config["API_CONDITIONAL_GET_ENABLED"]
 
     def generate_headers(self, api_token):
         headers = {
@@ -76,6 +98,16 @@ class NotifyAdminAPIClient(BaseAPIClient):
             self.log_admin_call(url, "GET")
         return super().request("GET", url, params=params)
 
+    def get_streamed(self, url, items_key, params=None):
+        """
+        Like `get`, but for responses with an array too big to decode all at once. Returns a
+        `StreamedObject` that decodes the items in `items_key` one by one as they download.
+        """
+        self.log_admin_call(url, "GET")
+        url, kwargs = self._create_request_objects(url, None, params)
+        # Not memoised, as a streamed response can only be read once
+        return StreamedObject(self._perform_request_with_retries("GET", url, dict(kwargs, stream=True)), items_key)
+
     def post(self, *args, **kwargs):
         if "url" in kwargs:
             self.log_admin_call(kwargs["url"], "POST")
@@ -101,17 +133,122 @@ class NotifyAdminAPIClient(BaseAPIClient):
         return super().delete(*args, **kwargs)
 
     def _perform_request(self, method, url, kwargs):
-        # Retry requests to the Notify API up to 3 times
-        # if they fail with a 503 status, thrown when
-        # the admin can't connect to the API.
-        for i in [1, 2, 3]:
+        if method == "GET":
+            return request_memo.get_or_call(url, kwargs.get("params"), lambda: self._perform_get(url, kwargs))
+
+        try:
+            return self._perform_request_with_retries(method, url, kwargs)
+        finally:
+            # Anything other than a GET may change what the API would return for any resource
+            request_memo.invalidate()
+
+    def _perform_get(self, url, kwargs):
+        redis_key = cache.revalidation_key() if self.conditional_get_enabled else None
+        if redis_key is None:
+            return self._perform_request_with_retries("GET", url, kwargs)
+
+        return cache.conditional_get(
+            redis_key,
+            lambda headers: self._perform_request_with_retries(
+                "GET", url, dict(kwargs, headers=dict(kwargs["headers"], **headers))
+            ),
+        )
+
+    def _perform_request_with_retries(self, method, url, kwargs):
+        # Retry requests to the Notify API if they fail with a 503 status, thrown when the admin
+        # can't connect to the API, backing off a little more after each failure.
+        policy = self.retry_policy
+        breaker = circuit_breakers.for_url(url, policy) if policy.circuit_breaker_enabled else None
+        deadline = policy.deadline_from(time.monotonic())
+
+        for attempt in range(1, policy.attempts + 1):
+            trial = breaker.before_request() if breaker else False
+
             try:
-                return super()._perform_request(method, url, kwargs)
-            except HTTP503Error as e:
-                logger.warn("Retrying API request after failure {} {}".format(method, url))
-                if i == 3:
+                response = self._send_request(
+                    method, url, dict(kwargs, timeout=timeout_within_deadline(kwargs["timeout"], deadline))
+                )
+            except HTTPError as e:
+                if breaker and e.status_code in UNAVAILABLE_STATUS_CODES:
+                    breaker.record_failure()
+                elif breaker:
+                    # Any other answer means the API is up
+                    breaker.record_success()
+
+                delay = policy.backoff(attempt)
+                out_of_time = deadline is not None and time.monotonic() + delay >= deadline
+                if not isinstance(e, HTTP503Error) or attempt == policy.attempts or out_of_time:
                     raise e
 
+                logger.warn("Retrying API request after failure {} {}".format(method, url))
+                time.sleep(delay)
+            except BaseException:
+                # Like the greenlet being killed by a timeout, so we don’t know that the API answered
+                if breaker:
+                    breaker.record_failure()
+                raise
+            else:
+                if breaker:
+                    breaker.record_success()
+                return response
+            finally:
+                if trial:
+                    breaker.end_trial()
+
+    def _send_request(self, method, url, kwargs):
+        # Same as `BaseAPIClient._perform_request`, but sent through the shared keep-alive session
+        # rather than `requests.request`, which opens a new connection for every call.
+        start_time = time.monotonic()
+        status_code = None
+        try:
+            response = (connection_pool.session or requests).request(method, url, **kwargs)
+            status_code = response.status_code
+            if not kwargs.get("stream"):
+                self._record_response_size(method, url, response)
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            api_error = HTTPError.create(e)
+            status_code = api_error.status_code
+            logger.error(
+                "API {} request on {} failed with {} '{}'".format(
+                    method,
+                    url,
+                    api_error.status_code,
+                    api_error.message,
+                )
+            )
+            raise api_error
+        finally:
+            elapsed_time = time.monotonic() - start_time
+            logger.debug("API {} request on {} finished in {}".format(method, url, elapsed_time))
+            self._record_timing(method, url, status_code, elapsed_time)
+
+    def _process_json_response(self, response):
+        # Same as `BaseAPIClient._process_json_response`, but decoded with `app.json_codec`
+        if response.status_code == 204:
+            return
+        try:
+            return json_codec.loads(response.content)
+        except ValueError:
+            raise InvalidResponse(response, message="No JSON response object could be decoded")
+
+    @staticmethod
+    def _record_timing(method, url, status_code, elapsed_time):
+        # Grouped by route template rather than URL so each service, user or template doesn't get its own metric
+        stat = "notify_api.{}.{}".format(metric_name(url), method.lower())
+        statsd_client.timing("{}.elapsed_time".format(stat), elapsed_time)
+        statsd_client.incr("{}.{}".format(stat, status_code or "error"))
+        request_timing.record(request_timing.API, elapsed_time)
+
+    @staticmethod
+    def _record_response_size(method, url, response):
+        # Sent as a timer so that statsd reports the spread of sizes, not just a total
+        statsd_client.timing(
+            "notify_api.{}.{}.response_size".format(metric_name(url), method.lower()),
+            len(response.content),
+        )
+
 
 class InviteTokenError(Exception):
     pass
@@ -0,0 +1,44 @@
+"""
+How `cache.set` stores values in Redis.
+
+Values are stored as JSON. Large ones, like the templates of a service with hundreds of them, are
+compressed first when `CACHE_COMPRESSION_ENABLED` is set, which makes them several times smaller to
+keep in Redis and to send over the network. A compressed value starts with a byte saying which
+format it is in. That byte is a control character, which JSON text can never start with, so
+`decode` can tell the formats apart and still reads values stored as plain JSON.
+
+Compression is off by default. Turn it on only once every worker is running a version that can
+decode compressed values, otherwise workers still on an older version will fail to read them.
+"""
+
+import zlib
+
+from app import json_codec
+
+ZLIB = b"\x01"
+# Most of the time goes on decompressing, which is about as fast at any level, so use a low level
+# to keep compressing cheap
+COMPRESSION_LEVEL = 1
+
+_threshold = None
+
+
+def init_app(app):
+    global _threshold
+
+    _threshold = app.config["CACHE_COMPRESSION_THRESHOLD"] if app.config["CACHE_COMPRESSION_ENABLED"] else None
+
+
+def encode(value):
+    """The JSON for `value`, compressed if it’s at least `CACHE_COMPRESSION_THRESHOLD` characters long."""
+    encoded = json_codec.dumps(value)
+    if _threshold is None or len(encoded) < _threshold:
+        return encoded
+    return ZLIB + zlib.compress(encoded.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decode(data):
+    """Decode a value stored by `encode`, or one stored as plain JSON."""
+    if isinstance(data, bytes) and data[:1] == ZLIB:
+        data = zlib.decompress(data[1:])
+    return json_codec.loads(data)
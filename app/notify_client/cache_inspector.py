@@ -0,0 +1,110 @@
+"""
+Find out what is taking up space in Redis, for the platform admin cache page.
+
+Going through every key at once with `KEYS` would block Redis for everyone else, so the inspector
+walks the keyspace with `SCAN` a batch at a time instead, asking Redis how much memory each key uses.
+How far it has got and the totals so far are kept in Redis, so that each visit to the page can carry
+on from where the last one stopped, whichever worker it lands on.
+
+Once an inspection finishes its result is kept under its own key, and shown until the next one
+finishes, so starting a new inspection doesn’t replace it with a partial one.
+"""
+
+import heapq
+import json
+import time
+from datetime import datetime
+
+from app.extensions import redis_client
+from app.notify_client.cache_stats import key_family
+
+STATE_KEY = "cache-inspector"
+STATE_TTL = 24 * 60 * 60
+COMPLETED_KEY = "cache-inspector-completed"
+COMPLETED_TTL = 7 * 24 * 60 * 60
+BATCH_SIZE = 500
+TIME_BUDGET = 1
+LARGEST_KEYS = 20
+
+
+def _new_state():
+    return {
+        "cursor": 0,
+        "complete": False,
+        "started_at": datetime.utcnow().isoformat(),
+        "updated_at": None,
+        "families": {},
+        "largest": [],
+    }
+
+
+def _load(redis_key):
+    if not redis_client.active:
+        return None
+
+    state = redis_client.get(redis_key)
+    return json.loads(state) if state else None
+
+
+def load():
+    """How far the inspection under way has got, or `None` if there isn’t one."""
+    return _load(STATE_KEY)
+
+
+def load_completed():
+    """The result of the last inspection to finish, or `None` if none has."""
+    return _load(COMPLETED_KEY)
+
+
+def reset():
+    redis_client.delete(STATE_KEY, COMPLETED_KEY)
+
+
+def step(state, count=BATCH_SIZE):
+    """Add the next batch of keys to `state`."""
+    cursor, keys = redis_client.redis_store.scan(cursor=state["cursor"], count=count)
+
+    with redis_client.redis_store.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.memory_usage(key)
+        sizes = pipe.execute()
+
+    largest = [tuple(item) for item in state["largest"]]
+    for key, size in zip(keys, sizes):
+        if size is None:
+            # The key expired between the SCAN and asking for its size
+            continue
+        key = key.decode("utf-8") if isinstance(key, bytes) else key
+        family = state["families"].setdefault(key_family(key), {"keys": 0, "bytes": 0})
+        family["keys"] += 1
+        family["bytes"] += size
+        largest.append((size, key))
+
+    state["largest"] = [list(item) for item in heapq.nlargest(LARGEST_KEYS, largest)]
+    state["cursor"] = int(cursor)
+    state["complete"] = state["cursor"] == 0
+    state["updated_at"] = datetime.utcnow().isoformat()
+    return state
+
+
+def run(time_budget=TIME_BUDGET, count=BATCH_SIZE):
+    """
+    Carry on the inspection for up to `time_budget` seconds, starting a new one if there isn’t one
+    under way. Returns the updated state.
+    """
+    state = load()
+    if state is None or state["complete"]:
+        state = _new_state()
+
+    deadline = time.monotonic() + time_budget
+    while True:
+        step(state, count=count)
+        if state["complete"] or time.monotonic() >= deadline:
+            break
+
+    if state["complete"]:
+        redis_client.set(COMPLETED_KEY, json.dumps(state), ex=COMPLETED_TTL)
+        redis_client.delete(STATE_KEY)
+    else:
+        redis_client.set(STATE_KEY, json.dumps(state), ex=STATE_TTL)
+    return state
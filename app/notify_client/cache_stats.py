@@ -0,0 +1,112 @@
+"""
+Counters showing how well the Redis caches are working, for each family of keys.
+
+A family is a key with the IDs taken out, so `service-<uuid>-templates` and every other service’s
+templates are counted together as `service-templates`. Hits, misses, writes and deletes are sent to
+statsd as they happen, along with the size of every value read or written (as a timer, so statsd
+reports the spread of sizes).
+
+Each worker also adds up its counts and every `FLUSH_INTERVAL` seconds adds them to a hash in Redis,
+so the platform admin cache page can show hit ratios across all the workers.
+"""
+
+import logging
+import re
+from collections import Counter, defaultdict
+from threading import Lock
+from time import monotonic
+
+from app.extensions import redis_client, statsd_client
+
+logger = logging.getLogger(__name__)
+
+HIT = "hit"
+LOCAL_HIT = "local_hit"
+MISS = "miss"
+SET = "set"
+DELETE = "delete"
+# Served after its soft TTL while it is refreshed, or after its hard TTL because the API was unavailable
+STALE = "stale"
+STALE_ON_ERROR = "stale_on_error"
+
+STATS_KEY = "cache-stats"
+FLUSH_INTERVAL = 30
+
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+_NUMBER = re.compile(r"(?<=-)[0-9]+(?=-|$)")
+
+
+def key_family(redis_key):
+    """
+    The family a Redis key belongs to, eg `service-templates` for `service-<uuid>-templates` and
+    `gc-articles` for any page cached from GC Articles.
+    """
+    # GC Articles keys end with the path of the page, eg `gc-articles--wp/v2/pages/en/home`, and
+    # some keys end with the query parameters, eg `services-{'detailed': True}`
+    family = redis_key.split("--")[0].split("-{")[0]
+    family = _UUID.sub("", family)
+    family = _NUMBER.sub("", family)
+    return re.sub(r"-{2,}", "-", family).strip("-") or "unknown"
+
+
+class CacheStats:
+    def __init__(self, flush_interval=FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending = Counter()
+        self._last_flush = monotonic()
+        self._lock = Lock()
+
+    def record(self, event, redis_key, size=None):
+        family = key_family(redis_key)
+        statsd_client.incr("cache.{}.{}".format(family, event))
+        if size is not None:
+            statsd_client.timing("cache.{}.size".format(family), size)
+
+        with self._lock:
+            self._pending["{}:{}".format(family, event)] += 1
+            due = monotonic() - self._last_flush >= self.flush_interval
+
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = monotonic()
+
+        if not pending or not redis_client.active:
+            return
+
+        try:
+            with redis_client.redis_store.pipeline(transaction=False) as pipe:
+                for field, count in pending.items():
+                    pipe.hincrby(STATS_KEY, field, count)
+                pipe.execute()
+        except Exception:
+            # Losing a few counts isn’t worth failing the request for
+            logger.exception("Failed to save cache stats")
+
+    def totals(self):
+        """Counts for every family from all the workers, eg `{"service": {"hit": 10, "miss": 1}}`."""
+        totals = defaultdict(lambda: dict.fromkeys((HIT, LOCAL_HIT, MISS, SET, DELETE, STALE, STALE_ON_ERROR), 0))
+        if not redis_client.active:
+            return {}
+
+        for field, count in redis_client.redis_store.hgetall(STATS_KEY).items():
+            family, _, event = field.decode("utf-8").rpartition(":")
+            totals[family][event] = int(count)
+        return dict(totals)
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+        if redis_client.active:
+            redis_client.redis_store.delete(STATS_KEY)
+
+
+def hit_ratio(counts):
+    reads = counts[HIT] + counts[LOCAL_HIT] + counts[MISS]
+    return (counts[HIT] + counts[LOCAL_HIT]) / reads if reads else None
+
+
+cache_stats = CacheStats()
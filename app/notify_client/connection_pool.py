@@ -0,0 +1,135 @@
+"""
+A single keep-alive `requests.Session` shared by every Notify API client in a worker.
+
+`BaseAPIClient` calls `requests.request`, which builds a throwaway session and opens a new TCP+TLS
+connection for every call. Every `NotifyAdminAPIClient` singleton sends its requests through the
+session configured here instead, so connections to the API are reused between calls and requests.
+"""
+
+from threading import Lock
+from time import monotonic
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from app.extensions import statsd_client
+
+
+class PoolStats:
+    """Counters describing how well the connection pool is being used."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.wait_count = 0
+            self.wait_time = 0.0
+
+    def record_checkout(self, reused, wait_time):
+        with self._lock:
+            if reused:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.wait_count += 1
+            self.wait_time += wait_time
+
+        statsd_client.incr("notify_api.pool.{}".format("hit" if reused else "miss"))
+        statsd_client.timing("notify_api.pool.wait", wait_time)
+
+    def record_eviction(self):
+        with self._lock:
+            self.evictions += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "wait_count": self.wait_count,
+                "wait_time": self.wait_time,
+                "average_wait_time": self.wait_time / self.wait_count if self.wait_count else 0.0,
+            }
+
+
+pool_stats = PoolStats()
+
+
+class _InstrumentedPoolMixin:
+    # `_get_conn` and `_put_conn` are private to urllib3, which is why it’s pinned in `pyproject.toml`
+    idle_timeout = None
+
+    def _get_conn(self, timeout=None):
+        start = monotonic()
+        conn = super()._get_conn(timeout=timeout)
+        wait_time = monotonic() - start
+
+        last_used = getattr(conn, "_notify_last_used", None)
+        if self.idle_timeout is not None and last_used is not None and monotonic() - last_used > self.idle_timeout:
+            # The load balancer will have dropped this connection already, so reconnect rather than
+            # finding out half way through sending the request
+            conn.close()
+            pool_stats.record_eviction()
+
+        pool_stats.record_checkout(reused=getattr(conn, "sock", None) is not None, wait_time=wait_time)
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._notify_last_used = monotonic()
+        super()._put_conn(conn)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    def __init__(self, pool_size, pool_block=False, idle_timeout=None):
+        self.idle_timeout = idle_timeout
+        super().__init__(pool_connections=1, pool_maxsize=pool_size, pool_block=pool_block)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: type(
+                "Instrumented{}".format(pool_class.__name__),
+                (_InstrumentedPoolMixin, pool_class),
+                {"idle_timeout": self.idle_timeout},
+            )
+            for scheme, pool_class in (("http", HTTPConnectionPool), ("https", HTTPSConnectionPool))
+        }
+
+
+class ConnectionPool:
+    def __init__(self):
+        self.session = None
+        self.timeout = None
+
+    def init_app(self, app):
+        # All the API clients share one session, so only build it for the first of them
+        if self.session is not None:
+            return
+
+        adapter = PooledHTTPAdapter(
+            pool_size=app.config["API_POOL_SIZE"],
+            pool_block=app.config["API_POOL_BLOCK"],
+            idle_timeout=app.config["API_POOL_IDLE_TIMEOUT"],
+        )
+        session = Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        self.timeout = (app.config["API_CONNECT_TIMEOUT"], app.config["API_READ_TIMEOUT"])
+        self.session = session
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+        self.session = None
+
+
+connection_pool = ConnectionPool()
@@ -0,0 +1,71 @@
+"""
+Read a service’s counters from Redis, like how many emails and text message parts it has sent today.
+
+Pages often need several counters for the same service, and different parts of a view read the
+same counter again. `read` gets all the counters it is asked for with a single `MGET`, and keeps
+what it read on `flask.g` for the rest of the request. Every part of the page sees the same values,
+and none of them costs another round trip.
+
+`remember` does the same for values worked out from counters that can’t be read with `MGET`, like
+the bounce rate.
+"""
+
+import logging
+
+from flask import g, has_request_context
+from notifications_utils.clients.redis import (
+    email_daily_count_cache_key,
+    sms_daily_count_cache_key,
+)
+
+from app.extensions import redis_client
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT = "_counter_snapshot"
+
+
+def _snapshot():
+    if not has_request_context():
+        # Nothing to share it with, so keep it for just this call
+        return {}
+    if _SNAPSHOT not in g:
+        setattr(g, _SNAPSHOT, {})
+    return getattr(g, _SNAPSHOT)
+
+
+def _mget(keys):
+    if not redis_client.active:
+        return [redis_client.get(key) for key in keys]
+
+    try:
+        return redis_client.redis_store.mget(keys)
+    except Exception:
+        logger.exception("Failed to get counters {} from Redis".format(", ".join(keys)))
+        return [None] * len(keys)
+
+
+def read(*keys):
+    """The stored values of `keys`, or `None` for those that aren’t set, fetched in one round trip."""
+    snapshot = _snapshot()
+    missing = [key for key in keys if key not in snapshot]
+    if missing:
+        snapshot.update(zip(missing, _mget(missing)))
+    return [snapshot[key] for key in keys]
+
+
+def remember(key, compute):
+    """Call `compute` once per request for `key`, returning what it returned the first time."""
+    snapshot = _snapshot()
+    if key not in snapshot:
+        snapshot[key] = compute()
+    return snapshot[key]
+
+
+def daily_counts(service_id):
+    """How many text message parts and emails the service has sent today, `None` for those not in Redis."""
+    sms, email = read(sms_daily_count_cache_key(service_id), email_daily_count_cache_key(service_id))
+    return {
+        "sms": int(sms) if sms is not None else None,
+        "email": int(email) if email is not None else None,
+    }
@@ -0,0 +1,75 @@
+"""
+Share the partials of a service’s dashboard between everyone looking at it.
+
+While the dashboard is open it asks for `dashboard.json` every few seconds, and building that takes
+half a dozen API calls and renders seven templates. The partials are the same for everyone who can
+see the service’s dashboard, so the first request to need them builds them and keeps them in Redis
+for `DASHBOARD_SNAPSHOT_TTL` seconds. Other requests in the meantime, from any worker, use that
+snapshot without calling the API. If the snapshot has expired, only one request rebuilds it while
+the others wait for it (see `app.notify_client.single_flight`).
+
+There is a snapshot for each language, as the partials are translated. Creating or cancelling a job
+deletes them, so the job shows up on the dashboard straight away.
+"""
+
+import logging
+
+from flask import current_app
+
+from app import json_codec
+from app.extensions import redis_client
+from app.notify_client import cache, single_flight
+
+logger = logging.getLogger(__name__)
+
+KEY_FORMAT = "service-{}-dashboard-{}"
+
+
+def _key(service_id, lang):
+    return KEY_FORMAT.format(service_id, lang)
+
+
+def _read(redis_key):
+    try:
+        return redis_client.get(redis_key)
+    except Exception:
+        logger.exception("Failed to get dashboard snapshot {} from Redis".format(redis_key))
+        return None
+
+
+def _build_and_store(redis_key, build):
+    partials = build()
+    try:
+        redis_client.set(redis_key, json_codec.dumps(partials), ex=current_app.config["DASHBOARD_SNAPSHOT_TTL"])
+    except Exception:
+        logger.exception("Failed to set dashboard snapshot {} in Redis".format(redis_key))
+    return partials
+
+
+def get(service_id, lang, build):
+    """The service’s dashboard partials in `lang`, calling `build` only if there’s no snapshot of them yet."""
+    if not redis_client.active or not current_app.config["DASHBOARD_SNAPSHOT_TTL"]:
+        return build()
+
+    redis_key = _key(service_id, lang)
+    stored = _read(redis_key)
+    if stored:
+        return json_codec.loads(stored)
+
+    token = single_flight.acquire(redis_key)
+    if token is None:
+        stored = single_flight.wait_for(redis_key, lambda: _read(redis_key))
+        if stored:
+            return json_codec.loads(stored)
+        # Whoever had the lock gave up or is taking too long, so stop waiting for them
+        return build()
+
+    try:
+        return _build_and_store(redis_key, build)
+    finally:
+        single_flight.release(redis_key, token)
+
+
+def delete(service_id):
+    """Delete the service’s snapshots, so the next request rebuilds them."""
+    cache.delete_keys(*(_key(service_id, lang) for lang in current_app.config["LANGUAGES"]))
@@ -0,0 +1,229 @@
+"""
+Drop cached values for a service, a user or a whole family of them, without scanning Redis for them.
+
+Each family, like `service`, has a generation number in Redis, and so does each entity in it, like
+the service with a given ID. A value stored by `cache.set` starts with the generations it was
+stored at: those of every family its key belongs to, then that of the entity whose ID is in its key.
+`service-<id>-templates` belongs to the service, template and template category families and to the
+service `<id>`, so once any of those has been bumped it is stored as
+`\\x02<service>.<template>.<template_category>.<service id>\\x02<value>`.
+
+Bumping a generation is an `INCR`. From then on the values stored at the old number don’t
+match and are treated as a miss, and are overwritten by the next `cache.set`. Until any of a key’s
+generations is first bumped its value is stored without them. Reading the generations and the value
+is done by one Lua script, so it is still a single round trip to Redis.
+
+Bump the entity that changed, like the service being archived, rather than its whole family. Only
+changes that could affect any entity, like a template category that any service’s templates may be
+in, and clearing the cache from the platform admin pages, bump a whole family.
+"""
+
+import re
+from collections import OrderedDict
+from datetime import timedelta
+from fnmatch import fnmatchcase
+from functools import lru_cache
+
+from app.extensions import redis_client
+from app.notify_client.local_cache import local_cache
+
+UUID_PATTERN = "????????-????-????-????-????????????"
+
+# There’s a generation for each service or user that has been bumped, so they expire once every value
+# stamped with them has (see `cache.TTL`). Starting again from 0 after that can’t match any of them
+ENTITY_GENERATION_TTL = int(timedelta(days=14).total_seconds())
+
+# note: `service-{uuid}-templates` belongs to services, templates and template categories. A single
+# `template-{uuid}-version-*` isn’t in the template category family, as the version of its category it
+# was stored with is checked instead (see `cache.set_service_template`)
+FAMILIES = OrderedDict(
+    [
+        (
+            "user",
+            [
+                "user-????????-????-????-????-????????????",
+                "user-????????-????-????-????-????????????-organisations-and-services",
+            ],
+        ),
+        (
+            "service",
+            [
+                "has_jobs-????????-????-????-????-????????????",
+                "service-????????-????-????-????-????????????",
+                "service-????????-????-????-????-????????????-templates",
+                "service-????????-????-????-????-????????????-data-retention",
+                "service-????????-????-????-????-????????????-template-folders",
+                "service-????????-????-????-????-????????????-email-reply-to",
+                "service-????????-????-????-????-????????????-sms-senders",
+                "service-????????-????-????-????-????????????-letter-contacts",
+                "service-????????-????-????-????-????????????-inbound-number",
+            ],
+        ),
+        (
+            "template",
+            [
+                "service-????????-????-????-????-????????????-templates",
+                "template-????????-????-????-????-????????????-version-*",
+                "template-????????-????-????-????-????????????-versions",
+            ],
+        ),
+        (
+            "template_category",
+            [
+                "template_categories",
+                "template_category-????????-????-????-????-????????????",
+                "service-????????-????-????-????-????????????-templates",
+            ],
+        ),
+        (
+            "email_branding",
+            [
+                "email_branding-????????-????-????-????-????????????",
+                "email_branding-None",
+            ],
+        ),
+        (
+            "letter_branding",
+            [
+                "letter_branding",
+                "letter_branding-????????-????-????-????-????????????",
+            ],
+        ),
+        (
+            "organisation",
+            [
+                "organisations",
+                "domains",
+                "live-service-and-organisation-counts",
+            ],
+        ),
+        (
+            "organisations_and_services",
+            [
+                "user-????????-????-????-????-????????????-organisations-and-services",
+            ],
+        ),
+    ]
+)
+
+# The family of the entity whose ID a key starts with, by the prefix before the ID
+ENTITY_FAMILIES = {
+    "user": "user",
+    "service": "service",
+    "has_jobs": "service",
+    "template": "template",
+    "template_category": "template_category",
+    "email_branding": "email_branding",
+    "letter_branding": "letter_branding",
+}
+
+_ENTITY_KEY = re.compile(r"^([a-z_]+)-([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(?:-|$)")
+
+# KEYS[1] is the value’s key and the rest are its generations. Returns the stamp for the current
+# generations, the value without it if it was stored at them, and the seconds until it expires.
+# Stamps start and end with a \x02 byte, which neither JSON nor the format byte of a compressed value
+# (see `app.notify_client.cache_encoding`) can start with
+_READ_SCRIPT = """
+local generations = {}
+local bumped = false
+for i = 2, #KEYS do
+    local generation = redis.call("get", KEYS[i])
+    generations[i - 1] = generation or "0"
+    bumped = bumped or generation ~= false
+end
+local stamp = ""
+if bumped then
+    stamp = "\\2" .. table.concat(generations, ".") .. "\\2"
+end
+local value = redis.call("get", KEYS[1])
+if value and string.sub(value, 1, #stamp) == stamp and string.byte(value, #stamp + 1) ~= 2 then
+    value = string.sub(value, #stamp + 1)
+else
+    value = false
+end
+return {stamp, value, redis.call("ttl", KEYS[1])}
+"""
+
+
+def generation_key(family, entity_id=None):
+    if entity_id is None:
+        return "cache-generation-{}".format(family)
+    return "cache-generation-{}-{}".format(family, entity_id)
+
+
+@lru_cache(maxsize=10_000)
+def families_for(redis_key):
+    return tuple(name for name, patterns in FAMILIES.items() if any(fnmatchcase(redis_key, pattern) for pattern in patterns))
+
+
+@lru_cache(maxsize=10_000)
+def generation_keys(redis_key):
+    """The keys of the generations a value for `redis_key` is stored at, in the order they are stamped."""
+    families = families_for(redis_key)
+    keys = [generation_key(family) for family in families]
+    entity = _ENTITY_KEY.match(redis_key)
+    if families and entity and entity.group(1) in ENTITY_FAMILIES:
+        keys.append(generation_key(ENTITY_FAMILIES[entity.group(1)], entity.group(2)))
+    return tuple(keys)
+
+
+@lru_cache(maxsize=None)
+def _read_script(redis_store):
+    # Registered so that it is sent to Redis once and then run by its SHA with `EVALSHA`
+    return redis_store.register_script(_READ_SCRIPT)
+
+
+def read(redis_key, pipe=None):
+    """
+    The stamp for the current generations of `redis_key`, the value stored for them (or `None`) and
+    the seconds until it expires. Pass the stamp to `stamped` to store a new value at the same
+    generations.
+
+    If `pipe` is given the script is only queued on it, and `parse_read` should be called with its
+    result once the pipeline has been executed.
+    """
+    script = _read_script(redis_client.redis_store)
+    keys = [redis_key, *generation_keys(redis_key)]
+    if pipe is not None:
+        script(keys=keys, client=pipe)
+        return None
+    return parse_read(script(keys=keys, client=redis_client.redis_store))
+
+
+def parse_read(result):
+    stamp, value, ttl = result
+    return stamp, value, ttl
+
+
+def stamped(stamp, encoded):
+    """`encoded` prefixed with `stamp`, as it should be stored in Redis."""
+    if not stamp:
+        return encoded
+    return stamp + (encoded.encode("utf-8") if isinstance(encoded, str) else encoded)
+
+
+def _local_patterns(family, entity_id):
+    if entity_id is None:
+        return FAMILIES[family]
+    return [
+        pattern.replace(UUID_PATTERN, entity_id)
+        for pattern in FAMILIES[family]
+        if ENTITY_FAMILIES.get(pattern.split("-")[0]) == family
+    ]
+
+
+def bump(family, entity_id=None):
+    """
+    Drop every cached value in `family`, or only those of the entity with `entity_id`, in Redis and
+    in every worker’s local cache.
+    """
+    if redis_client.active:
+        if entity_id is None:
+            redis_client.redis_store.incr(generation_key(family))
+        else:
+            with redis_client.redis_store.pipeline(transaction=False) as pipe:
+                pipe.incr(generation_key(family, entity_id))
+                pipe.expire(generation_key(family, entity_id), ENTITY_GENERATION_TTL)
+                pipe.execute()
+    for pattern in _local_patterns(family, entity_id):
+        local_cache.invalidate_pattern(pattern)
@@ -1,4 +1,4 @@
-from app.notify_client import NotifyAdminAPIClient
+from app.notify_client import NotifyAdminAPIClient, cache
 
 
 class InboundNumberClient(NotifyAdminAPIClient):
@@ -8,6 +8,7 @@ class InboundNumberClient(NotifyAdminAPIClient):
     def get_all_inbound_sms_number_service(self):
         return self.get("/inbound-number")
 
+    @cache.set("service-{service_id}-inbound-number")
     def get_inbound_sms_number_for_service(self, service_id):
         return self.get("/inbound-number/service/{}".format(service_id))
 
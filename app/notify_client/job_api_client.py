@@ -1,7 +1,11 @@
 from collections import defaultdict
 
-from app.extensions import redis_client
-from app.notify_client import NotifyAdminAPIClient, _attach_current_user, cache
+from app.notify_client import (
+    NotifyAdminAPIClient,
+    _attach_current_user,
+    cache,
+    dashboard_snapshot,
+)
 
 
 class JobApiClient(NotifyAdminAPIClient):
@@ -109,11 +113,9 @@ class JobApiClient(NotifyAdminAPIClient):
         data = _attach_current_user(data)
         job = self.post(url="/service/{}/job".format(service_id), data=data)
 
-        redis_client.set(
-            "has_jobs-{}".format(service_id),
-            b"true",
-            ex=cache.TTL,
-        )
+        # Deleted rather than set, so it is dropped at the current generation of services
+        cache.delete_keys("has_jobs-{}".format(service_id))
+        dashboard_snapshot.delete(service_id)
 
         stats = self.__convert_statistics(job["data"])
         job["data"]["notifications_sent"] = stats["delivered"] + stats["failed"]
@@ -126,6 +128,7 @@ class JobApiClient(NotifyAdminAPIClient):
     @cache.delete("has_jobs-{service_id}")
     def cancel_job(self, service_id, job_id):
         job = self.post(url="/service/{}/job/{}/cancel".format(service_id, job_id), data={})
+        dashboard_snapshot.delete(service_id)
 
         stats = self.__convert_statistics(job["data"])
         job["data"]["notifications_sent"] = stats["delivered"] + stats["failed"]
@@ -137,10 +140,12 @@ class JobApiClient(NotifyAdminAPIClient):
 
     @cache.delete("has_jobs-{service_id}")
     def cancel_letter_job(self, service_id, job_id):
-        return self.post(
+        response = self.post(
             url="/service/{}/job/{}/cancel-letter-job".format(service_id, job_id),
             data={},
         )
+        dashboard_snapshot.delete(service_id)
+        return response
 
 
 job_api_client = JobApiClient()
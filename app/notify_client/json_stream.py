@@ -0,0 +1,168 @@
+"""
+Decode a large JSON response from the Notify API a piece at a time.
+
+Some responses, such as a page of notifications formatted for a CSV export, hold an array of
+thousands of items. Decoding the whole body at once means holding the raw text and every decoded
+item in memory together. `StreamedObject` reads the body in chunks as it downloads and decodes one
+array item at a time, so memory use depends on the size of an item rather than the size of the page.
+"""
+
+import codecs
+import json
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class StreamedObject:
+    """
+    A JSON object read from a streamed `requests.Response`, where `items_key` names an array that is
+    too big to decode in one go. Read it like a dict, iterating over the array before looking at
+    any of the fields that come after it:
+
+        response = StreamedObject(api_response, "notifications")
+        for notification in response["notifications"]:
+            ...
+        response["links"]
+
+    The array can only be iterated over once.
+    """
+
+    def __init__(self, response, items_key, chunk_size=CHUNK_SIZE):
+        self._response = response
+        self._items_key = items_key
+        self._chunks = response.iter_content(chunk_size=chunk_size)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._finished_reading = False
+        self._fields = {}
+        self._items = None
+        self._items_finished = False
+        self._parser = self._parse_object()
+
+    def __getitem__(self, key):
+        if key == self._items_key:
+            return self._iter_items()
+        while key not in self._fields:
+            if not self._next_field():
+                raise KeyError(key)
+        return self._fields[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def close(self):
+        self._response.close()
+
+    def _iter_items(self):
+        while self._items is None:
+            if not self._next_field():
+                raise KeyError(self._items_key)
+        try:
+            yield from self._items
+            self._items_finished = True
+        finally:
+            if not self._items_finished:
+                # Stopped part way through, so the rest of the body will never be read
+                self.close()
+
+    def _next_field(self):
+        if self._items is not None and not self._items_finished:
+            raise ValueError("'{}' must be read before the fields that come after it".format(self._items_key))
+
+        try:
+            key, value = next(self._parser)
+        except StopIteration:
+            self.close()
+            return False
+
+        if key == self._items_key:
+            self._items = value
+        else:
+            self._fields[key] = value
+        return True
+
+    def _parse_object(self):
+        self._expect("{")
+        if self._peek() == "}":
+            return
+
+        while True:
+            key = self._decode_value()
+            self._expect(":")
+            if key == self._items_key:
+                yield key, self._parse_items()
+            else:
+                yield key, self._decode_value()
+
+            if self._next_char(",}") == "}":
+                return
+
+    def _parse_items(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._decode_value()
+            if self._next_char(",]") == "]":
+                return
+
+    def _read(self):
+        if self._finished_reading:
+            return False
+
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._finished_reading = True
+            text = self._utf8.decode(b"", final=True)
+        else:
+            text = self._utf8.decode(chunk)
+
+        # Drop whatever has already been decoded so the buffer doesn't grow with the response
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                raise ValueError("Unexpected end of JSON response")
+
+    def _next_char(self, expected):
+        char = self._peek()
+        if char not in expected:
+            raise ValueError("Expected one of {!r} in JSON response but got {!r}".format(expected, char))
+        self._pos += 1
+        return char
+
+    def _expect(self, char):
+        self._next_char(char)
+
+    def _decode_value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._read():
+                    raise
+                continue
+
+            # A number at the very end of the buffer might carry on in the next chunk
+            if end == len(self._buffer) and self._read():
+                continue
+
+            self._pos = end
+            return value
@@ -0,0 +1,146 @@
+"""
+A small in-process cache in front of Redis for the values kept by `cache.set`.
+
+Some cached values, like the current user and service, are read on almost every request, and
+getting them from Redis costs a round trip each time. When `LOCAL_CACHE_ENABLED` is set each worker
+also keeps the most recently used values in memory for `LOCAL_CACHE_TTL` seconds, evicting the least
+recently used once it holds `LOCAL_CACHE_MAX_ENTRIES`.
+
+Entries are dropped everywhere when they change: `cache.delete` and `cache.bump_generation`
+publish the keys or patterns on a Redis channel that every worker listens to. The TTL is kept short
+so that a worker that misses a message, for example while reconnecting, is only briefly out of date.
+
+The encoded JSON is stored rather than the decoded value, so that every caller gets its own copy
+that it is free to modify.
+"""
+
+import json
+import logging
+import os
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from threading import Lock
+from time import monotonic
+
+from app.extensions import redis_client
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "notify-admin-cache-invalidation"
+
+
+class LocalCache:
+    def __init__(self):
+        self.enabled = False
+        self.max_entries = 1000
+        self.ttl = 10
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._subscriber = None
+        self._subscriber_pid = None
+
+    def init_app(self, app):
+        # Invalidations are sent through Redis, so without it the entries could never be dropped
+        self.enabled = app.config["LOCAL_CACHE_ENABLED"] and app.config["REDIS_ENABLED"]
+        self.max_entries = app.config["LOCAL_CACHE_MAX_ENTRIES"]
+        self.ttl = app.config["LOCAL_CACHE_TTL"]
+        self.clear()
+
+    def get(self, key):
+        if not self.enabled or not self._subscribe():
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if not self.enabled or not self._listening():
+            return
+
+        with self._lock:
+            self._entries[key] = (value, monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys):
+        """Drop `keys` from this worker’s cache and tell every other worker to do the same."""
+        self._delete(keys)
+        self._publish({"keys": list(keys)})
+
+    def invalidate_pattern(self, pattern):
+        """Like `invalidate`, for every key matching a Redis glob-style `pattern`."""
+        self._delete_matching(pattern)
+        self._publish({"pattern": pattern})
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def _delete_matching(self, pattern):
+        with self._lock:
+            for key in [key for key in self._entries if fnmatchcase(key, pattern)]:
+                del self._entries[key]
+
+    def _publish(self, message):
+        if not self.enabled:
+            return
+
+        try:
+            redis_client.redis_store.publish(CHANNEL, json.dumps(message))
+        except Exception:
+            logger.exception("Failed to publish cache invalidation {}".format(message))
+
+    def _handle_message(self, message):
+        data = json.loads(message["data"])
+        if "keys" in data:
+            self._delete(data["keys"])
+        if "pattern" in data:
+            self._delete_matching(data["pattern"])
+
+    def _listening(self):
+        return self._subscriber is not None and self._subscriber_pid == os.getpid() and self._subscriber.is_alive()
+
+    def _subscribe(self):
+        # Started lazily so that each worker gets its own listener after gunicorn forks. Nothing is
+        # served from memory unless we’re listening, otherwise we wouldn’t hear about changes.
+        if self._listening():
+            return True
+
+        with self._lock:
+            if self._listening():
+                return True
+
+            # Anything could have changed while nobody was listening
+            self._entries.clear()
+            try:
+                pubsub = redis_client.redis_store.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{CHANNEL: self._handle_message})
+                self._subscriber = pubsub.run_in_thread(sleep_time=1, daemon=True)
+                self._subscriber_pid = os.getpid()
+                return True
+            except Exception:
+                logger.exception("Failed to subscribe to cache invalidations")
+                self._subscriber = None
+                return False
+
+
+local_cache = LocalCache()
@@ -17,6 +17,7 @@ class NotificationApiClient(NotifyAdminAPIClient):
         format_for_csv=None,
         to=None,
         include_one_off=None,
+        stream=False,
     ):
         # TODO: if "to" is included, this should be a POST
         params = {
@@ -35,14 +36,15 @@ class NotificationApiClient(NotifyAdminAPIClient):
         params = {k: v for k, v in params.items() if v is not None}
 
         if job_id:
-            return self.get(
-                url="/service/{}/job/{}/notifications".format(service_id, job_id),
-                params=params,
-            )
+            url = "/service/{}/job/{}/notifications".format(service_id, job_id)
         else:
+            url = "/service/{}/notifications".format(service_id)
             if limit_days is not None:
                 params["limit_days"] = limit_days
-            return self.get(url="/service/{}/notifications".format(service_id), params=params)
+
+        if stream:
+            return self.get_streamed(url, "notifications", params=params)
+        return self.get(url=url, params=params)
 
     def send_notification(self, service_id, *, template_id, recipient, personalisation, sender_id):
         data = {
@@ -1,24 +1,16 @@
-from notifications_utils.clients.redis import (
-    email_daily_count_cache_key,
-    sms_daily_count_cache_key,
-)
-
-from app import redis_client, service_api_client, template_statistics_client
+from app import service_api_client, template_statistics_client
 from app.models.service import Service
+from app.notify_client import counters
 from app.utils import get_current_financial_year
 
 
 class NotificationCounts:
     def get_all_notification_counts_for_today(self, service_id):
         # try to get today's stats from redis
-        todays_sms = redis_client.get(sms_daily_count_cache_key(service_id))
-        todays_sms = int(todays_sms) if todays_sms is not None else None
-
-        todays_email = redis_client.get(email_daily_count_cache_key(service_id))
-        todays_email = int(todays_email) if todays_email is not None else None
+        todays_counts = counters.daily_counts(service_id)
 
-        if todays_sms is not None and todays_email is not None:
-            return {"sms": todays_sms, "email": todays_email}
+        if todays_counts["sms"] is not None and todays_counts["email"] is not None:
+            return todays_counts
         # fallback to the API if the stats are not in redis
         else:
             stats = template_statistics_client.get_template_statistics_for_service(service_id, limit_days=1)
@@ -2,8 +2,10 @@ from itertools import chain
 
 from notifications_python_client.errors import HTTPError
 
-from app.extensions import redis_client
 from app.notify_client import NotifyAdminAPIClient, _attach_current_user, cache
+from app.notify_client.user_api_client import user_api_client
+
+ORGANISATION_BY_DOMAIN_NOT_FOUND = "organisation-by-domain-not-found--{domain!n}"
 
 
 class OrganisationsClient(NotifyAdminAPIClient):
@@ -18,6 +20,7 @@ class OrganisationsClient(NotifyAdminAPIClient):
     def get_organisation(self, org_id):
         return self.get(url="/organisations/{}".format(org_id))
 
+    @cache.set_not_found(ORGANISATION_BY_DOMAIN_NOT_FOUND)
     def get_organisation_by_domain(self, domain):
         try:
             return self.get(
@@ -46,7 +49,16 @@ class OrganisationsClient(NotifyAdminAPIClient):
         api_response = self.post(url="/organisations/{}".format(org_id), data=kwargs)
 
         if kwargs.get("organisation_type") and cached_service_ids:
-            redis_client.delete(*map("service-{}".format, cached_service_ids))
+            cache.delete_keys(*map("service-{}".format, cached_service_ids))
+
+        if kwargs.get("domains"):
+            cache.delete_keys(
+                *(cache.format_key(ORGANISATION_BY_DOMAIN_NOT_FOUND, domain=domain) for domain in kwargs["domains"])
+            )
+
+        if kwargs.get("name"):
+            # Each member’s list of organisations includes its name
+            user_api_client.delete_cached_organisations_and_services(user_api_client.get_users_for_organisation(org_id))
 
         return api_response
 
@@ -62,11 +74,19 @@ class OrganisationsClient(NotifyAdminAPIClient):
     @cache.delete("service-{service_id}-data-retention")
     def update_service_organisation(self, service_id, org_id):
         data = {"service_id": service_id}
-        return self.post(url="/organisations/{}/service".format(org_id), data=data)
+        api_response = self.post(url="/organisations/{}/service".format(org_id), data=data)
+        # The service’s team see which organisation it’s in, and the organisation’s members how many
+        # live services it has
+        user_api_client.delete_cached_organisations_and_services(
+            user_api_client.get_users_for_service(service_id) + user_api_client.get_users_for_organisation(org_id)
+        )
+        return api_response
 
     def get_organisation_services(self, org_id):
         return self.get(url="/organisations/{}/services".format(org_id))
 
+    @cache.delete("user-{user_id}")
+    @cache.delete("user-{user_id}-organisations-and-services")
     def remove_user_from_organisation(self, org_id, user_id):
         endpoint = "/organisations/{org_id}/users/{user_id}".format(org_id=org_id, user_id=user_id)
         data = _attach_current_user({})
@@ -0,0 +1,63 @@
+"""
+Request-scoped memo of Notify API GET responses.
+
+Views often ask the API for the same thing more than once while handling a single request, for
+example a model property that isn’t cached being read several times. The responses are stored
+on `flask.g` keyed by URL and query parameters so that the repeats are served from memory. The
+undecoded `requests.Response` is kept, so every caller decodes its own copy of the JSON and is
+free to modify it. Any POST, PUT or DELETE made during the request drops every memoised response,
+as a write to one resource can change others, like adding a user to a service changing the user.
+Writes are rare within a request, so this costs little.
+"""
+
+import json
+
+from flask import current_app, g, has_request_context
+
+_MEMO = "_api_get_memo"
+_AVOIDED = "_api_get_memo_avoided"
+
+
+def _enabled():
+    return has_request_context() and current_app.config["API_GET_MEMO_ENABLED"]
+
+
+def _key(url, params):
+    return url, json.dumps(params, sort_keys=True, default=str)
+
+
+def _memo():
+    if _MEMO not in g:
+        setattr(g, _MEMO, {})
+    return getattr(g, _MEMO)
+
+
+def get_or_call(url, params, call):
+    if not _enabled():
+        return call()
+
+    memo = _memo()
+    key = _key(url, params)
+    if key in memo:
+        setattr(g, _AVOIDED, g.get(_AVOIDED, 0) + 1)
+        return memo[key]
+
+    memo[key] = call()
+    return memo[key]
+
+
+def invalidate():
+    if _enabled():
+        g.pop(_MEMO, None)
+
+
+def duplicate_calls_avoided():
+    return g.get(_AVOIDED, 0) if has_request_context() else 0
+
+
+def reset(exception=None):
+    avoided = duplicate_calls_avoided()
+    if avoided:
+        current_app.logger.debug("Avoided {} duplicate API GET request(s)".format(avoided))
+    g.pop(_MEMO, None)
+    g.pop(_AVOIDED, None)
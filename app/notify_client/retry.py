@@ -0,0 +1,171 @@
+"""
+Retry policy and per-endpoint circuit breakers for requests to the Notify API.
+
+Failed requests are retried with exponential backoff and full jitter, so that during an API
+brownout the retries from every worker are spread out rather than arriving together, and no
+request keeps retrying past its deadline.
+
+Each API route (see `app.notify_client.routes.route_template`) has a circuit breaker shared by
+every greenlet in the worker. After enough consecutive failures to reach the API the breaker opens and
+requests to that route fail straight away with `CircuitBreakerOpenError`, instead of tying up a
+greenlet waiting for an API that isn’t answering. Once `reset_timeout` has passed a single trial
+request is let through: if it succeeds the breaker closes again, otherwise it stays open.
+"""
+
+import logging
+import random
+from threading import Lock
+from time import monotonic
+
+from notifications_python_client.errors import HTTP503Error
+
+from app.extensions import statsd_client
+from app.notify_client.routes import metric_name, route_template
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean the API couldn’t be reached or didn’t answer in time. Connection errors and
+# timeouts are raised by `notifications_python_client` as 503s. Other server errors, like a 500 for
+# one service’s data, are answers from an API that is up, so they don’t count towards opening a
+# breaker shared by every service.
+UNAVAILABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+
+class CircuitBreakerOpenError(HTTP503Error):
+    def __init__(self, route):
+        super().__init__(message="Circuit breaker open for {}".format(route))
+        self.route = route
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        attempts=3,
+        backoff_base=0,
+        backoff_max=0,
+        deadline=None,
+        circuit_breaker_enabled=False,
+        failure_threshold=5,
+        reset_timeout=30,
+    ):
+        self.attempts = attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.circuit_breaker_enabled = circuit_breaker_enabled
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            attempts=config["API_RETRY_ATTEMPTS"],
+            backoff_base=config["API_RETRY_BACKOFF_BASE"],
+            backoff_max=config["API_RETRY_BACKOFF_MAX"],
+            deadline=config["API_REQUEST_DEADLINE"],
+            circuit_breaker_enabled=config["API_CIRCUIT_BREAKER_ENABLED"],
+            failure_threshold=config["API_CIRCUIT_BREAKER_FAILURE_THRESHOLD"],
+            reset_timeout=config["API_CIRCUIT_BREAKER_RESET_TIMEOUT"],
+        )
+
+    def backoff(self, attempt):
+        """Seconds to wait before retrying after `attempt` has failed (1 for the first attempt)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def deadline_from(self, start):
+        return None if self.deadline is None else start + self.deadline
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, route, failure_threshold, reset_timeout):
+        self.route = route
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_progress = False
+        self._lock = Lock()
+
+    def before_request(self):
+        """Raise `CircuitBreakerOpenError` if the request can’t be sent, and return whether it is the trial request."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if monotonic() - self.opened_at < self.reset_timeout:
+                    statsd_client.incr("notify_api.circuit_breaker.{}.rejected".format(metric_name(self.route)))
+                    raise CircuitBreakerOpenError(self.route)
+                self._set_state(self.HALF_OPEN)
+
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_progress:
+                    raise CircuitBreakerOpenError(self.route)
+                self._trial_in_progress = True
+                return True
+            return False
+
+    def end_trial(self):
+        """Let another trial request through, however the last one ended."""
+        with self._lock:
+            self._trial_in_progress = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._trial_in_progress = False
+            self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_progress = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = monotonic()
+                self._set_state(self.OPEN)
+
+    def _set_state(self, state):
+        if state == self.state:
+            return
+
+        logger.warning("Circuit breaker for API route {} is now {}".format(self.route, state))
+        self.state = state
+        statsd_client.incr("notify_api.circuit_breaker.{}.{}".format(metric_name(self.route), state))
+        statsd_client.gauge("notify_api.circuit_breaker.{}.open".format(metric_name(self.route)), int(state == self.OPEN))
+
+
+class CircuitBreakers:
+    def __init__(self):
+        self._breakers = {}
+        self._lock = Lock()
+
+    def for_url(self, url, policy):
+        route = route_template(url)
+        with self._lock:
+            if route not in self._breakers:
+                self._breakers[route] = CircuitBreaker(route, policy.failure_threshold, policy.reset_timeout)
+            return self._breakers[route]
+
+    def states(self):
+        with self._lock:
+            return {route: breaker.state for route, breaker in self._breakers.items()}
+
+    def reset(self):
+        with self._lock:
+            self._breakers = {}
+
+
+circuit_breakers = CircuitBreakers()
+
+
+def timeout_within_deadline(timeout, deadline):
+    """Shorten a `requests` timeout, either a number or a (connect, read) tuple, to end by `deadline`."""
+    if deadline is None:
+        return timeout
+
+    remaining = max(deadline - monotonic(), 0.001)
+    if isinstance(timeout, tuple):
+        return tuple(min(part, remaining) for part in timeout)
+    return min(timeout, remaining)
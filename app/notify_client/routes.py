@@ -0,0 +1,28 @@
+import re
+from urllib.parse import urlparse
+
+_UUID = re.compile(r"[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}", re.IGNORECASE)
+
+
+def _normalise_segment(segment):
+    if _UUID.fullmatch(segment) or segment.isdigit():
+        return "{id}"
+    # Invitation tokens and the like
+    if len(segment) >= 20 and any(character.isdigit() for character in segment):
+        return "{id}"
+    return segment
+
+
+def route_template(url):
+    """
+    The API route a URL was made from, with IDs and tokens replaced by a placeholder, eg
+    `https://api/service/4f1c…/job/9a2b…?page=2` becomes `/service/{id}/job/{id}`. Useful for grouping
+    requests without creating a separate group for every service, user or template.
+    """
+    path = urlparse(url).path.strip("/")
+    return "/" + "/".join(_normalise_segment(segment) for segment in path.split("/") if segment)
+
+
+def metric_name(url):
+    """A statsd-safe version of `route_template`, eg `service.id.job.id`."""
+    return route_template(url).strip("/").replace("/", ".").replace("{id}", "id") or "root"
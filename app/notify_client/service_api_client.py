@@ -6,6 +6,10 @@ from flask_login import current_user
 
 from app.extensions import redis_client
 from app.notify_client import NotifyAdminAPIClient, _attach_current_user, cache
+from app.notify_client.user_api_client import user_api_client
+
+# Attributes of a service that are in each team member’s list of organisations and services
+ORGANISATIONS_AND_SERVICES_ATTRIBUTES = {"name", "restricted", "active"}
 
 
 def _seconds_until_midnight():
@@ -16,6 +20,7 @@ def _seconds_until_midnight():
 
 class ServiceAPIClient(NotifyAdminAPIClient):
     @cache.delete("user-{user_id}")
+    @cache.delete("user-{user_id}-organisations-and-services")
     def create_service(
         self,
         service_name,
@@ -59,6 +64,7 @@ class ServiceAPIClient(NotifyAdminAPIClient):
             params={"today_only": today_only, "limit_days": limit_days},
         )["data"]
 
+    @cache.revalidate("services-{params_dict}")
     def get_services(self, params_dict=None):
         """
         Retrieve a list of services.
@@ -74,6 +80,7 @@ class ServiceAPIClient(NotifyAdminAPIClient):
     def find_services_by_name(self, service_name):
         return self.get("/service/find-services-by-name", params={"service_name": service_name})
 
+    @cache.revalidate("live-services-data-{params_dict}")
     def get_live_services_data(self, params_dict=None):
         """
         Retrieve a list of live services data with contact names and notification counts.
@@ -132,7 +139,12 @@ class ServiceAPIClient(NotifyAdminAPIClient):
             raise TypeError("Not allowed to update service attributes: {}".format(", ".join(disallowed_attributes)))
 
         endpoint = "/service/{0}".format(service_id)
-        return self.post(endpoint, data)
+        api_response = self.post(endpoint, data)
+
+        if ORGANISATIONS_AND_SERVICES_ATTRIBUTES & kwargs.keys():
+            user_api_client.delete_cached_organisations_and_services(user_api_client.get_users_for_service(service_id))
+
+        return api_response
 
     @cache.delete("live-service-and-organisation-counts")
     @cache.delete("organisations")
@@ -185,20 +197,29 @@ class ServiceAPIClient(NotifyAdminAPIClient):
     def update_service_with_properties(self, service_id, properties):
         return self.update_service(service_id, **properties)
 
-    @cache.delete("service-{service_id}")
+    @cache.bump_generation("service", "{service_id}")
     def archive_service(self, service_id):
-        return self.post("/service/{}/archive".format(service_id), data=None)
+        return self._change_whether_active(service_id, "/service/{}/archive".format(service_id))
 
-    @cache.delete("service-{service_id}")
+    @cache.bump_generation("service", "{service_id}")
     def suspend_service(self, service_id):
-        return self.post("/service/{}/suspend".format(service_id), data=None)
+        return self._change_whether_active(service_id, "/service/{}/suspend".format(service_id))
 
     @cache.delete("service-{service_id}")
     def resume_service(self, service_id):
-        return self.post("/service/{}/resume".format(service_id), data=None)
+        return self._change_whether_active(service_id, "/service/{}/resume".format(service_id))
+
+    def _change_whether_active(self, service_id, endpoint):
+        # Look the team up before the change, so it’s those who could see the service before it
+        users = user_api_client.get_users_for_service(service_id)
+        api_response = self.post(endpoint, data=None)
+        # Each team member’s list of organisations and services says whether the service is active
+        user_api_client.delete_cached_organisations_and_services(users)
+        return api_response
 
     @cache.delete("service-{service_id}")
     @cache.delete("user-{user_id}")
+    @cache.delete("user-{user_id}-organisations-and-services")
     def remove_user_from_service(self, service_id, user_id):
         """
         Remove a user from a service
@@ -461,6 +482,7 @@ class ServiceAPIClient(NotifyAdminAPIClient):
     def delete_service_inbound_api(self, service_id, callback_api_id):
         return self.delete("/service/{}/inbound-api/{}".format(service_id, callback_api_id))
 
+    @cache.set("service-{service_id}-email-reply-to")
     def get_reply_to_email_addresses(self, service_id):
         return self.get("/service/{}/email-reply-to".format(service_id))
 
@@ -474,6 +496,7 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         )
 
     @cache.delete("service-{service_id}")
+    @cache.delete("service-{service_id}-email-reply-to")
     def add_reply_to_email_address(self, service_id, email_address, is_default=False):
         return self.post(
             "/service/{}/email-reply-to".format(service_id),
@@ -481,6 +504,7 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         )
 
     @cache.delete("service-{service_id}")
+    @cache.delete("service-{service_id}-email-reply-to")
     def update_reply_to_email_address(self, service_id, reply_to_email_id, email_address, is_default=False):
         return self.post(
             "/service/{}/email-reply-to/{}".format(
@@ -491,12 +515,14 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         )
 
     @cache.delete("service-{service_id}")
+    @cache.delete("service-{service_id}-email-reply-to")
     def delete_reply_to_email_address(self, service_id, reply_to_email_id):
         return self.post(
             "/service/{}/email-reply-to/{}/archive".format(service_id, reply_to_email_id),
             data=None,
         )
 
+    @cache.set("service-{service_id}-letter-contacts")
     def get_letter_contacts(self, service_id):
         return self.get("/service/{}/letter-contact".format(service_id))
 
@@ -504,6 +530,7 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         return self.get("/service/{}/letter-contact/{}".format(service_id, letter_contact_id))
 
     @cache.delete("service-{service_id}")
+    @cache.delete("service-{service_id}-letter-contacts")
     def add_letter_contact(self, service_id, contact_block, is_default=False):
         return self.post(
             "/service/{}/letter-contact".format(service_id),
@@ -511,6 +538,7 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         )
 
     @cache.delete("service-{service_id}")
+    @cache.delete("service-{service_id}-letter-contacts")
     def update_letter_contact(self, service_id, letter_contact_id, contact_block, is_default=False):
         return self.post(
             "/service/{}/letter-contact/{}".format(
@@ -521,12 +549,14 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         )
 
     @cache.delete("service-{service_id}")
+    @cache.delete("service-{service_id}-letter-contacts")
     def delete_letter_contact(self, service_id, letter_contact_id):
         return self.post(
             "/service/{}/letter-contact/{}/archive".format(service_id, letter_contact_id),
             data=None,
         )
 
+    @cache.set("service-{service_id}-sms-senders")
     def get_sms_senders(self, service_id):
         return self.get("/service/{}/sms-sender".format(service_id))
 
@@ -534,6 +564,8 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         return self.get("/service/{}/sms-sender/{}".format(service_id, sms_sender_id))
 
     @cache.delete("service-{service_id}")
+    @cache.delete("service-{service_id}-sms-senders")
+    @cache.delete("service-{service_id}-inbound-number")
     def add_sms_sender(self, service_id, sms_sender, is_default=False, inbound_number_id=None):
         data = {"sms_sender": sms_sender, "is_default": is_default}
         if inbound_number_id:
@@ -541,6 +573,7 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         return self.post("/service/{}/sms-sender".format(service_id), data=data)
 
     @cache.delete("service-{service_id}")
+    @cache.delete("service-{service_id}-sms-senders")
     def update_sms_sender(self, service_id, sms_sender_id, sms_sender, is_default=False):
         return self.post(
             "/service/{}/sms-sender/{}".format(service_id, sms_sender_id),
@@ -548,6 +581,7 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         )
 
     @cache.delete("service-{service_id}")
+    @cache.delete("service-{service_id}-sms-senders")
     def delete_sms_sender(self, service_id, sms_sender_id):
         return self.post(
             "/service/{}/sms-sender/{}/archive".format(service_id, sms_sender_id),
@@ -0,0 +1,102 @@
+"""
+Stop every worker recomputing the same cached value at once.
+
+When a popular key like `organisations` expires or is cleared, every request that wants it misses at
+the same moment and asks the API for it. `cache.set` takes a short Redis lock for the key first, so
+only the request holding the lock calls the API while the others wait for it to store the result.
+
+Keys that are about to expire are also refreshed early, before anyone misses. Each read decides
+at random whether to refresh, more likely the closer the key is to expiring and the longer the value
+takes to compute (“optimal probabilistic cache stampede prevention”, Vattani et al.).
+"""
+
+import logging
+import math
+import random
+import time
+import uuid
+from threading import Lock
+
+from app.extensions import redis_client
+
+logger = logging.getLogger(__name__)
+
+LOCK_TTL = 10
+WAIT_TIMEOUT = 2
+POLL_INTERVAL = 0.05
+# Higher values refresh earlier
+EARLY_REFRESH_BETA = 1.0
+# How long we assume an API call for a cached value takes until we’ve timed one
+DEFAULT_RECOMPUTE_TIME = 0.1
+
+# Only delete the lock if we still hold it, rather than one taken by someone else after ours expired
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def lock_key(redis_key):
+    return "{}-lock".format(redis_key)
+
+
+def acquire(redis_key):
+    """Take the lock for `redis_key`, returning a token to release it with, or `None` if someone else has it."""
+    token = uuid.uuid4().hex
+    if redis_client.set(lock_key(redis_key), token, ex=LOCK_TTL, nx=True):
+        return token
+    return None
+
+
+def release(redis_key, token):
+    try:
+        redis_client.redis_store.eval(_RELEASE_SCRIPT, 1, lock_key(redis_key), token)
+    except Exception:
+        # The lock will expire by itself after `LOCK_TTL`
+        logger.exception("Failed to release lock for {}".format(redis_key))
+
+
+def wait_for(redis_key, get, timeout=WAIT_TIMEOUT):
+    """
+    Wait for whoever holds the lock for `redis_key` to store its value, calling `get` until it
+    returns something. Gives up and returns `None` once the lock is released without a value or
+    `timeout` seconds have passed.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        value = get()
+        if value:
+            return value
+        if not redis_client.get(lock_key(redis_key)):
+            return get()
+    return None
+
+
+def should_refresh_early(ttl_remaining, recompute_time, beta=EARLY_REFRESH_BETA):
+    if ttl_remaining is None or ttl_remaining < 0:
+        # -1 or -2 from Redis mean the key has no expiry or no longer exists
+        return False
+    return -recompute_time * beta * math.log(1 - random.random()) >= ttl_remaining
+
+
+class RecomputeTimes:
+    """A moving average of how long the API takes to return each kind of cached value, eg `service-{service_id}`."""
+
+    def __init__(self, weight=0.2):
+        self.weight = weight
+        self._times = {}
+        self._lock = Lock()
+
+    def get(self, key_format):
+        return self._times.get(key_format, DEFAULT_RECOMPUTE_TIME)
+
+    def record(self, key_format, elapsed):
+        with self._lock:
+            previous = self._times.get(key_format)
+            self._times[key_format] = elapsed if previous is None else previous + self.weight * (elapsed - previous)
+
+
+recompute_times = RecomputeTimes()
@@ -37,8 +37,8 @@ class TemplateCategoryClient(NotifyAdminAPIClient):
 
     @cache.delete("template_category-{template_category_id}")
     @cache.delete("template_categories")
-    @cache.delete_by_pattern("service-????????-????-????-????-????????????-templates")
-    @cache.delete_by_pattern("template-????????-????-????-????-????????????-version-*")
+    @cache.bump_generation("template_category")
+    @cache.bump_template_category_version
     def update_template_category(
         self,
         template_category_id,
@@ -65,6 +65,7 @@ class TemplateCategoryClient(NotifyAdminAPIClient):
 
     @cache.delete("template_category-{template_category_id}")
     @cache.delete("template_categories")
+    @cache.bump_template_category_version
     def delete_template_category(self, template_category_id, cascade=False):
         try:
             self.delete(url="/template-category/{}".format(template_category_id), data=cascade)
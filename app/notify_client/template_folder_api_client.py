@@ -1,4 +1,3 @@
-from app.extensions import redis_client
 from app.notify_client import NotifyAdminAPIClient, cache
 
 
@@ -39,7 +38,7 @@ class TemplateFolderAPIClient(NotifyAdminAPIClient):
         )
 
         if template_ids:
-            redis_client.delete(
+            cache.delete_keys(
                 *map(
                     "template-{}-version-None".format,
                     template_ids,
@@ -13,6 +13,8 @@ from app.notify_client import NotifyAdminAPIClient, cache
 
 ALLOWED_ATTRIBUTES = {"name", "email_address", "mobile_number", "auth_type", "updated_by", "blocked", "password_expired"}
 
+USER_BY_EMAIL_NOT_FOUND = "user-by-email-not-found--{email_address!n}"
+
 
 class UserApiClient(NotifyAdminAPIClient):
     def init_app(self, app):
@@ -22,6 +24,7 @@ class UserApiClient(NotifyAdminAPIClient):
         self.notify_user_id = app.config["NOTIFY_USER_ID"]
         self.notify_service_id = app.config["NOTIFY_SERVICE_ID"]
 
+    @cache.delete(USER_BY_EMAIL_NOT_FOUND)
     def register_user(self, name, email_address, mobile_number, password, auth_type):
         password = self._create_message_digest(password)
         data = {
@@ -45,6 +48,7 @@ class UserApiClient(NotifyAdminAPIClient):
         user_data = self.get("/user/email", params={"email": email_address})
         return user_data["data"]
 
+    @cache.set_not_found(USER_BY_EMAIL_NOT_FOUND)
     def get_user_by_email_or_none(self, email_address):
         try:
             return self.get_user_by_email(email_address)
@@ -62,6 +66,8 @@ class UserApiClient(NotifyAdminAPIClient):
 
         url = "/user/{}".format(user_id)
         user_data = self.post(url, data=data)
+        if "email_address" in data:
+            cache.delete_keys(cache.format_key(USER_BY_EMAIL_NOT_FOUND, email_address=data["email_address"]))
         return user_data["data"]
 
     @cache.delete("user-{user_id}")
@@ -173,6 +179,7 @@ class UserApiClient(NotifyAdminAPIClient):
     @cache.delete("service-{service_id}")
     @cache.delete("service-{service_id}-template-folders")
     @cache.delete("user-{user_id}")
+    @cache.delete("user-{user_id}-organisations-and-services")
     def add_user_to_service(self, service_id, user_id, permissions, folder_permissions):
         # permissions passed in are the combined admin roles, not db permissions
         endpoint = "/service/{}/users/{}".format(service_id, user_id)
@@ -184,6 +191,7 @@ class UserApiClient(NotifyAdminAPIClient):
         self.post(endpoint, data=data)
 
     @cache.delete("user-{user_id}")
+    @cache.delete("user-{user_id}-organisations-and-services")
     def add_user_to_organisation(self, org_id, user_id):
         resp = self.post("/organisations/{}/users/{}".format(org_id, user_id), data={})
         return resp["data"]
@@ -227,10 +235,16 @@ class UserApiClient(NotifyAdminAPIClient):
         data = {"email": new_email}
         self.post(endpoint, data)
 
+    @cache.set("user-{user_id}-organisations-and-services")
     def get_organisations_and_services_for_user(self, user_id):
         endpoint = "/user/{}/organisations-and-services".format(user_id)
         return self.get(endpoint)
 
+    def delete_cached_organisations_and_services(self, users):
+        """Drop the cached lists of organisations and services of `users`, after something in them has changed."""
+        if users:
+            cache.delete_keys(*("user-{}-organisations-and-services".format(user["id"]) for user in users))
+
     def get_security_keys_for_user(self, user_id):
         endpoint = "/user/{}/fido2_keys".format(user_id)
         return self.get(endpoint)
@@ -0,0 +1,178 @@
+"""
+Per-request breakdown of where the time went: calls to the Notify API, Redis commands, other HTTP
+services (template preview, GC Articles, file scanning) and template rendering.
+
+Each part adds its elapsed time to a tally on `flask.g`. When the response is ready a one-line
+summary is put in the WSGI environ as `notify.timings`, and gunicorn adds it to the request’s line in
+the access log (see `access_log_format` in `gunicorn_config.py`). If `SERVER_TIMING_HEADER_ENABLED` is
+set it is also sent in a `Server-Timing` header so the breakdown shows up in the browser's developer
+tools.
+
+API calls made concurrently (see `app.fan_out.gather`) are each counted in full, so the API time
+can add up to more than the time the request took.
+
+The number of calls is counted too. A view can declare how many it expects to make with
+`call_budget`, and a warning is logged whenever a request goes over.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+from time import monotonic
+
+from flask import before_render_template, current_app, g, has_app_context, request, template_rendered
+from redis import StrictRedis
+from redis.client import Pipeline
+
+from app.extensions import statsd_client
+
+API = "api"
+HTTP = "http"
+REDIS = "redis"
+RENDER = "render"
+
+_TIMINGS = "_request_timings"
+_RENDER_STARTS = "_render_starts"
+_BUDGET = "_call_budget"
+
+# The key in the WSGI environ gunicorn’s access log reads the summary from
+ENVIRON_KEY = "notify.timings"
+
+
+def record(component, elapsed):
+    if not has_app_context():
+        return
+
+    timings = g.setdefault(_TIMINGS, {})
+    total, count = timings.get(component, (0, 0))
+    timings[component] = (total + elapsed, count + 1)
+
+
+@contextmanager
+def timed(component):
+    start = monotonic()
+    try:
+        yield
+    finally:
+        record(component, monotonic() - start)
+
+
+def call_budget(**budget):
+    """
+    Declare the most calls of each kind a view should need, eg `@call_budget(api=10, redis=20)`.
+    Put it below `@main.route`. Calls made by `before_request` hooks count towards the budget.
+    """
+
+    def wrap(func):
+        @wraps(func)
+        def wrap_func(*args, **kwargs):
+            setattr(g, _BUDGET, budget)
+            return func(*args, **kwargs)
+
+        # So tests can check a view against the budget it declares
+        wrap_func.call_budget = budget
+        return wrap_func
+
+    return wrap
+
+
+def _check_budget(timings):
+    """Warn about each kind of call the request made more of than its budget."""
+    for component, limit in g.get(_BUDGET, {}).items():
+        _elapsed, count = timings.get(component, (0, 0))
+        if count > limit:
+            current_app.logger.warning(
+                "{} made {} {} calls, more than its budget of {}".format(request.endpoint, count, component, limit)
+            )
+            statsd_client.incr("call_budget.{}.{}.exceeded".format(request.endpoint, component))
+
+
+def summary():
+    """Elapsed seconds and number of calls for each component, eg `{"api": (0.2, 3)}`."""
+    return dict(g.get(_TIMINGS, {}))
+
+
+def server_timing_header(timings, total=None):
+    metrics = [
+        '{};dur={:.1f};desc="{} call(s)"'.format(component, elapsed * 1000, count)
+        for component, (elapsed, count) in sorted(timings.items())
+    ]
+    if total is not None:
+        metrics.append("total;dur={:.1f}".format(total * 1000))
+    return ", ".join(metrics)
+
+
+def format_summary(timings):
+    """Timings as logged, eg `api=250.0ms/3 redis=1.2ms/4`."""
+    return (
+        " ".join(
+            "{}={:.1f}ms/{}".format(component, elapsed * 1000, count) for component, (elapsed, count) in sorted(timings.items())
+        )
+        or "none"
+    )
+
+
+class TimedPipeline(Pipeline):
+    """A Redis pipeline that records how long it takes to send its commands, as a single call."""
+
+    def execute(self, raise_on_error=True):
+        start = monotonic()
+        try:
+            return super().execute(raise_on_error)
+        finally:
+            record(REDIS, monotonic() - start)
+
+
+class TimedRedis(StrictRedis):
+    """A Redis client that records how long every command takes."""
+
+    def execute_command(self, *args, **options):
+        start = monotonic()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            record(REDIS, monotonic() - start)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        # A pipeline queues its commands rather than sending them with `execute_command`
+        return TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+def _start_render(sender, template, context, **extra):
+    g.setdefault(_RENDER_STARTS, []).append(monotonic())
+
+
+def _finish_render(sender, template, context, **extra):
+    starts = g.get(_RENDER_STARTS)
+    if not starts:
+        return
+
+    elapsed = monotonic() - starts.pop()
+    # A template rendered from inside another one is already counted in the outer one’s time
+    if not starts:
+        record(RENDER, elapsed)
+
+
+def reset():
+    g.pop(_TIMINGS, None)
+    g.pop(_RENDER_STARTS, None)
+    g.pop(_BUDGET, None)
+
+
+def add_timings_after_request(response):
+    timings = summary()
+    total = monotonic() - g.start if "start" in g else None
+    _check_budget(timings)
+
+    request.environ[ENVIRON_KEY] = format_summary(timings)
+
+    if current_app.config["SERVER_TIMING_HEADER_ENABLED"]:
+        response.headers["Server-Timing"] = server_timing_header(timings, total)
+
+    return response
+
+
+def init_app(application):
+    application.before_request(reset)
+    application.after_request(add_timings_after_request)
+    before_render_template.connect(_start_render, application)
+    template_rendered.connect(_finish_render, application)
@@ -3,6 +3,8 @@ from enum import Enum
 import requests
 from flask import current_app
 
+from app import request_timing
+
 REQUEST_TIMEOUT = 15  # seconds
 
 
@@ -37,7 +39,8 @@ class ScanFilesApiClient:
         }
 
         try:
-            response = requests.post(self.scanfiles_url, files=data, headers=headers, timeout=15)
+            with request_timing.timed(request_timing.HTTP):
+                response = requests.post(self.scanfiles_url, files=data, headers=headers, timeout=15)
         except Exception as e:
             current_app.logger.info("ScanFilesApiClient: Exception raised while scanning file. Error: {}".format(str(e)))
             return False
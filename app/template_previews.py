@@ -1,7 +1,7 @@
 import requests
 from flask import current_app, json
 
-from app import current_service
+from app import current_service, request_timing
 
 
 class TemplatePreview:
@@ -13,15 +13,16 @@ class TemplatePreview:
             "values": values,
             "filename": current_service.letter_branding and current_service.letter_branding["filename"],
         }
-        resp = requests.post(
-            "{}/preview.{}{}".format(
-                current_app.config["TEMPLATE_PREVIEW_API_HOST"],
-                filetype,
-                "?page={}".format(page) if page else "",
-            ),
-            json=data,
-            headers={"Authorization": "Token {}".format(current_app.config["TEMPLATE_PREVIEW_API_KEY"])},
-        )
+        with request_timing.timed(request_timing.HTTP):
+            resp = requests.post(
+                "{}/preview.{}{}".format(
+                    current_app.config["TEMPLATE_PREVIEW_API_HOST"],
+                    filetype,
+                    "?page={}".format(page) if page else "",
+                ),
+                json=data,
+                headers={"Authorization": "Token {}".format(current_app.config["TEMPLATE_PREVIEW_API_KEY"])},
+            )
         return (resp.content, resp.status_code, resp.headers.items())
 
     @classmethod
@@ -32,11 +33,12 @@ class TemplatePreview:
             "values": None,
             "filename": filename,
         }
-        resp = requests.post(
-            "{}/preview.png".format(current_app.config["TEMPLATE_PREVIEW_API_HOST"]),
-            json=data,
-            headers={"Authorization": "Token {}".format(current_app.config["TEMPLATE_PREVIEW_API_KEY"])},
-        )
+        with request_timing.timed(request_timing.HTTP):
+            resp = requests.post(
+                "{}/preview.png".format(current_app.config["TEMPLATE_PREVIEW_API_HOST"]),
+                json=data,
+                headers={"Authorization": "Token {}".format(current_app.config["TEMPLATE_PREVIEW_API_KEY"])},
+            )
         return (resp.content, resp.status_code, resp.headers.items())
 
     @classmethod
@@ -60,8 +62,9 @@ def get_page_count_for_letter(template, values=None):
 
 
 def validate_letter(pdf_file):
-    return requests.post(
-        "{}/precompiled/validate?include_preview=true".format(current_app.config["TEMPLATE_PREVIEW_API_HOST"]),
-        data=pdf_file,
-        headers={"Authorization": "Token {}".format(current_app.config["TEMPLATE_PREVIEW_API_KEY"])},
-    )
+    with request_timing.timed(request_timing.HTTP):
+        return requests.post(
+            "{}/precompiled/validate?include_preview=true".format(current_app.config["TEMPLATE_PREVIEW_API_HOST"]),
+            data=pdf_file,
+            headers={"Authorization": "Token {}".format(current_app.config["TEMPLATE_PREVIEW_API_KEY"])},
+        )
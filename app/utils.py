@@ -273,7 +273,8 @@ def generate_notifications_csv(**kwargs):
     yield ",".join(fieldnames) + "\n"
 
     while kwargs["page"]:
-        notifications_resp = notification_api_client.get_notifications_for_service(**kwargs)
+        # Streamed so that a whole page of notifications is never decoded into memory at once
+        notifications_resp = notification_api_client.get_notifications_for_service(**kwargs, stream=True)
         for notification in notifications_resp["notifications"]:
             if kwargs.get("job_id"):
                 values = (
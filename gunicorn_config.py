@@ -16,6 +16,8 @@ workers = 5
 worker_class = "gevent"
 bind = "0.0.0.0:{}".format(os.getenv("PORT"))
 accesslog = "-"
+# Gunicorn’s default format, plus the breakdown of where the time went, see app/request_timing.py
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" timings="%({notify.timings}e)s"'
 
 # See AWS doc
 # > We also recommend that you configure the idle timeout of your application
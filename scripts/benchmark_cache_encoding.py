@@ -0,0 +1,66 @@
+"""
+Compare storing cached values as plain JSON with compressing them (see app/notify_client/cache_encoding.py),
+on payloads shaped like real Notify API responses.
+
+Run from the root of the repository with:
+
+    python -m scripts.benchmark_cache_encoding [--number 200] [--redis-url redis://localhost:6379]
+
+With `--redis-url` the values are also stored in that Redis and `MEMORY USAGE` is reported for
+each, then deleted again. Without it only the length of the stored values is reported.
+"""
+
+import argparse
+import json
+import uuid
+import zlib
+from timeit import timeit
+
+from app.notify_client import cache_encoding
+from scripts.benchmark_json_codec import payloads
+
+
+def stored_values(payload):
+    plain = json.dumps(payload)
+    compressed = cache_encoding.ZLIB + zlib.compress(plain.encode("utf-8"), cache_encoding.COMPRESSION_LEVEL)
+    return {"plain": plain.encode("utf-8"), "zlib": compressed}
+
+
+def memory_usage(redis, value):
+    key = "benchmark-cache-encoding-{}".format(uuid.uuid4())
+    redis.set(key, value, ex=60)
+    try:
+        return redis.memory_usage(key)
+    finally:
+        redis.delete(key)
+
+
+def benchmark(number, redis=None):
+    print("{:<22} {:<6} {:>10} {:>10} {:>10} {:>10}".format("payload", "format", "size", "memory", "encode", "decode"))
+    for payload_name, payload in payloads().items():
+        for format_name, stored in stored_values(payload).items():
+            threshold = 0 if format_name == "zlib" else None
+            cache_encoding._threshold = threshold
+            encode_time = timeit(lambda: cache_encoding.encode(payload), number=number) / number
+            decode_time = timeit(lambda: cache_encoding.decode(stored), number=number) / number
+            memory = "{}B".format(memory_usage(redis, stored)) if redis else "-"
+            print(
+                "{:<22} {:<6} {:>9}B {:>10} {:>8.3f}ms {:>8.3f}ms".format(
+                    payload_name, format_name, len(stored), memory, encode_time * 1000, decode_time * 1000
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200, help="how many times to time each operation")
+    parser.add_argument("--redis-url", help="a Redis to measure memory use in")
+    args = parser.parse_args()
+
+    redis = None
+    if args.redis_url:
+        from redis import Redis
+
+        redis = Redis.from_url(args.redis_url)
+
+    benchmark(args.number, redis)
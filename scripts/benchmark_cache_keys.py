@@ -0,0 +1,86 @@
+"""
+Compare how long the `cache` decorators take to make their Redis keys, looking up the method’s
+signature on every call (as they used to) against the key builders made once when decorating.
+
+Run from the root of the repository with:
+
+    python -m scripts.benchmark_cache_keys [--number 100000]
+
+`update_service_template` has three stacked `cache.delete` decorators, so makes three keys per call.
+"""
+
+import argparse
+import uuid
+from contextlib import suppress
+from inspect import signature
+from timeit import timeit
+
+from app.notify_client import cache
+from app.notify_client.service_api_client import ServiceAPIClient
+from app.notify_client.user_api_client import UserApiClient
+
+SERVICE_ID = str(uuid.uuid4())
+TEMPLATE_ID = str(uuid.uuid4())
+
+
+def _get_argument(argument_name, client_method, args, kwargs):
+    with suppress(KeyError):
+        return kwargs[argument_name]
+
+    with suppress(ValueError, IndexError):
+        argument_index = list(signature(client_method).parameters).index(argument_name)
+        return args[argument_index - 1]
+
+    with suppress(KeyError):
+        return signature(client_method).parameters[argument_name].default
+
+    raise TypeError("{}() takes no argument called '{}'".format(client_method.__name__, argument_name))
+
+
+def reflective_make_key(key_format, client_method, args, kwargs):
+    """How the keys were made before the key builders."""
+    return key_format.format(
+        **{
+            argument_name: _get_argument(argument_name, client_method, args, kwargs)
+            for argument_name in list(signature(client_method).parameters)
+        }
+    )
+
+
+def cases():
+    return {
+        "get_service": (ServiceAPIClient.get_service, ["service-{service_id}"], (SERVICE_ID,), {}),
+        "get_user": (UserApiClient._get_user, ["user-{user_id}"], (str(uuid.uuid4()),), {}),
+        "update_service_template": (
+            ServiceAPIClient.update_service_template,
+            ["service-{service_id}-templates", "template-{id_}-version-None", "template-{id_}-versions"],
+            (TEMPLATE_ID, "Name", "email", "Content", SERVICE_ID),
+            {"subject": "Subject"},
+        ),
+    }
+
+
+def benchmark(number):
+    print("{:<26} {:>12} {:>12} {:>8}".format("method", "before", "after", "speedup"))
+    for name, (client_method, key_formats, args, kwargs) in cases().items():
+        builders = [cache._key_builder(key_format, client_method) for key_format in key_formats]
+        assert [builder(args, kwargs) for builder in builders] == [
+            reflective_make_key(key_format, client_method, args, kwargs) for key_format in key_formats
+        ]
+
+        before = timeit(
+            lambda: [reflective_make_key(key_format, client_method, args, kwargs) for key_format in key_formats],
+            number=number,
+        )
+        after = timeit(lambda: [builder(args, kwargs) for builder in builders], number=number)
+        print(
+            "{:<26} {:>10.2f}µs {:>10.2f}µs {:>7.1f}x".format(
+                name, before / number * 1_000_000, after / number * 1_000_000, before / after
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100_000, help="how many times to time each call")
+    benchmark(parser.parse_args().number)
@@ -0,0 +1,62 @@
+"""
+Compare the JSON codecs in app/json_codec.py on payloads shaped like real Notify API responses.
+
+Run from the root of the repository with:
+
+    python -m scripts.benchmark_json_codec [--number 200]
+
+The codecs that aren’t installed are skipped.
+"""
+
+import argparse
+import uuid
+from timeit import timeit
+
+from tests import notification_json, service_json, template_json
+
+from app import json_codec
+
+SERVICE_ID = str(uuid.uuid4())
+
+
+def payloads():
+    return {
+        "service": {"data": service_json(SERVICE_ID, users=[str(uuid.uuid4()) for _ in range(20)])},
+        "templates (500)": {
+            "data": [
+                template_json(
+                    SERVICE_ID,
+                    str(uuid.uuid4()),
+                    name="Template {}".format(i),
+                    type_="email",
+                    subject="Subject ((name))",
+                    content="Bonjour ((name)), voici votre numéro de référence : ((reference)).\n\n" * 10,
+                )
+                for i in range(500)
+            ]
+        },
+        "notifications (1000)": notification_json(SERVICE_ID, rows=1000, with_links=True),
+    }
+
+
+def benchmark(number):
+    codecs = [codec for name, codec in json_codec.CODECS.items() if name != json_codec.ORJSON or json_codec.orjson]
+
+    print("{:<22} {:<8} {:>10} {:>10} {:>10}".format("payload", "codec", "size", "dumps", "loads"))
+    for payload_name, payload in payloads().items():
+        for codec in codecs:
+            encoded = codec.dumps(payload)
+            as_bytes = encoded.encode("utf-8")
+            dumps_time = timeit(lambda: codec.dumps(payload), number=number) / number
+            loads_time = timeit(lambda: codec.loads(as_bytes), number=number) / number
+            print(
+                "{:<22} {:<8} {:>9}B {:>8.3f}ms {:>8.3f}ms".format(
+                    payload_name, codec.name, len(as_bytes), dumps_time * 1000, loads_time * 1000
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200, help="how many times to time each operation")
+    benchmark(parser.parse_args().number)
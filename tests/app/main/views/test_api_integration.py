@@ -165,6 +165,7 @@ class TestApiKeys:
         client_request,
         mock_get_api_keys,
         mock_get_api_key_statistics,
+        fake_uuid,
     ):
         page = client_request.get("main.api_keys", service_id=SERVICE_ONE_ID)
         rows = [normalize_spaces(row.text) for row in page.select("main tr")]
@@ -174,6 +175,9 @@ class TestApiKeys:
         assert "Revoke API key some key name" in rows[2]
 
         mock_get_api_keys.assert_called_once_with(SERVICE_ONE_ID)
+        assert sorted(call.kwargs["key_id"] for call in mock_get_api_key_statistics.call_args_list) == sorted(
+            ["1234567", fake_uuid]
+        )
 
     def test_should_show_empty_api_keys_page(
         self,
@@ -15,13 +15,16 @@ from app.main.views.dashboard import (
     get_dashboard_totals,
     get_free_paid_breakdown_for_billable_units,
 )
-from tests import validate_route_permission, validate_route_permission_with_client
+from tests import job_json, validate_route_permission, validate_route_permission_with_client
 from tests.conftest import (
     SERVICE_ONE_ID,
     ClientRequest,
     a11y_test,
+    api_call_budget,
     create_active_caseworking_user,
     create_active_user_view_permissions,
+    create_service_templates,
+    declared_api_call_budget,
     normalize_spaces,
     set_config,
 )
@@ -264,6 +267,35 @@ def test_should_show_recent_templates_on_dashboard(
     assert "100" in table_rows[1].find_all("td")[0].text
 
 
+def test_dashboard_stays_within_api_call_budget(client_request, api_user_active):
+    no_notifications = {"requested": 0, "delivered": 0, "failed": 0}
+    responses = {
+        "/service/{}/template".format(SERVICE_ONE_ID): create_service_templates(SERVICE_ONE_ID),
+        "/service/{}/template-statistics".format(SERVICE_ONE_ID): {"data": copy.deepcopy(stub_template_stats)},
+        "/service/{}/job".format(SERVICE_ONE_ID): {
+            "data": [
+                job_json(SERVICE_ONE_ID, api_user_active, job_status="finished"),
+                job_json(SERVICE_ONE_ID, api_user_active, job_status="scheduled", scheduled_for="2016-01-01 11:09:00"),
+            ],
+            "links": {},
+        },
+        "/service/{}/notifications/monthly".format(SERVICE_ONE_ID): {
+            "data": {"2024-04": {"sms": {"sent": 1}, "email": {"delivered": 1}, "letter": {}}}
+        },
+        "/service/{}/statistics".format(SERVICE_ONE_ID): {
+            "data": {"email": no_notifications, "sms": no_notifications, "letter": no_notifications}
+        },
+        "/service/{}/billing/yearly-usage-summary".format(SERVICE_ONE_ID): [],
+        "/service/{}/inbound-sms/summary".format(SERVICE_ONE_ID): {"count": 0, "most_recent": None},
+    }
+
+    with api_call_budget(declared_api_call_budget("main.service_dashboard"), responses):
+        client_request.get(
+            "main.service_dashboard",
+            service_id=SERVICE_ONE_ID,
+        )
+
+
 @freeze_time("2016-07-01 12:00")  # 4 months into 2016 fiscal year
 @pytest.mark.parametrize(
     "extra_args",
@@ -1003,48 +1003,54 @@ def test_clear_cache_shows_form(client_request, platform_admin_user, mocker):
 
 
 @pytest.mark.parametrize(
-    "model_type, expected_calls, expected_confirmation",
+    "model_type, expected_confirmation",
     (
-        (
-            "template",
-            [
-                call("service-????????-????-????-????-????????????-templates"),
-                call("template-????????-????-????-????-????????????-version-*"),
-                call("template-????????-????-????-????-????????????-versions"),
-            ],
-            "Removed 3 template objects from redis",
-        ),
-        (
-            "organisation",
-            [
-                call("organisations"),
-                call("domains"),
-                call("live-service-and-organisation-counts"),
-            ],
-            "Removed 3 organisation objects from redis",
-        ),
+        ("template", "Cleared template objects from the cache"),
+        ("organisation", "Cleared organisation objects from the cache"),
     ),
 )
-def test_clear_cache_submits_and_tells_you_how_many_things_were_deleted(
+def test_clear_cache_bumps_generation_of_cached_family(
     client_request,
     platform_admin_user,
     mocker,
     model_type,
-    expected_calls,
     expected_confirmation,
 ):
     redis = mocker.patch("app.main.views.platform_admin.redis_client")
-    redis.delete_cache_keys_by_pattern.side_effect = [0, 3, 1]
+    mock_bump = mocker.patch("app.notify_client.generations.bump")
     client_request.login(platform_admin_user)
 
     page = client_request.post("main.clear_cache", _data={"model_type": model_type}, _expected_status=200)
 
-    assert redis.delete_cache_keys_by_pattern.call_args_list == expected_calls
+    mock_bump.assert_called_once_with(model_type)
+    assert not redis.delete_cache_keys_by_pattern.called
 
     flash_banner = page.find("div", class_="banner-default")
     assert flash_banner.text.strip() == expected_confirmation
 
 
+def test_clear_cache_deletes_gc_articles_and_tells_you_how_many_things_were_deleted(
+    client_request,
+    platform_admin_user,
+    mocker,
+):
+    redis = mocker.patch("app.main.views.platform_admin.redis_client")
+    redis.delete_cache_keys_by_pattern.side_effect = [3, 1]
+    mock_bump = mocker.patch("app.notify_client.generations.bump")
+    client_request.login(platform_admin_user)
+
+    page = client_request.post("main.clear_cache", _data={"model_type": "gc_articles"}, _expected_status=200)
+
+    assert redis.delete_cache_keys_by_pattern.call_args_list == [
+        call("gc-articles--*"),
+        call("gc-articles-fallback--*"),
+    ]
+    assert not mock_bump.called
+
+    flash_banner = page.find("div", class_="banner-default")
+    assert flash_banner.text.strip() == "Removed 3 gc_articles objects from redis"
+
+
 def test_clear_cache_requires_option(client_request, platform_admin_user, mocker):
     redis = mocker.patch("app.main.views.platform_admin.redis_client")
     client_request.login(platform_admin_user)
@@ -1055,6 +1061,82 @@ def test_clear_cache_requires_option(client_request, platform_admin_user, mocker
     assert not redis.delete_cache_keys_by_pattern.called
 
 
+def test_clear_cache_shows_hit_ratios_and_memory_use(client_request, platform_admin_user, mocker):
+    mocker.patch("app.main.views.platform_admin.redis_client")
+    mocker.patch(
+        "app.main.views.platform_admin.cache_stats.totals",
+        return_value={
+            "service": {"hit": 6, "local_hit": 3, "miss": 1, "set": 1, "delete": 0},
+            "organisations": {"hit": 0, "local_hit": 0, "miss": 0, "set": 0, "delete": 2},
+        },
+    )
+    mocker.patch(
+        "app.main.views.platform_admin.cache_inspector.load",
+        return_value={
+            "cursor": 17,
+            "complete": False,
+            "families": {"service": {"keys": 2, "bytes": 800}, "organisations": {"keys": 1, "bytes": 2000}},
+            "largest": [[2000, "organisations"], [500, "service-1"], [300, "service-2"]],
+        },
+    )
+    client_request.login(platform_admin_user)
+
+    page = client_request.get("main.clear_cache")
+
+    assert [normalize_spaces(row.text) for row in page.select("[data-testid=cache-stats] tbody tr")] == [
+        "organisations 0 0 0 2 –",
+        "service 9 1 1 0 90.0%",
+    ]
+    assert [normalize_spaces(row.text) for row in page.select("[data-testid=cache-families] tbody tr")] == [
+        "organisations 1 2.0 kB",
+        "service 2 800 Bytes",
+    ]
+    assert normalize_spaces(page.select_one("[data-testid=cache-largest-keys] tbody tr").text) == "organisations 2.0 kB"
+    assert normalize_spaces(page.select_one("[data-testid=cache-inspection-status]").text) == (
+        "Part way through inspecting the cache. Continue to look at more keys."
+    )
+    assert normalize_spaces(page.select("form")[-1].select_one("button").text) == "Continue inspecting"
+    assert page.select("form")[-1]["action"] == url_for("main.inspect_cache")
+
+
+def test_clear_cache_shows_last_completed_inspection_while_another_is_under_way(client_request, platform_admin_user, mocker):
+    mocker.patch("app.main.views.platform_admin.redis_client")
+    mocker.patch("app.main.views.platform_admin.cache_stats.totals", return_value={})
+    mocker.patch(
+        "app.main.views.platform_admin.cache_inspector.load_completed",
+        return_value={"complete": True, "families": {"service": {"keys": 2, "bytes": 800}}, "largest": []},
+    )
+    mocker.patch(
+        "app.main.views.platform_admin.cache_inspector.load",
+        return_value={"complete": False, "families": {"service": {"keys": 1, "bytes": 300}}, "largest": []},
+    )
+    client_request.login(platform_admin_user)
+
+    page = client_request.get("main.clear_cache")
+
+    assert [normalize_spaces(row.text) for row in page.select("[data-testid=cache-families] tbody tr")] == [
+        "service 2 800 Bytes",
+    ]
+    assert normalize_spaces(page.select_one("[data-testid=cache-inspection-status]").text) == (
+        "Part way through inspecting the cache again. Showing the last finished inspection until this one is done."
+    )
+    assert normalize_spaces(page.select("form")[-1].select_one("button").text) == "Continue inspecting"
+
+
+def test_inspect_cache_continues_inspection(client_request, platform_admin_user, mocker):
+    mocker.patch("app.main.views.platform_admin.redis_client")
+    mock_run = mocker.patch("app.main.views.platform_admin.cache_inspector.run")
+    client_request.login(platform_admin_user)
+
+    client_request.post(
+        "main.inspect_cache",
+        _expected_status=302,
+        _expected_redirect=url_for("main.clear_cache"),
+    )
+
+    mock_run.assert_called_once_with()
+
+
 def test_reports_page(platform_admin_client):
     response = platform_admin_client.get(url_for("main.platform_admin_reports"))
 
@@ -24,9 +24,10 @@ from xlrd.biffh import XLRDError
 from xlrd.xldate import XLDateAmbiguous, XLDateError, XLDateNegative, XLDateTooLarge
 
 from app.main.views.send import daily_email_count, daily_sms_fragment_count
-from tests import validate_route_permission, validate_route_permission_with_client
+from tests import template_json, validate_route_permission, validate_route_permission_with_client
 from tests.conftest import (
     SERVICE_ONE_ID,
+    api_call_budget,
     create_active_caseworking_user,
     create_active_user_with_permissions,
     create_email_template,
@@ -37,6 +38,7 @@ from tests.conftest import (
     create_multiple_sms_senders_with_diff_default,
     create_sms_template,
     create_template,
+    declared_api_call_budget,
     fake_uuid,
     mock_get_service_email_template,
     mock_get_service_letter_template,
@@ -627,6 +629,53 @@ def test_upload_valid_csv_redirects_to_check_page(
     )
 
 
+def test_check_messages_stays_within_api_call_budget(
+    client_request,
+    mocker,
+    mock_get_live_service,
+    mock_s3_set_metadata,
+    active_user_with_permissions,
+    fake_uuid,
+):
+    no_notifications = {"requested": 0, "delivered": 0, "failed": 0}
+    responses = {
+        "/service/{}/template/{}".format(SERVICE_ONE_ID, fake_uuid): {
+            "data": template_json(
+                SERVICE_ONE_ID, fake_uuid, "Two week reminder", "sms", "((name)), Template <em>content</em> with & entity"
+            )
+        },
+        "/service/{}/users".format(SERVICE_ONE_ID): {"data": [active_user_with_permissions]},
+        "/service/{}/template-statistics".format(SERVICE_ONE_ID): {"data": []},
+        "/service/{}/statistics".format(SERVICE_ONE_ID): {
+            "data": {"email": no_notifications, "sms": no_notifications, "letter": no_notifications}
+        },
+        "/service/{}/notifications/monthly".format(SERVICE_ONE_ID): {"data": {}},
+        # The job for the upload doesn’t exist until the user sends it
+        "/service/{}/job/{}".format(SERVICE_ONE_ID, fake_uuid): 404,
+        "/service/{}/job".format(SERVICE_ONE_ID): {"data": [], "links": {}},
+    }
+
+    with client_request.session_transaction() as session:
+        session["file_uploads"] = {fake_uuid: {"template_id": fake_uuid}}
+
+    mocker.patch(
+        "app.main.views.send.s3download",
+        return_value="""
+        phone number,name,thing,thing,thing
+        6502532223, A,   foo,  foo,  foo
+    """,
+    )
+
+    with api_call_budget(declared_api_call_budget("main.check_messages"), responses):
+        client_request.get(
+            "main.check_messages",
+            service_id=SERVICE_ONE_ID,
+            template_id=fake_uuid,
+            upload_id=fake_uuid,
+            original_file_name="example.csv",
+        )
+
+
 @pytest.mark.parametrize(
     "extra_args, expected_recipient, expected_message",
     [
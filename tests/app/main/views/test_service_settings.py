@@ -3519,6 +3519,7 @@ def test_archive_service_after_confirm(
     fake_uuid,
 ):
     mocked_fn = mocker.patch("app.service_api_client.post")
+    mocker.patch("app.user_api_client.get_users_for_service", return_value=[])
     client_request.login(user)
     page = client_request.post(
         "main.archive_service",
@@ -3596,6 +3597,7 @@ def test_suspend_service_after_confirm(
     mock_get_inbound_number_for_service,
 ):
     mocked_fn = mocker.patch("app.service_api_client.post", return_value=service_one)
+    mocker.patch("app.user_api_client.get_users_for_service", return_value=[])
 
     response = platform_admin_client.post(url_for("main.suspend_service", service_id=service_one["id"]))
 
@@ -3656,6 +3658,7 @@ def test_resume_service_after_confirm(
 ):
     service_one["active"] = False
     mocked_fn = mocker.patch("app.service_api_client.post", return_value=service_one)
+    mocker.patch("app.user_api_client.get_users_for_service", return_value=[])
 
     response = platform_admin_client.post(url_for("main.resume_service", service_id=service_one["id"]))
 
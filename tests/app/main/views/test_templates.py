@@ -38,14 +38,17 @@ from tests.conftest import (
     TEMPLATE_ONE_ID,
     ClientRequest,
     ElementNotFound,
+    api_call_budget,
     create_active_caseworking_user,
     create_active_user_view_permissions,
     create_email_template,
     create_letter_contact_block,
     create_letter_template,
     create_letter_template_with_variables,
+    create_service_templates,
     create_sms_template,
     create_template,
+    declared_api_call_budget,
     fake_uuid,
     mock_get_service_template_with_process_type,
     normalize_spaces,
@@ -323,6 +326,17 @@ def test_should_show_page_for_choosing_a_template(
     mock_get_template_folders.assert_called_once_with(SERVICE_ONE_ID)
 
 
+def test_choose_template_stays_within_api_call_budget(client_request):
+    responses = {
+        "/service/{}/template".format(SERVICE_ONE_ID): create_service_templates(SERVICE_ONE_ID),
+        "/service/{}/template-folder".format(SERVICE_ONE_ID): {"template_folders": []},
+        "/service/{}/job".format(SERVICE_ONE_ID): {"data": [], "links": {}},
+    }
+
+    with api_call_budget(declared_api_call_budget("main.choose_template"), responses):
+        client_request.get("main.choose_template", service_id=SERVICE_ONE_ID)
+
+
 def test_choose_template_can_pass_through_an_initial_state_to_templates_and_folders_selection_form(
     client_request,
     mock_get_template_folders,
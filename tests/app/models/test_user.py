@@ -74,3 +74,18 @@ def test_platform_admin_flag_set_in_session(client, mocker, is_platform_admin, v
     mocker.patch.dict("app.models.user.session", values=session_dict, clear=True)
 
     assert User({"platform_admin": is_platform_admin}).platform_admin == expected_result
+
+
+def test_user_services_are_built_once(app_, mocker):
+    mock_get = mocker.patch(
+        "app.models.user.user_api_client.get_organisations_and_services_for_user",
+        return_value={
+            "organisations": [],
+            "services": [{"id": "2", "name": "b service"}, {"id": "1", "name": "A service"}],
+        },
+    )
+    user = User({"id": 1, "services": ["1", "2"], "organisations": []})
+
+    assert [service.name for service in user.services] == ["A service", "b service"]
+    assert user.services is user.services
+    mock_get.assert_called_once_with(1)
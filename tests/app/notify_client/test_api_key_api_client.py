@@ -23,3 +23,17 @@ def test_get_api_keys_ranked(mocker, api_user_active):
 
     client.get_api_keys_ranked_by_notifications_created(n_days_back)
     mock_get.assert_called_once_with(url=expected_url)
+
+
+def test_get_api_keys_is_not_cached(mocker, api_user_active):
+    service_id = uuid.uuid4()
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get")
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mock_get = mocker.patch("app.notify_client.api_key_api_client.ApiKeyApiClient.get")
+
+    ApiKeyApiClient().get_api_keys(service_id)
+
+    mock_get.assert_called_once_with(url="/service/{}/api-keys".format(service_id))
+    assert not mock_redis_get.called
+    assert not mock_redis_set.called
@@ -1,7 +1,10 @@
 import pytest
 import requests
-from notifications_python_client.errors import HTTP503Error
+from flask import g
+from notifications_python_client.errors import HTTP503Error, InvalidResponse
 
+from app import json_codec, request_timing
+from app.notify_client import NotifyAdminAPIClient
 from app.notify_client.service_api_client import service_api_client
 
 
@@ -13,7 +16,7 @@ def test_retry_on_server_error_2_failed_tries(mocker):
 
     # 2 failures, 1 good response, successful on last try
     mocker.patch(
-        "notifications_python_client.base.requests.request",
+        "requests.Session.request",
         side_effect=[
             requests.exceptions.ConnectionError(),
             requests.exceptions.ConnectionError(),
@@ -32,7 +35,7 @@ def test_retry_on_server_error_3_failed_tries(mocker):
 
     # 3 failures, 1 good response: too many failures
     mocker.patch(
-        "notifications_python_client.base.requests.request",
+        "requests.Session.request",
         side_effect=[
             requests.exceptions.ConnectionError(),
             requests.exceptions.ConnectionError(),
@@ -43,3 +46,61 @@ def test_retry_on_server_error_3_failed_tries(mocker):
 
     with pytest.raises(HTTP503Error):
         service_api_client.get_live_services_data()
+
+
+def test_api_calls_are_timed_by_route_template(app_, mocker):
+    mock_statsd = mocker.patch("app.notify_client.statsd_client")
+    response = requests.Response()
+    response._content = b'{"a": 1}'
+    response.status_code = 200
+    mocker.patch("requests.Session.request", return_value=response)
+    client = NotifyAdminAPIClient()
+    client.init_app(app_)
+
+    with app_.test_request_context():
+        g.current_service = None
+        request_timing.reset()
+        client.get("/service/6ce466d0-fd6a-11e5-82f5-e0accb9d11a6/job")
+
+        assert request_timing.summary()["api"][1] == 1
+
+    mock_statsd.timing.assert_any_call("notify_api.service.id.job.get.response_size", 8)
+    mock_statsd.timing.assert_any_call("notify_api.service.id.job.get.elapsed_time", mocker.ANY)
+    mock_statsd.incr.assert_called_once_with("notify_api.service.id.job.get.200")
+
+
+@pytest.mark.parametrize(
+    "status_code, content, expected",
+    [
+        (200, b'{"data": [1, "\xc3\xa9"]}', {"data": [1, "é"]}),
+        (204, b"", None),
+    ],
+)
+def test_responses_are_decoded_with_json_codec(app_, mocker, status_code, content, expected):
+    response = requests.Response()
+    response._content = content
+    response.status_code = status_code
+    mocker.patch("requests.Session.request", return_value=response)
+    mock_loads = mocker.patch("app.json_codec.loads", wraps=json_codec.loads)
+    client = NotifyAdminAPIClient()
+    client.init_app(app_)
+
+    with app_.test_request_context():
+        g.current_service = None
+        assert client.get("/service") == expected
+
+    assert mock_loads.call_count == (1 if expected else 0)
+
+
+def test_response_that_is_not_json_raises_invalid_response(app_, mocker):
+    response = requests.Response()
+    response._content = b"<html>Bad gateway</html>"
+    response.status_code = 200
+    mocker.patch("requests.Session.request", return_value=response)
+    client = NotifyAdminAPIClient()
+    client.init_app(app_)
+
+    with app_.test_request_context():
+        g.current_service = None
+        with pytest.raises(InvalidResponse):
+            client.get("/service")
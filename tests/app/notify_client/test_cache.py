@@ -0,0 +1,366 @@
+import json
+
+import pytest
+import requests
+from flask import current_app, g, has_request_context
+from notifications_python_client.errors import HTTP503Error, HTTPError
+
+from app import organisations_client
+from app.notify_client import cache
+from app.notify_client.cache_stats import STALE, STALE_ON_ERROR
+from app.notify_client.organisations_api_client import OrganisationsClient
+from app.notify_client.retry import CircuitBreakerOpenError
+from app.notify_client.service_api_client import ServiceAPIClient
+
+
+def _response(status_code, content=b"", headers=None):
+    response = requests.Response()
+    response._content = content
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+def _stored(validators, body):
+    return json.dumps({"validators": validators, "body": body}).encode("utf-8")
+
+
+def test_conditional_get_stores_body_and_validators(mocker):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    send = mocker.Mock(return_value=_response(200, b'{"data": []}', {"ETag": '"abc"'}))
+
+    response = cache.conditional_get("services-None", send)
+
+    assert response.json() == {"data": []}
+    send.assert_called_once_with({})
+    mock_redis_get.assert_called_once_with("services-None")
+    mock_redis_set.assert_called_once_with(
+        "services-None",
+        json.dumps({"validators": {"ETag": '"abc"'}, "body": '{"data": []}'}),
+        ex=cache.REVALIDATION_TTL,
+    )
+
+
+def test_conditional_get_uses_stored_body_when_not_modified(mocker):
+    mocker.patch(
+        "app.extensions.RedisClient.get",
+        return_value=_stored({"ETag": '"abc"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}, '{"data": [1]}'),
+    )
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    send = mocker.Mock(return_value=_response(304))
+
+    response = cache.conditional_get("services-None", send)
+
+    assert response.status_code == 200
+    assert response.json() == {"data": [1]}
+    send.assert_called_once_with({"If-None-Match": '"abc"', "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    assert not mock_redis_set.called
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        _response(200, b'{"data": []}'),
+        _response(202, b'{"data": []}', {"ETag": '"abc"'}),
+    ],
+)
+def test_conditional_get_only_stores_successful_responses_with_validators(mocker, response):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+
+    assert cache.conditional_get("services-None", mocker.Mock(return_value=response)) is response
+    assert not mock_redis_set.called
+
+
+def test_client_revalidates_opted_in_reads_when_enabled(app_, mocker):
+    mocker.patch("app.notify_client.current_user", id="1", platform_admin=False)
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=_stored({"ETag": '"abc"'}, '{"data": [1]}'))
+    mock_request = mocker.patch("requests.Session.request", return_value=_response(304))
+    app_.config["API_CONDITIONAL_GET_ENABLED"] = True
+    client = ServiceAPIClient()
+    client.init_app(app_)
+
+    with app_.test_request_context():
+        g.current_service = None
+        assert client.get_services({"detailed": True}) == {"data": [1]}
+        assert cache.revalidation_key() is None
+
+    mock_redis_get.assert_called_once_with("services-{'detailed': True}")
+    assert mock_request.call_args[1]["headers"]["If-None-Match"] == '"abc"'
+
+
+def test_client_does_not_revalidate_when_disabled(app_, mocker):
+    mocker.patch("app.notify_client.current_user", id="1", platform_admin=False)
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get")
+    mock_request = mocker.patch("requests.Session.request", return_value=_response(200, b'{"data": []}'))
+    client = ServiceAPIClient()
+    client.init_app(app_)
+
+    assert app_.config["API_CONDITIONAL_GET_ENABLED"] is False
+    with app_.test_request_context():
+        g.current_service = None
+        client.get_services({"detailed": True})
+
+    assert mock_redis_get.call_args_list == []
+    assert "If-None-Match" not in mock_request.call_args[1]["headers"]
+
+
+def test_client_does_not_revalidate_other_reads(app_, mocker):
+    mocker.patch("app.notify_client.current_user", id="1", platform_admin=False)
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get")
+    mock_request = mocker.patch("requests.Session.request", return_value=_response(200, b'{"data": []}'))
+    app_.config["API_CONDITIONAL_GET_ENABLED"] = True
+    client = ServiceAPIClient()
+    client.init_app(app_)
+
+    with app_.test_request_context():
+        g.current_service = None
+        client.find_services_by_name("foo")
+
+    assert mock_redis_get.call_args_list == []
+    assert "If-None-Match" not in mock_request.call_args[1]["headers"]
+
+
+@pytest.fixture
+def stored_organisations(mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+
+    def _stored_organisations(age):
+        return mocker.patch(
+            "app.notify_client.generations.read",
+            return_value=(b"", b'[{"id": "old"}]', cache.TTL - age),
+        )
+
+    return _stored_organisations
+
+
+def _api_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    # As `HTTPError.create` does for failed requests
+    return HTTP503Error(response) if status_code == 503 else HTTPError(response)
+
+
+def test_cache_set_serves_stale_value_and_refreshes_it_in_background(stored_organisations, mocker):
+    stored_organisations(cache.SOFT_TTL + 60)
+    mock_refresh = mocker.patch("app.notify_client.cache._refresh_in_background")
+    mock_record = mocker.patch("app.notify_client.cache.cache_stats.record")
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get")
+
+    assert OrganisationsClient().get_organisations() == [{"id": "old"}]
+
+    assert not mock_api_get.called
+    mock_refresh.assert_called_once_with("organisations", b"", mocker.ANY)
+    assert mocker.call(STALE, "organisations") in mock_record.call_args_list
+
+
+def test_cache_set_keeps_values_in_redis_past_hard_ttl():
+    assert cache.SOFT_TTL < cache.HARD_TTL < cache.TTL
+
+
+def test_cache_set_calls_api_once_past_hard_ttl(stored_organisations, mocker):
+    stored_organisations(cache.HARD_TTL + 60)
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mocker.patch("app.notify_client.single_flight.release")
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get", return_value=[{"id": "new"}])
+
+    assert OrganisationsClient().get_organisations() == [{"id": "new"}]
+
+    mock_api_get.assert_called_once_with(url="/organisations")
+    mock_redis_set.assert_called_once_with("organisations", '[{"id": "new"}]', ex=cache.TTL)
+
+
+@pytest.mark.parametrize("error", [_api_error(503), CircuitBreakerOpenError("GET /organisations")])
+def test_cache_set_serves_value_past_hard_ttl_if_api_is_unavailable(stored_organisations, mocker, error):
+    stored_organisations(cache.HARD_TTL + 60)
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mocker.patch("app.notify_client.single_flight.release")
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mock_record = mocker.patch("app.notify_client.cache.cache_stats.record")
+    mock_incr = mocker.patch("app.notify_client.cache.statsd_client.incr")
+    mocker.patch("app.notify_client.NotifyAdminAPIClient.get", side_effect=error)
+
+    assert OrganisationsClient().get_organisations() == [{"id": "old"}]
+
+    assert not mock_redis_set.called
+    assert mocker.call(STALE_ON_ERROR, "organisations") in mock_record.call_args_list
+    mock_incr.assert_called_once_with("cache.stale_on_error")
+
+
+@pytest.mark.parametrize("status_code", [404, 500])
+def test_cache_set_raises_other_api_errors_past_hard_ttl(stored_organisations, mocker, status_code):
+    stored_organisations(cache.HARD_TTL + 60)
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mocker.patch("app.notify_client.single_flight.release")
+    mocker.patch("app.notify_client.NotifyAdminAPIClient.get", side_effect=_api_error(status_code))
+
+    with pytest.raises(HTTPError):
+        OrganisationsClient().get_organisations()
+
+
+def test_cache_set_raises_api_errors_if_nothing_is_stored(mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+    mocker.patch("app.notify_client.generations.read", return_value=(b"", None, -2))
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mocker.patch("app.notify_client.single_flight.release")
+    mocker.patch("app.notify_client.NotifyAdminAPIClient.get", side_effect=_api_error(503))
+
+    with pytest.raises(HTTPError):
+        OrganisationsClient().get_organisations()
+
+
+def test_failed_refresh_keeps_lock_until_it_expires(mocker):
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mock_release = mocker.patch("app.notify_client.single_flight.release")
+    mock_set = mocker.patch("app.notify_client.cache._set_cached")
+
+    cache._refresh_in_background("organisations", b"", mocker.Mock(side_effect=_api_error(503)))
+
+    assert not mock_set.called
+    assert not mock_release.called
+
+
+def test_refresh_in_background_runs_in_its_own_app_context_after_the_request_has_ended(app_, mocker):
+    mock_spawn = mocker.patch("app.notify_client.cache.gevent.spawn")
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mock_release = mocker.patch("app.notify_client.single_flight.release")
+    mock_set = mocker.patch("app.notify_client.cache._set_cached")
+    mock_memo = mocker.patch("app.notify_client.request_memo.get_or_call")
+    mock_send = mocker.patch("app.notify_client.NotifyAdminAPIClient._send_request")
+    mock_send.return_value.status_code = 200
+    mock_send.return_value.content = b'{"data": []}'
+
+    def compute():
+        assert current_app._get_current_object() is app_
+        assert not has_request_context()
+        return organisations_client.get(url="/organisations")
+
+    with app_.test_request_context():
+        g.current_service = mocker.Mock(active=True)
+        cache._refresh_in_background("organisations", b"", compute)
+
+    assert not mock_set.called
+
+    run, refresh = mock_spawn.call_args[0]
+    run(refresh)
+
+    assert not mock_memo.called
+    mock_send.assert_called_once()
+    mock_set.assert_called_once_with("organisations", b"", {"data": []})
+    mock_release.assert_called_once_with("organisations", "token")
+
+
+SERVICE_ID = "596364a0-858e-48c8-a8d0-f7bbb0dc2c81"
+TEMPLATE_ID = "6ce466d0-fd6a-11e5-82f5-e0accb9d11a6"
+CATEGORY_ID = "b0ccb0e4-2ba5-4a4e-8a35-3aa84b6a0a9b"
+TEMPLATE_KEY = "template-{}-version-None".format(TEMPLATE_ID)
+
+
+def _template(category_name, **stamp):
+    return {"data": {"id": "template", "template_category": {"id": CATEGORY_ID, "name_en": category_name}}, **stamp}
+
+
+@pytest.fixture
+def mock_template_pipeline(mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+    redis_store = mocker.patch("app.notify_client.cache.redis_client.redis_store", create=True)
+    pipe = redis_store.pipeline.return_value.__enter__.return_value
+
+    def _mock_template_pipeline(stored, category_version):
+        pipe.execute.return_value = [
+            [b"", json.dumps(stored).encode("utf-8") if stored else None, cache.TTL],
+            {CATEGORY_ID.encode("utf-8"): str(category_version).encode("utf-8")},
+        ]
+        return pipe
+
+    return _mock_template_pipeline
+
+
+def test_set_service_template_checks_category_version_in_same_round_trip(mock_template_pipeline, mocker):
+    pipe = mock_template_pipeline(_template("current", template_category_version=2), category_version=2)
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get")
+
+    template = ServiceAPIClient().get_service_template(SERVICE_ID, TEMPLATE_ID)
+
+    assert template == _template("current")
+    pipe.execute.assert_called_once_with()
+    pipe.hgetall.assert_called_once_with(cache.TEMPLATE_CATEGORY_VERSIONS)
+    assert not mock_api_get.called
+
+
+@pytest.mark.parametrize("stamp", [{}, {"template_category_version": 1}])
+def test_set_service_template_fetches_template_again_if_category_has_changed(mock_template_pipeline, mocker, stamp):
+    mock_template_pipeline(_template("old", **stamp), category_version=2)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mocker.patch("app.notify_client.NotifyAdminAPIClient.get", return_value=_template("new"))
+
+    template = ServiceAPIClient().get_service_template(SERVICE_ID, TEMPLATE_ID)
+
+    assert template == _template("new")
+    mock_redis_set.assert_called_once_with(TEMPLATE_KEY, json.dumps(_template("new", template_category_version=2)), ex=cache.TTL)
+
+
+class _Client:
+    def get_template(self, service_id, template_id, version=None, **kwargs):
+        pass
+
+
+@pytest.mark.parametrize(
+    "args, kwargs, expected_key",
+    [
+        (("service", "template"), {}, "service-template-None"),
+        (("service",), {"template_id": "template", "version": 2}, "service-template-2"),
+        (("service", "template", 3), {"other": "ignored"}, "service-template-3"),
+    ],
+)
+def test_key_builder_uses_positional_keyword_and_default_arguments(args, kwargs, expected_key):
+    make_key = cache._key_builder("{service_id}-{template_id}-{version}", _Client.get_template)
+
+    assert make_key(args, kwargs) == expected_key
+
+
+def test_key_builder_checks_key_format_when_decorating():
+    with pytest.raises(TypeError) as error:
+        cache._key_builder("template-{id}", _Client.get_template)
+
+    assert str(error.value) == "get_template() takes no argument called 'id'"
+
+
+def test_key_builder_normalises_values_with_n_conversion():
+    make_key = cache._key_builder("{service_id!n}-{template_id}", _Client.get_template)
+
+    assert make_key((" Service\n", "Template"), {}) == "service-Template"
+
+
+def test_format_key_normalises_values_with_n_conversion():
+    assert cache.format_key("not-found--{email_address!n}", email_address=" New@Example.GC.ca") == "not-found--new@example.gc.ca"
+    assert cache.format_key("{!r}-{!s}", "a", "b") == "'a'-b"
+
+
+def test_key_builder_only_looks_at_signature_when_decorating(mocker):
+    mock_signature = mocker.patch("app.notify_client.cache.signature", wraps=cache.signature)
+    make_key = cache._key_builder("template-{template_id}", _Client.get_template)
+
+    make_key(("service", "template"), {})
+    make_key(("service",), {"template_id": "other"})
+
+    assert mock_signature.call_count == 1
+
+
+def test_stacked_decorators_make_keys_from_wrapped_method(mocker):
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+
+    class Client:
+        @cache.delete("service-{service_id}-templates")
+        @cache.delete("template-{template_id}-versions")
+        def update_template(self, template_id, name, service_id=None):
+            pass
+
+    Client().update_template("template", "name", service_id="service")
+
+    assert mock_redis_delete.call_args_list == [
+        mocker.call("template-template-versions"),
+        mocker.call("service-service-templates"),
+    ]
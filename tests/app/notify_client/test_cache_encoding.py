@@ -0,0 +1,69 @@
+import json
+import zlib
+
+import pytest
+
+from app.notify_client import cache, cache_encoding
+
+SERVICE_ID = "596364a0-858e-48c8-a8d0-f7bbb0dc2c81"
+TEMPLATES = {"data": [{"id": str(i), "content": "Hello ((name)), your reference is ((reference))"} for i in range(100)]}
+
+
+@pytest.fixture
+def compression_threshold(mocker):
+    mocker.patch("app.notify_client.cache_encoding._threshold", 1024)
+
+
+def test_encode_leaves_values_as_json_if_compression_is_off():
+    assert cache_encoding.encode(TEMPLATES) == json.dumps(TEMPLATES)
+
+
+def test_encode_leaves_small_values_as_json(compression_threshold):
+    assert cache_encoding.encode({"data": []}) == json.dumps({"data": []})
+
+
+def test_encode_compresses_large_values(compression_threshold):
+    encoded = cache_encoding.encode(TEMPLATES)
+
+    assert encoded[:1] == cache_encoding.ZLIB
+    assert zlib.decompress(encoded[1:]) == json.dumps(TEMPLATES).encode("utf-8")
+    assert len(encoded) < len(json.dumps(TEMPLATES)) / 5
+
+
+@pytest.mark.parametrize(
+    "stored",
+    [
+        json.dumps(TEMPLATES),
+        json.dumps(TEMPLATES).encode("utf-8"),
+        cache_encoding.ZLIB + zlib.compress(json.dumps(TEMPLATES).encode("utf-8")),
+    ],
+)
+def test_decode_reads_plain_and_compressed_values(stored):
+    assert cache_encoding.decode(stored) == TEMPLATES
+
+
+def test_init_app_sets_threshold(app_, mocker):
+    mocker.patch.dict(app_.config, {"CACHE_COMPRESSION_ENABLED": True, "CACHE_COMPRESSION_THRESHOLD": 10})
+    mocker.patch("app.notify_client.cache_encoding._threshold", None)
+
+    cache_encoding.init_app(app_)
+
+    assert cache_encoding._threshold == 10
+
+
+def test_cache_set_stores_and_reads_compressed_values(app_, compression_threshold, mocker):
+    stored = {}
+    mocker.patch("app.extensions.RedisClient.get", side_effect=stored.get)
+    mocker.patch("app.extensions.RedisClient.set", side_effect=lambda key, value, ex: stored.update({key: value}))
+    mock_api = mocker.Mock(return_value=TEMPLATES)
+
+    class Client:
+        @cache.set("service-{service_id}-templates")
+        def get_service_templates(self, service_id):
+            return mock_api(service_id)
+
+    assert Client().get_service_templates(SERVICE_ID) == TEMPLATES
+    assert stored["service-{}-templates".format(SERVICE_ID)][:1] == cache_encoding.ZLIB
+
+    assert Client().get_service_templates(SERVICE_ID) == TEMPLATES
+    mock_api.assert_called_once_with(SERVICE_ID)
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from app.notify_client import cache_inspector
+
+SERVICE_ID = "596364a0-858e-48c8-a8d0-f7bbb0dc2c81"
+OTHER_SERVICE_ID = "6ce466d0-fd6a-11e5-82f5-e0accb9d11a6"
+
+
+@pytest.fixture
+def mock_redis_store(mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+    redis_store = mocker.patch("app.notify_client.cache_inspector.redis_client.redis_store", create=True)
+    redis_store.scan.side_effect = [
+        (17, ["service-{}".format(SERVICE_ID).encode("utf-8"), b"organisations"]),
+        (0, ["service-{}".format(OTHER_SERVICE_ID).encode("utf-8"), b"expired"]),
+    ]
+    redis_store.pipeline.return_value.__enter__.return_value.execute.side_effect = [[300, 2000], [500, None]]
+    return redis_store
+
+
+def test_step_adds_up_memory_use_for_each_family(mock_redis_store):
+    state = cache_inspector.step(cache_inspector._new_state(), count=2)
+
+    mock_redis_store.scan.assert_called_once_with(cursor=0, count=2)
+    assert state["cursor"] == 17
+    assert state["complete"] is False
+    assert state["families"] == {
+        "service": {"keys": 1, "bytes": 300},
+        "organisations": {"keys": 1, "bytes": 2000},
+    }
+
+    state = cache_inspector.step(state, count=2)
+
+    assert mock_redis_store.scan.call_args_list[1].kwargs == {"cursor": 17, "count": 2}
+    assert state["complete"] is True
+    assert state["families"]["service"] == {"keys": 2, "bytes": 800}
+    assert "expired" not in state["families"]
+    assert state["largest"] == [
+        [2000, "organisations"],
+        [500, "service-{}".format(OTHER_SERVICE_ID)],
+        [300, "service-{}".format(SERVICE_ID)],
+    ]
+
+
+def test_step_only_keeps_the_largest_keys(mocker, mock_redis_store):
+    mocker.patch("app.notify_client.cache_inspector.LARGEST_KEYS", 1)
+
+    state = cache_inspector.step(cache_inspector._new_state())
+
+    assert state["largest"] == [[2000, "organisations"]]
+
+
+def test_run_carries_on_from_saved_state(mocker, mock_redis_store):
+    saved = cache_inspector._new_state()
+    saved["cursor"] = 17
+    mocker.patch("app.extensions.RedisClient.get", return_value=json.dumps(saved))
+    mock_set = mocker.patch("app.extensions.RedisClient.set")
+    mock_delete = mocker.patch("app.extensions.RedisClient.delete")
+    mock_redis_store.scan.side_effect = [(0, [b"organisations"])]
+    mock_redis_store.pipeline.return_value.__enter__.return_value.execute.side_effect = [[2000]]
+
+    state = cache_inspector.run()
+
+    mock_redis_store.scan.assert_called_once_with(cursor=17, count=cache_inspector.BATCH_SIZE)
+    assert state["complete"] is True
+    mock_set.assert_called_once_with(cache_inspector.COMPLETED_KEY, json.dumps(state), ex=cache_inspector.COMPLETED_TTL)
+    mock_delete.assert_called_once_with(cache_inspector.STATE_KEY)
+
+
+def test_run_stops_when_out_of_time(mocker, mock_redis_store):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_set = mocker.patch("app.extensions.RedisClient.set")
+
+    state = cache_inspector.run(time_budget=0)
+
+    assert mock_redis_store.scan.call_count == 1
+    assert state["cursor"] == 17
+    assert state["complete"] is False
+    mock_set.assert_called_once_with(cache_inspector.STATE_KEY, json.dumps(state), ex=cache_inspector.STATE_TTL)
+
+
+def test_run_keeps_last_completed_inspection_until_new_one_finishes(mocker, mock_redis_store):
+    completed = cache_inspector._new_state()
+    completed.update(complete=True, families={"old": {"keys": 1, "bytes": 1}})
+    mocker.patch(
+        "app.extensions.RedisClient.get",
+        side_effect=lambda key: json.dumps(completed) if key == cache_inspector.COMPLETED_KEY else None,
+    )
+    mock_set = mocker.patch("app.extensions.RedisClient.set")
+
+    cache_inspector.run(time_budget=0)
+
+    assert [call.args[0] for call in mock_set.call_args_list] == [cache_inspector.STATE_KEY]
+    assert cache_inspector.load_completed() == completed
+
+
+def test_run_starts_again_once_finished(mocker, mock_redis_store):
+    finished = cache_inspector._new_state()
+    finished.update(cursor=0, complete=True, families={"old": {"keys": 1, "bytes": 1}})
+    mocker.patch("app.extensions.RedisClient.get", return_value=json.dumps(finished))
+    mocker.patch("app.extensions.RedisClient.set")
+    mocker.patch("app.extensions.RedisClient.delete")
+
+    state = cache_inspector.run()
+
+    assert "old" not in state["families"]
+    assert state["complete"] is True
+    assert mock_redis_store.scan.call_count == 2
+
+
+def test_load_returns_none_if_redis_not_active(mocker):
+    mock_get = mocker.patch("app.extensions.RedisClient.get")
+
+    assert cache_inspector.load() is None
+    assert cache_inspector.load_completed() is None
+    assert not mock_get.called
@@ -0,0 +1,107 @@
+import pytest
+
+from app.notify_client.cache_stats import (
+    HIT,
+    LOCAL_HIT,
+    MISS,
+    SET,
+    STATS_KEY,
+    CacheStats,
+    hit_ratio,
+    key_family,
+)
+
+SERVICE_ID = "596364a0-858e-48c8-a8d0-f7bbb0dc2c81"
+TEMPLATE_ID = "6ce466d0-fd6a-11e5-82f5-e0accb9d11a6"
+
+
+@pytest.fixture
+def mock_statsd(mocker):
+    return mocker.patch("app.notify_client.cache_stats.statsd_client")
+
+
+@pytest.mark.parametrize(
+    "redis_key, expected_family",
+    [
+        ("service-{}".format(SERVICE_ID), "service"),
+        ("service-{}-templates".format(SERVICE_ID), "service-templates"),
+        ("template-{}-version-None".format(TEMPLATE_ID), "template-version-None"),
+        ("template-{}-version-3".format(TEMPLATE_ID), "template-version"),
+        ("organisations", "organisations"),
+        ("services-{'detailed': True}", "services"),
+        ("gc-articles--wp/v2/pages/en/home", "gc-articles"),
+        ("gc-articles-fallback--wp/v2/pages", "gc-articles-fallback"),
+    ],
+)
+def test_key_family(redis_key, expected_family):
+    assert key_family(redis_key) == expected_family
+
+
+def test_record_sends_counts_and_sizes_to_statsd(mock_statsd):
+    cache_stats = CacheStats()
+
+    cache_stats.record(HIT, "service-{}".format(SERVICE_ID), 1024)
+    cache_stats.record(MISS, "organisations")
+
+    assert [call.args for call in mock_statsd.incr.call_args_list] == [
+        ("cache.service.hit",),
+        ("cache.organisations.miss",),
+    ]
+    mock_statsd.timing.assert_called_once_with("cache.service.size", 1024)
+
+
+def test_record_adds_counts_to_redis_once_flush_interval_has_passed(mocker, mock_statsd):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+    mock_pipeline = mocker.patch("app.notify_client.cache_stats.redis_client.redis_store.pipeline", create=True)
+    pipe = mock_pipeline.return_value.__enter__.return_value
+    cache_stats = CacheStats(flush_interval=60)
+
+    cache_stats.record(HIT, "organisations")
+    cache_stats.record(HIT, "organisations")
+    assert not pipe.hincrby.called
+
+    cache_stats.flush_interval = 0
+    cache_stats.record(SET, "organisations")
+
+    assert sorted(call.args for call in pipe.hincrby.call_args_list) == [
+        (STATS_KEY, "organisations:hit", 2),
+        (STATS_KEY, "organisations:set", 1),
+    ]
+    pipe.execute.assert_called_once_with()
+
+
+def test_flush_does_nothing_if_redis_not_active(mocker, mock_statsd):
+    mock_pipeline = mocker.patch("app.notify_client.cache_stats.redis_client.redis_store.pipeline", create=True)
+    cache_stats = CacheStats(flush_interval=0)
+
+    cache_stats.record(HIT, "organisations")
+
+    assert not mock_pipeline.called
+
+
+def test_totals_reads_counts_from_every_worker(mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+    mocker.patch(
+        "app.notify_client.cache_stats.redis_client.redis_store.hgetall",
+        return_value={b"organisations:hit": b"9", b"organisations:miss": b"1", b"service-templates:local_hit": b"4"},
+        create=True,
+    )
+
+    totals = CacheStats().totals()
+
+    assert totals["organisations"] == {
+        "hit": 9,
+        "local_hit": 0,
+        "miss": 1,
+        "set": 0,
+        "delete": 0,
+        "stale": 0,
+        "stale_on_error": 0,
+    }
+    assert totals["service-templates"][LOCAL_HIT] == 4
+    assert hit_ratio(totals["organisations"]) == 0.9
+    assert hit_ratio(totals["service-templates"]) == 1
+
+
+def test_hit_ratio_is_none_if_nothing_has_been_read():
+    assert hit_ratio({HIT: 0, LOCAL_HIT: 0, MISS: 0}) is None
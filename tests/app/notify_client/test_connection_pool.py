@@ -0,0 +1,120 @@
+from inspect import signature
+from unittest.mock import Mock
+
+import pytest
+import requests
+from urllib3.connectionpool import HTTPConnectionPool
+
+from app.notify_client import NotifyAdminAPIClient
+from app.notify_client.connection_pool import (
+    ConnectionPool,
+    PooledHTTPAdapter,
+    _InstrumentedPoolMixin,
+    pool_stats,
+)
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.returned = []
+
+    def _get_conn(self, timeout=None):
+        return self.conn
+
+    def _put_conn(self, conn):
+        self.returned.append(conn)
+
+
+class InstrumentedFakePool(_InstrumentedPoolMixin, FakePool):
+    idle_timeout = 50
+
+
+@pytest.fixture(autouse=True)
+def reset_pool_stats():
+    pool_stats.reset()
+    yield
+    pool_stats.reset()
+
+
+def test_urllib3_pool_methods_we_override_are_unchanged():
+    # They’re private, so could change in any release of urllib3
+    assert list(signature(HTTPConnectionPool._get_conn).parameters) == ["self", "timeout"]
+    assert list(signature(HTTPConnectionPool._put_conn).parameters) == ["self", "conn"]
+
+
+def test_init_app_builds_one_shared_session(app_):
+    pool = ConnectionPool()
+    pool.init_app(app_)
+    session = pool.session
+
+    pool.init_app(app_)
+
+    assert pool.session is session
+    assert pool.timeout == (app_.config["API_CONNECT_TIMEOUT"], app_.config["API_READ_TIMEOUT"])
+    adapter = session.get_adapter("https://api.notification.canada.ca")
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter.idle_timeout == app_.config["API_POOL_IDLE_TIMEOUT"]
+    assert adapter._pool_maxsize == app_.config["API_POOL_SIZE"]
+
+
+def test_api_clients_use_pool_timeouts(app_):
+    api_client = NotifyAdminAPIClient()
+    api_client.init_app(app_)
+
+    assert api_client.timeout == (app_.config["API_CONNECT_TIMEOUT"], app_.config["API_READ_TIMEOUT"])
+
+
+def test_api_client_sends_requests_through_shared_session(app_, mocker):
+    response = requests.Response()
+    response._content = b'{"foo": "bar"}'
+    response.status_code = 200
+    mock_request = mocker.patch("requests.Session.request", return_value=response)
+
+    api_client = NotifyAdminAPIClient()
+    api_client.init_app(app_)
+
+    assert api_client.request("GET", "/foo") == {"foo": "bar"}
+    assert mock_request.call_args[1]["timeout"] == api_client.timeout
+
+
+def test_reused_connection_counts_as_hit():
+    pool = InstrumentedFakePool(Mock(sock=Mock(), _notify_last_used=None))
+
+    pool._get_conn()
+
+    assert pool_stats.snapshot()["hits"] == 1
+    assert pool_stats.snapshot()["misses"] == 0
+    assert pool_stats.snapshot()["wait_count"] == 1
+
+
+def test_new_connection_counts_as_miss():
+    pool = InstrumentedFakePool(Mock(sock=None, _notify_last_used=None))
+
+    pool._get_conn()
+
+    assert pool_stats.snapshot()["hits"] == 0
+    assert pool_stats.snapshot()["misses"] == 1
+
+
+def test_idle_connection_is_evicted(mocker):
+    conn = Mock(sock=Mock(), _notify_last_used=100)
+    conn.close.side_effect = lambda: setattr(conn, "sock", None)
+    mocker.patch("app.notify_client.connection_pool.monotonic", return_value=200)
+
+    InstrumentedFakePool(conn)._get_conn()
+
+    conn.close.assert_called_once_with()
+    assert pool_stats.snapshot()["evictions"] == 1
+    assert pool_stats.snapshot()["misses"] == 1
+
+
+def test_returned_connection_is_stamped(mocker):
+    mocker.patch("app.notify_client.connection_pool.monotonic", return_value=123)
+    conn = Mock()
+    pool = InstrumentedFakePool(conn)
+
+    pool._put_conn(conn)
+
+    assert conn._notify_last_used == 123
+    assert pool.returned == [conn]
@@ -0,0 +1,55 @@
+from notifications_utils.clients.redis import (
+    email_daily_count_cache_key,
+    sms_daily_count_cache_key,
+)
+
+from app.notify_client import counters
+
+SERVICE_ID = "596364a0-858e-48c8-a8d0-f7bbb0dc2c81"
+
+
+def test_read_gets_all_keys_in_one_round_trip(mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+    mock_mget = mocker.patch("app.notify_client.counters.redis_client.redis_store.mget", create=True, return_value=[b"1", None])
+
+    assert counters.read("a", "b") == [b"1", None]
+
+    mock_mget.assert_called_once_with(["a", "b"])
+
+
+def test_read_only_gets_each_key_once_per_request(app_, mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+    mock_mget = mocker.patch("app.notify_client.counters.redis_client.redis_store.mget", create=True)
+    mock_mget.side_effect = [[b"1", b"2"], [b"3"]]
+
+    with app_.test_request_context():
+        assert counters.read("a", "b") == [b"1", b"2"]
+        assert counters.read("b", "c", "a") == [b"2", b"3", b"1"]
+
+    assert mock_mget.call_args_list == [mocker.call(["a", "b"]), mocker.call(["c"])]
+
+
+def test_read_uses_get_if_redis_not_active(mocker):
+    mock_get = mocker.patch("app.extensions.RedisClient.get", side_effect=[b"1", None])
+
+    assert counters.read("a", "b") == [b"1", None]
+
+    assert mock_get.call_args_list == [mocker.call("a"), mocker.call("b")]
+
+
+def test_remember_computes_once_per_request(app_, mocker):
+    compute = mocker.Mock(side_effect=["first", "second"])
+
+    with app_.test_request_context():
+        assert counters.remember("bounce-rate", compute) == "first"
+        assert counters.remember("bounce-rate", compute) == "first"
+    with app_.test_request_context():
+        assert counters.remember("bounce-rate", compute) == "second"
+
+
+def test_daily_counts(mocker):
+    mock_read = mocker.patch("app.notify_client.counters.read", return_value=[b"3", None])
+
+    assert counters.daily_counts(SERVICE_ID) == {"sms": 3, "email": None}
+
+    mock_read.assert_called_once_with(sms_daily_count_cache_key(SERVICE_ID), email_daily_count_cache_key(SERVICE_ID))
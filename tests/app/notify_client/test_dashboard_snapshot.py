@@ -0,0 +1,86 @@
+import pytest
+
+from app import json_codec
+from app.notify_client import dashboard_snapshot
+
+SERVICE_ID = "596364a0-858e-48c8-a8d0-f7bbb0dc2c81"
+SNAPSHOT_KEY = "service-{}-dashboard-en".format(SERVICE_ID)
+PARTIALS = {"jobs": "<p>jobs</p>", "has_jobs": True}
+
+
+@pytest.fixture
+def active_redis(mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+
+
+def test_builds_partials_without_redis(app_, mocker):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get")
+    build = mocker.Mock(return_value=PARTIALS)
+
+    assert dashboard_snapshot.get(SERVICE_ID, "en", build) == PARTIALS
+
+    build.assert_called_once_with()
+    assert not mock_redis_get.called
+
+
+def test_uses_snapshot_without_building(app_, active_redis, mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=json_codec.dumps(PARTIALS))
+    mock_acquire = mocker.patch("app.notify_client.single_flight.acquire")
+    build = mocker.Mock()
+
+    assert dashboard_snapshot.get(SERVICE_ID, "en", build) == PARTIALS
+
+    assert not build.called
+    assert not mock_acquire.called
+
+
+def test_builds_and_stores_snapshot_while_holding_lock(app_, active_redis, mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mock_acquire = mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mock_release = mocker.patch("app.notify_client.single_flight.release")
+    build = mocker.Mock(return_value=PARTIALS)
+
+    assert dashboard_snapshot.get(SERVICE_ID, "en", build) == PARTIALS
+
+    mock_acquire.assert_called_once_with(SNAPSHOT_KEY)
+    mock_redis_set.assert_called_once_with(SNAPSHOT_KEY, json_codec.dumps(PARTIALS), ex=app_.config["DASHBOARD_SNAPSHOT_TTL"])
+    mock_release.assert_called_once_with(SNAPSHOT_KEY, "token")
+
+
+def test_releases_lock_if_building_fails(app_, active_redis, mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mock_release = mocker.patch("app.notify_client.single_flight.release")
+
+    with pytest.raises(ValueError):
+        dashboard_snapshot.get(SERVICE_ID, "en", mocker.Mock(side_effect=ValueError))
+
+    mock_release.assert_called_once_with(SNAPSHOT_KEY, "token")
+
+
+@pytest.mark.parametrize(
+    "waited_for, expected_build_calls",
+    [
+        (json_codec.dumps(PARTIALS), 0),
+        (None, 1),
+    ],
+)
+def test_waits_for_worker_building_snapshot(app_, active_redis, mocker, waited_for, expected_build_calls):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.notify_client.single_flight.acquire", return_value=None)
+    mock_wait_for = mocker.patch("app.notify_client.single_flight.wait_for", return_value=waited_for)
+    build = mocker.Mock(return_value=PARTIALS)
+
+    assert dashboard_snapshot.get(SERVICE_ID, "en", build) == PARTIALS
+
+    assert mock_wait_for.call_args[0][0] == SNAPSHOT_KEY
+    assert build.call_count == expected_build_calls
+
+
+def test_delete_removes_snapshot_in_every_language(app_, mocker):
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+
+    dashboard_snapshot.delete(SERVICE_ID)
+
+    mock_redis_delete.assert_called_once_with(SNAPSHOT_KEY, "service-{}-dashboard-fr".format(SERVICE_ID))
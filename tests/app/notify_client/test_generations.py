@@ -0,0 +1,171 @@
+import pytest
+
+from app.notify_client import cache, generations
+from app.notify_client.organisations_api_client import OrganisationsClient
+
+SERVICE_ID = "596364a0-858e-48c8-a8d0-f7bbb0dc2c81"
+TEMPLATE_ID = "6ce466d0-fd6a-11e5-82f5-e0accb9d11a6"
+
+
+@pytest.fixture
+def active_redis(mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+
+
+@pytest.fixture
+def mock_script(mocker):
+    redis_store = mocker.patch("app.notify_client.generations.redis_client.redis_store", create=True)
+    return redis_store.register_script.return_value
+
+
+@pytest.mark.parametrize(
+    "redis_key, expected_families",
+    [
+        ("user-{}".format(SERVICE_ID), ("user",)),
+        ("user-{}-organisations-and-services".format(SERVICE_ID), ("user", "organisations_and_services")),
+        ("service-{}".format(SERVICE_ID), ("service",)),
+        ("service-{}-templates".format(SERVICE_ID), ("service", "template", "template_category")),
+        ("template-{}-version-None".format(TEMPLATE_ID), ("template",)),
+        ("organisations", ("organisation",)),
+        ("services-{'detailed': True}", ()),
+    ],
+)
+def test_families_for(redis_key, expected_families):
+    assert generations.families_for(redis_key) == expected_families
+
+
+@pytest.mark.parametrize(
+    "redis_key, expected_generation_keys",
+    [
+        ("organisations", ("cache-generation-organisation",)),
+        (
+            "service-{}-templates".format(SERVICE_ID),
+            (
+                "cache-generation-service",
+                "cache-generation-template",
+                "cache-generation-template_category",
+                "cache-generation-service-{}".format(SERVICE_ID),
+            ),
+        ),
+        ("has_jobs-{}".format(SERVICE_ID), ("cache-generation-service", "cache-generation-service-{}".format(SERVICE_ID))),
+        (
+            "template-{}-version-None".format(TEMPLATE_ID),
+            ("cache-generation-template", "cache-generation-template-{}".format(TEMPLATE_ID)),
+        ),
+        ("services-{'detailed': True}", ()),
+    ],
+)
+def test_generation_keys_include_families_and_entity(redis_key, expected_generation_keys):
+    assert generations.generation_keys(redis_key) == expected_generation_keys
+
+
+def test_read_passes_value_and_generation_keys_to_registered_script(mock_script):
+    mock_script.return_value = [b"\x022\x02", b"[]", 60]
+
+    assert generations.read("organisations") == (b"\x022\x02", b"[]", 60)
+
+    generations.redis_client.redis_store.register_script.assert_called_once_with(generations._READ_SCRIPT)
+    mock_script.assert_called_once_with(
+        keys=["organisations", "cache-generation-organisation"],
+        client=generations.redis_client.redis_store,
+    )
+
+
+def test_read_queues_script_on_pipeline(mock_script, mocker):
+    pipe = mocker.Mock()
+
+    assert generations.read("organisations", pipe) is None
+
+    mock_script.assert_called_once_with(keys=["organisations", "cache-generation-organisation"], client=pipe)
+
+
+@pytest.mark.parametrize(
+    "stamp, encoded, expected",
+    [
+        (b"", "[]", "[]"),
+        (b"\x020.3\x02", "[]", b"\x020.3\x02[]"),
+        (b"\x020.3\x02", b"\x01compressed", b"\x020.3\x02\x01compressed"),
+    ],
+)
+def test_stamped(stamp, encoded, expected):
+    assert generations.stamped(stamp, encoded) == expected
+
+
+def test_bump_increments_family_generation_and_drops_local_copies(active_redis, mocker):
+    mock_incr = mocker.patch("app.notify_client.generations.redis_client.redis_store.incr", create=True)
+    mock_invalidate_pattern = mocker.patch("app.notify_client.generations.local_cache.invalidate_pattern")
+
+    generations.bump("organisation")
+
+    mock_incr.assert_called_once_with("cache-generation-organisation")
+    assert mock_invalidate_pattern.call_args_list == [
+        mocker.call("organisations"),
+        mocker.call("domains"),
+        mocker.call("live-service-and-organisation-counts"),
+    ]
+
+
+def test_bump_entity_only_drops_its_own_values(active_redis, mocker):
+    mock_redis_store = mocker.patch("app.notify_client.generations.redis_client.redis_store", create=True)
+    pipe = mock_redis_store.pipeline.return_value.__enter__.return_value
+    mock_invalidate_pattern = mocker.patch("app.notify_client.generations.local_cache.invalidate_pattern")
+
+    generations.bump("user", SERVICE_ID)
+
+    pipe.incr.assert_called_once_with("cache-generation-user-{}".format(SERVICE_ID))
+    pipe.expire.assert_called_once_with("cache-generation-user-{}".format(SERVICE_ID), generations.ENTITY_GENERATION_TTL)
+    assert not mock_redis_store.incr.called
+    assert mock_invalidate_pattern.call_args_list == [
+        mocker.call("user-{}".format(SERVICE_ID)),
+        mocker.call("user-{}-organisations-and-services".format(SERVICE_ID)),
+    ]
+
+
+def test_bump_does_not_touch_redis_when_disabled(mocker):
+    mock_incr = mocker.patch("app.notify_client.generations.redis_client.redis_store.incr", create=True)
+
+    generations.bump("organisation")
+
+    assert not mock_incr.called
+
+
+def test_cache_set_stores_value_stamped_with_current_generations(active_redis, mock_script, mocker):
+    mock_script.return_value = [b"\x023\x02", None, -2]
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mocker.patch("app.notify_client.single_flight.release")
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mocker.patch("app.notify_client.NotifyAdminAPIClient.get", return_value=[])
+
+    assert OrganisationsClient().get_organisations() == []
+
+    mock_redis_set.assert_called_once_with("organisations", b"\x023\x02[]", ex=cache.TTL)
+
+
+def test_cache_set_returns_value_stored_at_current_generations(active_redis, mock_script, mocker):
+    mock_script.return_value = [b"\x023\x02", b'[{"id": "1"}]', cache.TTL]
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get")
+
+    assert OrganisationsClient().get_organisations() == [{"id": "1"}]
+    assert not mock_api_get.called
+
+
+def test_cache_delete_deletes_plain_key(active_redis, mocker):
+    mock_delete = mocker.patch("app.extensions.RedisClient.delete")
+    mocker.patch("app.notify_client.local_cache.redis_client")
+
+    cache.delete_keys("organisations", "domains")
+
+    mock_delete.assert_called_once_with("organisations", "domains")
+
+
+def test_bump_generation_bumps_entity_from_arguments(mocker):
+    mock_bump = mocker.patch("app.notify_client.generations.bump")
+
+    class Client:
+        @cache.bump_generation("service", "{service_id}")
+        def archive_service(self, service_id):
+            pass
+
+    Client().archive_service(SERVICE_ID)
+
+    mock_bump.assert_called_once_with("service", SERVICE_ID)
@@ -3,14 +3,15 @@ from unittest.mock import ANY
 
 import pytest
 
+from app.notify_client import cache
 from app.notify_client.job_api_client import JobApiClient
 
 
-def test_client_creates_job_data_correctly(mocker, fake_uuid):
+def test_client_creates_job_data_correctly(app_, mocker, fake_uuid):
     job_id = fake_uuid
     service_id = fake_uuid
     mocker.patch("app.notify_client.current_user", id="1")
-    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
 
     expected_data = {"id": job_id, "created_by": "1"}
 
@@ -24,14 +25,10 @@ def test_client_creates_job_data_correctly(mocker, fake_uuid):
 
     client.create_job(service_id, job_id)
     mock_post.assert_called_once_with(url=expected_url, data=expected_data)
-    mock_redis_set.assert_called_once_with(
-        "has_jobs-{}".format(service_id),
-        b"true",
-        ex=604800,
-    )
+    assert mocker.call("has_jobs-{}".format(service_id)) in mock_redis_delete.call_args_list
 
 
-def test_client_schedules_job(mocker, fake_uuid):
+def test_client_schedules_job(app_, mocker, fake_uuid):
     mocker.patch("app.notify_client.current_user", id="1")
 
     mock_post = mocker.patch("app.notify_client.job_api_client.JobApiClient.post")
@@ -307,7 +304,7 @@ def test_client_parses_empty_job_stats_for_service(mocker):
     assert result["data"][1]["notifications_failed"] == 0
 
 
-def test_cancel_job(mocker):
+def test_cancel_job(app_, mocker):
     mock_post = mocker.patch("app.notify_client.job_api_client.JobApiClient.post")
 
     JobApiClient().cancel_job("service_id", "job_id")
@@ -372,3 +369,55 @@ def test_has_jobs_returns_from_cache(
     assert JobApiClient().has_jobs(fake_uuid) is return_value
     assert not mock_get.called
     mock_redis_get.assert_called_once_with("has_jobs-{}".format(fake_uuid))
+
+
+def test_create_job_deletes_has_jobs_and_dashboard_snapshots(app_, mocker, fake_uuid):
+    mocker.patch("app.notify_client.current_user", id="1")
+    mocker.patch("app.extensions.RedisClient.set")
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+    mocker.patch("app.notify_client.job_api_client.JobApiClient.post", return_value={"data": {"statistics": []}})
+
+    JobApiClient().create_job(fake_uuid, fake_uuid)
+
+    assert mock_redis_delete.call_args_list == [
+        mocker.call("has_jobs-{}".format(fake_uuid)),
+        mocker.call("service-{}-dashboard-en".format(fake_uuid), "service-{}-dashboard-fr".format(fake_uuid)),
+    ]
+
+
+@pytest.mark.parametrize("method", ["cancel_job", "cancel_letter_job"])
+def test_cancelling_job_deletes_dashboard_snapshots(app_, mocker, method):
+    mocker.patch("app.notify_client.job_api_client.JobApiClient.post", return_value={"data": {"statistics": []}})
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+
+    getattr(JobApiClient(), method)("service_id", "job_id")
+
+    assert mocker.call("service-service_id-dashboard-en", "service-service_id-dashboard-fr") in (mock_redis_delete.call_args_list)
+
+
+def test_has_jobs_is_true_after_create_job_once_services_generation_bumped(app_, mocker, fake_uuid):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+    mocker.patch("app.notify_client.current_user", id="1")
+    mocker.patch("app.notify_client.local_cache.redis_client")
+    mocker.patch("app.notify_client.dashboard_snapshot.delete")
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mocker.patch("app.notify_client.single_flight.release")
+    mocker.patch("app.notify_client.single_flight.should_refresh_early", return_value=False)
+
+    # A `false` stamped with the bumped generations, as `has_jobs` would have stored before the job was created
+    redis_key = "has_jobs-{}".format(fake_uuid)
+    stamp = b"\x021.0\x02"
+    redis = {redis_key: stamp + b"false"}
+    mocker.patch(
+        "app.notify_client.generations.read",
+        side_effect=lambda key: (stamp, redis[key][len(stamp) :], cache.TTL) if key in redis else (stamp, None, -2),
+    )
+    mocker.patch("app.extensions.RedisClient.delete", side_effect=lambda *keys: [redis.pop(key, None) for key in keys])
+    mocker.patch("app.extensions.RedisClient.set", side_effect=lambda key, value, ex: redis.update({key: value}))
+    mocker.patch("app.notify_client.job_api_client.JobApiClient.post", return_value={"data": {"statistics": []}})
+    mocker.patch("app.notify_client.job_api_client.JobApiClient.get", return_value={"data": [{"statistics": []}]})
+
+    JobApiClient().create_job(fake_uuid, fake_uuid)
+
+    assert JobApiClient().has_jobs(fake_uuid) is True
+    assert redis[redis_key] == stamp + b"true"
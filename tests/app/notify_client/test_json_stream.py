@@ -0,0 +1,100 @@
+import json
+
+import pytest
+import requests
+from flask import g
+
+from app.notify_client import NotifyAdminAPIClient
+from app.notify_client.json_stream import StreamedObject
+
+NOTIFICATIONS = [{"id": i, "recipient": "é" * i, "cost": i * 1.5, "job_name": None} for i in range(50)]
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body.encode("utf-8")
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start : start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 100_000])
+@pytest.mark.parametrize(
+    "body",
+    [
+        json.dumps({"links": {"next": "/page/2"}, "notifications": NOTIFICATIONS, "total": 123456789}),
+        json.dumps({"notifications": NOTIFICATIONS, "total": 123456789, "links": {"next": "/page/2"}}, indent=2),
+    ],
+)
+def test_streamed_object_decodes_items_and_fields(body, chunk_size):
+    response = FakeResponse(body)
+    streamed = StreamedObject(response, "notifications", chunk_size=chunk_size)
+
+    assert list(streamed["notifications"]) == NOTIFICATIONS
+    assert streamed["links"] == {"next": "/page/2"}
+    assert streamed["total"] == 123456789
+    assert streamed.get("page_size") is None
+    assert response.closed
+
+
+def test_streamed_object_with_empty_array():
+    streamed = StreamedObject(FakeResponse('{"notifications": [], "links": {}}'), "notifications", chunk_size=2)
+
+    assert list(streamed["notifications"]) == []
+    assert streamed["links"] == {}
+
+
+def test_streamed_object_only_holds_one_chunk_and_item_at_a_time():
+    streamed = StreamedObject(FakeResponse(json.dumps({"notifications": NOTIFICATIONS})), "notifications", chunk_size=64)
+
+    for _notification in streamed["notifications"]:
+        assert len(streamed._buffer) < 64 + len(json.dumps(NOTIFICATIONS[-1]))
+
+
+def test_streamed_object_closes_response_if_not_read_to_the_end():
+    response = FakeResponse(json.dumps({"notifications": NOTIFICATIONS}))
+    items = StreamedObject(response, "notifications", chunk_size=64)["notifications"]
+
+    next(items)
+    items.close()
+
+    assert response.closed
+
+
+def test_streamed_object_items_must_be_read_before_later_fields():
+    streamed = StreamedObject(FakeResponse(json.dumps({"notifications": [1, 2], "links": {}})), "notifications")
+
+    with pytest.raises(ValueError):
+        streamed["links"]
+
+
+def test_streamed_object_raises_on_truncated_response():
+    streamed = StreamedObject(FakeResponse('{"notifications": [{"id": 1}, {"id"'), "notifications", chunk_size=4)
+
+    with pytest.raises(ValueError):
+        list(streamed["notifications"])
+
+
+def test_client_get_streamed_does_not_read_whole_response(app_, mocker):
+    mocker.patch("app.notify_client.current_user", id="1", platform_admin=False)
+    response = requests.Response()
+    response.raw = mocker.Mock()
+    response.status_code = 200
+    response.iter_content = mocker.Mock(return_value=iter([b'{"notifications": [{"id": 1}], "links": {}}']))
+    mock_request = mocker.patch("requests.Session.request", return_value=response)
+    client = NotifyAdminAPIClient()
+    client.init_app(app_)
+
+    with app_.test_request_context():
+        g.current_service = None
+        streamed = client.get_streamed("/service/1234/notifications", "notifications", params={"page": 1})
+
+        assert list(streamed["notifications"]) == [{"id": 1}]
+
+    assert mock_request.call_args[1]["stream"] is True
+    assert mock_request.call_args[1]["params"] == {"page": 1}
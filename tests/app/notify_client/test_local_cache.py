@@ -0,0 +1,160 @@
+import pytest
+
+from app.notify_client import cache
+from app.notify_client.local_cache import CHANNEL, LocalCache, local_cache
+from app.notify_client.service_api_client import ServiceAPIClient
+
+
+@pytest.fixture
+def listening_cache(mocker):
+    mocker.patch.object(LocalCache, "_listening", return_value=True)
+    cache = LocalCache()
+    cache.enabled = True
+    return cache
+
+
+@pytest.fixture
+def enabled_local_cache(mocker):
+    mocker.patch.object(local_cache, "enabled", True)
+    mocker.patch.object(LocalCache, "_listening", return_value=True)
+    mocker.patch("app.notify_client.local_cache.redis_client")
+    local_cache.clear()
+    yield local_cache
+    local_cache.clear()
+
+
+def test_does_nothing_when_disabled():
+    cache = LocalCache()
+    cache.set("service-1", b"{}")
+
+    assert cache.get("service-1") is None
+    assert len(cache) == 0
+
+
+def test_does_nothing_when_not_listening_for_invalidations(mocker):
+    mocker.patch.object(LocalCache, "_subscribe", return_value=False)
+    cache = LocalCache()
+    cache.enabled = True
+    cache.set("service-1", b"{}")
+
+    assert cache.get("service-1") is None
+
+
+def test_evicts_least_recently_used(listening_cache):
+    listening_cache.max_entries = 2
+    listening_cache.set("a", b"1")
+    listening_cache.set("b", b"2")
+    listening_cache.get("a")
+    listening_cache.set("c", b"3")
+
+    assert listening_cache.get("a") == b"1"
+    assert listening_cache.get("b") is None
+    assert listening_cache.get("c") == b"3"
+
+
+def test_entries_expire(listening_cache, mocker):
+    mock_monotonic = mocker.patch("app.notify_client.local_cache.monotonic", return_value=100)
+    listening_cache.ttl = 10
+    listening_cache.set("a", b"1")
+
+    mock_monotonic.return_value = 109.9
+    assert listening_cache.get("a") == b"1"
+
+    mock_monotonic.return_value = 110
+    assert listening_cache.get("a") is None
+    assert len(listening_cache) == 0
+
+
+def test_invalidate_drops_keys_and_publishes(listening_cache, mocker):
+    mock_redis = mocker.patch("app.notify_client.local_cache.redis_client")
+    listening_cache.set("service-1", b"{}")
+    listening_cache.set("service-2", b"{}")
+
+    listening_cache.invalidate("service-1")
+
+    assert listening_cache.get("service-1") is None
+    assert listening_cache.get("service-2") == b"{}"
+    mock_redis.redis_store.publish.assert_called_once_with(CHANNEL, '{"keys": ["service-1"]}')
+
+
+def test_invalidate_pattern_drops_matching_keys_and_publishes(listening_cache, mocker):
+    mock_redis = mocker.patch("app.notify_client.local_cache.redis_client")
+    listening_cache.set("template-1-version-None", b"{}")
+    listening_cache.set("template-1-versions", b"{}")
+
+    listening_cache.invalidate_pattern("template-?-version-*")
+
+    assert listening_cache.get("template-1-version-None") is None
+    assert listening_cache.get("template-1-versions") == b"{}"
+    mock_redis.redis_store.publish.assert_called_once_with(CHANNEL, '{"pattern": "template-?-version-*"}')
+
+
+def test_publish_failure_is_logged_not_raised(listening_cache, mocker):
+    mock_redis = mocker.patch("app.notify_client.local_cache.redis_client")
+    mock_redis.redis_store.publish.side_effect = ConnectionError()
+    mock_logger = mocker.patch("app.notify_client.local_cache.logger")
+
+    listening_cache.invalidate("service-1")
+
+    assert mock_logger.exception.called
+
+
+@pytest.mark.parametrize(
+    "data, expected_keys",
+    [
+        (b'{"keys": ["service-1", "user-1"]}', ["service-2"]),
+        (b'{"pattern": "service-*"}', ["user-1"]),
+    ],
+)
+def test_messages_from_other_workers_drop_entries(listening_cache, data, expected_keys):
+    for key in ("service-1", "service-2", "user-1"):
+        listening_cache.set(key, b"{}")
+
+    listening_cache._handle_message({"type": "message", "channel": CHANNEL.encode(), "data": data})
+
+    assert [key for key in ("service-1", "service-2", "user-1") if listening_cache.get(key)] == expected_keys
+
+
+def test_subscribing_clears_entries_and_listens_on_channel(mocker):
+    mock_redis = mocker.patch("app.notify_client.local_cache.redis_client")
+    cache = LocalCache()
+    cache.enabled = True
+    cache._entries["service-1"] = (b"{}", float("inf"))
+
+    assert cache._subscribe() is True
+
+    assert len(cache) == 0
+    pubsub = mock_redis.redis_store.pubsub.return_value
+    pubsub.subscribe.assert_called_once_with(**{CHANNEL: cache._handle_message})
+    pubsub.run_in_thread.assert_called_once_with(sleep_time=1, daemon=True)
+
+
+def test_cache_set_reads_from_local_cache_before_redis(enabled_local_cache, mocker):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=b'{"data": "from redis"}')
+    mocker.patch("app.extensions.RedisClient.set")
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get")
+
+    assert ServiceAPIClient().get_service("1") == {"data": "from redis"}
+    assert ServiceAPIClient().get_service("1") == {"data": "from redis"}
+
+    mock_redis_get.assert_called_once_with("service-1")
+    assert not mock_api_get.called
+
+
+def test_cache_set_stores_api_response_in_local_cache(enabled_local_cache, mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.extensions.RedisClient.set")
+    mocker.patch("app.notify_client.NotifyAdminAPIClient.get", return_value={"data": "from api"})
+
+    ServiceAPIClient().get_service("1")
+
+    assert enabled_local_cache.get("service-1") == '{"data": "from api"}'
+
+
+def test_cache_delete_invalidates_local_cache(enabled_local_cache, mocker):
+    mocker.patch("app.extensions.RedisClient.delete")
+    enabled_local_cache.set("service-1", b"{}")
+
+    cache.delete_keys("service-1")
+
+    assert enabled_local_cache.get("service-1") is None
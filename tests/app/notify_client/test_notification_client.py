@@ -47,6 +47,16 @@ def test_client_gets_notifications_for_service_and_job_by_page(mocker, arguments
     mock_get.assert_called_once_with(**expected_call)
 
 
+def test_client_streams_notifications_for_service(mocker):
+    mock_get_streamed = mocker.patch("app.notify_client.notification_api_client.NotificationApiClient.get_streamed")
+    mock_get = mocker.patch("app.notify_client.notification_api_client.NotificationApiClient.get")
+
+    NotificationApiClient().get_notifications_for_service("abcd1234", job_id="efgh5678", page=2, stream=True)
+
+    mock_get_streamed.assert_called_once_with("/service/abcd1234/job/efgh5678/notifications", "notifications", params={"page": 2})
+    assert not mock_get.called
+
+
 def test_send_notification(mocker, logged_in_client, active_user_with_permissions):
     mock_post = mocker.patch("app.notify_client.notification_api_client.NotificationApiClient.post")
     NotificationApiClient().send_notification(
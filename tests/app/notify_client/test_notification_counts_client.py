@@ -1,6 +1,10 @@
 from unittest.mock import Mock, patch
 
 import pytest
+from notifications_utils.clients.redis import (
+    email_daily_count_cache_key,
+    sms_daily_count_cache_key,
+)
 
 from app.notify_client.notification_counts_client import NotificationCounts
 from app.utils import get_current_financial_year
@@ -8,7 +12,7 @@ from app.utils import get_current_financial_year
 
 @pytest.fixture
 def mock_redis():
-    with patch("app.notify_client.notification_counts_client.redis_client") as mock:
+    with patch("app.notify_client.counters.redis_client") as mock:
         yield mock
 
 
@@ -33,7 +37,7 @@ def mock_get_all_notification_counts_for_today():
 class TestNotificationCounts:
     def test_get_all_notification_counts_for_today_redis_has_data(self, mock_redis):
         # Setup
-        mock_redis.get.side_effect = [5, 10]  # sms, email
+        mock_redis.redis_store.mget.return_value = [b"5", b"10"]  # sms, email
         wrapper = NotificationCounts()
 
         # Execute
@@ -41,7 +45,9 @@ class TestNotificationCounts:
 
         # Assert
         assert result == {"sms": 5, "email": 10}
-        assert mock_redis.get.call_count == 2
+        mock_redis.redis_store.mget.assert_called_once_with(
+            [sms_daily_count_cache_key("service-123"), email_daily_count_cache_key("service-123")]
+        )
 
     @pytest.mark.parametrize(
         "redis_side_effect, expected_result",
@@ -56,7 +62,7 @@ class TestNotificationCounts:
         self, mock_redis, mock_template_stats, redis_side_effect, expected_result
     ):
         # Setup
-        mock_redis.get.side_effect = redis_side_effect
+        mock_redis.redis_store.mget.return_value = redis_side_effect
         mock_template_stats.get_template_statistics_for_service.return_value = [
             {"template_id": "a1", "template_type": "sms", "count": 3, "status": "delivered"},
             {"template_id": "a2", "template_type": "email", "count": 7, "status": "temporary-failure"},
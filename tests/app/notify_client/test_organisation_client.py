@@ -1,9 +1,11 @@
-from unittest.mock import call
+from unittest.mock import Mock, call
 
 import pytest
 from flask import g
+from notifications_python_client.errors import HTTPError
 
 from app import organisations_client
+from app.notify_client import cache
 
 
 @pytest.mark.parametrize(
@@ -182,6 +184,8 @@ def test_update_service_organisation(mocker, fake_uuid):
 
     mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
     mock_post = mocker.patch("app.notify_client.organisations_api_client.OrganisationsClient.post")
+    mocker.patch("app.user_api_client.get_users_for_service", return_value=[{"id": "service-user"}])
+    mocker.patch("app.user_api_client.get_users_for_organisation", return_value=[{"id": "org-user"}])
 
     organisations_client.update_service_organisation(
         service_id,
@@ -190,8 +194,59 @@ def test_update_service_organisation(mocker, fake_uuid):
 
     mock_post.assert_called_with(url="/organisations/{}/service".format(org_id), data={"service_id": service_id})
     assert mock_redis_delete.call_args_list == [
+        call("user-service-user-organisations-and-services", "user-org-user-organisations-and-services"),
         call("service-{}-data-retention".format(service_id)),
         call("organisations"),
         call("live-service-and-organisation-counts"),
         call("service-{}".format(service_id)),
     ]
+
+
+def test_get_organisation_by_domain_caches_not_finding_organisation(mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mock_get = mocker.patch(
+        "app.notify_client.organisations_api_client.OrganisationsClient.get",
+        side_effect=HTTPError(response=Mock(status_code=404, json={}), message={}),
+    )
+
+    assert organisations_client.get_organisation_by_domain("example.gc.ca") is None
+
+    mock_get.assert_called_once_with(url="/organisations/by-domain?domain=example.gc.ca")
+    mock_redis_set.assert_called_once_with("organisation-by-domain-not-found--example.gc.ca", "null", ex=cache.NOT_FOUND_TTL)
+
+
+@pytest.mark.parametrize("domain", ["example.gc.ca", " Example.GC.ca"])
+def test_get_organisation_by_domain_uses_cached_not_found(mocker, domain):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=b"null")
+    mock_get = mocker.patch("app.notify_client.organisations_api_client.OrganisationsClient.get")
+
+    assert organisations_client.get_organisation_by_domain(domain) is None
+    mock_redis_get.assert_called_once_with("organisation-by-domain-not-found--example.gc.ca")
+    assert not mock_get.called
+
+
+def test_update_organisation_domains_deletes_cached_not_found(mocker, fake_uuid):
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+    mocker.patch("app.notify_client.organisations_api_client.OrganisationsClient.post")
+
+    organisations_client.update_organisation(fake_uuid, domains=["Example.GC.ca", "canada.ca "])
+
+    assert mock_redis_delete.call_args_list == [
+        call("organisation-by-domain-not-found--example.gc.ca", "organisation-by-domain-not-found--canada.ca"),
+        call("organisations"),
+        call("domains"),
+    ]
+
+
+def test_renaming_organisation_drops_members_cached_organisations_and_services(mocker, fake_uuid):
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+    mocker.patch("app.notify_client.organisations_api_client.OrganisationsClient.post")
+    mock_get_users = mocker.patch("app.user_api_client.get_users_for_organisation", return_value=[{"id": "1"}, {"id": "2"}])
+    mock_bump = mocker.patch("app.notify_client.generations.bump")
+
+    organisations_client.update_organisation(fake_uuid, name="New name")
+
+    mock_get_users.assert_called_once_with(fake_uuid)
+    assert call("user-1-organisations-and-services", "user-2-organisations-and-services") in mock_redis_delete.call_args_list
+    assert not mock_bump.called
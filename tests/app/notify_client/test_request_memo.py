@@ -0,0 +1,102 @@
+import pytest
+import requests
+from flask import g
+
+from app.notify_client import NotifyAdminAPIClient, request_memo
+from tests.conftest import set_config
+
+
+def _response(content):
+    response = requests.Response()
+    response._content = content
+    response.status_code = 200
+    return response
+
+
+@pytest.fixture
+def api_client(app_, mocker):
+    mocker.patch("app.notify_client.NotifyAdminAPIClient.check_inactive_service")
+    mocker.patch("app.notify_client.current_user", id="1", platform_admin=False)
+    api_client = NotifyAdminAPIClient()
+    api_client.init_app(app_)
+    return api_client
+
+
+@pytest.fixture
+def memo_enabled(app_):
+    with set_config(app_, "API_GET_MEMO_ENABLED", True):
+        yield
+
+
+def test_repeated_get_is_only_sent_once(app_, api_client, memo_enabled, mocker):
+    mock_request = mocker.patch("requests.Session.request", side_effect=[_response(b'{"a": 1}'), _response(b'{"a": 2}')])
+
+    with app_.test_request_context():
+        g.current_service = None
+        first = api_client.get("/service/1234", params={"x": 1})
+        first["a"] = "changed by the caller"
+        second = api_client.get("/service/1234", params={"x": 1})
+
+        assert request_memo.duplicate_calls_avoided() == 1
+
+    assert second == {"a": 1}
+    assert mock_request.call_count == 1
+
+
+def test_gets_with_different_params_are_both_sent(app_, api_client, memo_enabled, mocker):
+    mock_request = mocker.patch("requests.Session.request", side_effect=[_response(b'{"a": 1}'), _response(b'{"a": 2}')])
+
+    with app_.test_request_context():
+        g.current_service = None
+        assert api_client.get("/service/1234", params={"x": 1}) == {"a": 1}
+        assert api_client.get("/service/1234", params={"x": 2}) == {"a": 2}
+
+    assert mock_request.call_count == 2
+
+
+def test_write_invalidates_all_memoised_gets(app_, api_client, memo_enabled, mocker):
+    mock_request = mocker.patch(
+        "requests.Session.request",
+        side_effect=[
+            _response(b'{"a": 1}'),
+            _response(b'{"b": 1}'),
+            _response(b"{}"),
+            _response(b'{"a": 2}'),
+            _response(b'{"b": 2}'),
+        ],
+    )
+
+    with app_.test_request_context():
+        g.current_service = None
+        api_client.get("/service/1234/template")
+        api_client.get("/user/5678")
+        api_client.post("/service/1234/template/abcd", data={})
+
+        assert api_client.get("/service/1234/template") == {"a": 2}
+        # Writes to one resource can change another, like a user’s permissions changing with a service’s users
+        assert api_client.get("/user/5678") == {"b": 2}
+
+    assert mock_request.call_count == 4
+
+
+def test_memo_does_not_outlive_the_request(app_, api_client, memo_enabled, mocker):
+    mock_request = mocker.patch("requests.Session.request", side_effect=[_response(b'{"a": 1}'), _response(b'{"a": 2}')])
+
+    with app_.test_request_context():
+        g.current_service = None
+        api_client.get("/service/1234")
+        request_memo.reset()
+        assert api_client.get("/service/1234") == {"a": 2}
+
+    assert mock_request.call_count == 2
+
+
+def test_memo_disabled_by_config(app_, api_client, mocker):
+    mock_request = mocker.patch("requests.Session.request", side_effect=[_response(b'{"a": 1}'), _response(b'{"a": 2}')])
+
+    with set_config(app_, "API_GET_MEMO_ENABLED", False), app_.test_request_context():
+        g.current_service = None
+        api_client.get("/service/1234")
+        api_client.get("/service/1234")
+
+    assert mock_request.call_count == 2
@@ -0,0 +1,262 @@
+import pytest
+import requests
+from flask import g
+from notifications_python_client.errors import HTTPError
+
+from app.notify_client import NotifyAdminAPIClient
+from app.notify_client.retry import (
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    CircuitBreakers,
+    RetryPolicy,
+    circuit_breakers,
+    timeout_within_deadline,
+)
+from app.notify_client.routes import metric_name, route_template
+
+
+def _response(status_code, content=b"{}"):
+    response = requests.Response()
+    response._content = content
+    response.status_code = status_code
+    return response
+
+
+@pytest.fixture
+def api_client(app_, mocker):
+    mocker.patch("app.notify_client.NotifyAdminAPIClient.check_inactive_service")
+    mocker.patch("app.notify_client.current_user", id="1", platform_admin=False)
+    api_client = NotifyAdminAPIClient()
+    api_client.init_app(app_)
+    api_client.retry_policy = RetryPolicy(attempts=3, circuit_breaker_enabled=True, failure_threshold=2)
+    circuit_breakers.reset()
+    yield api_client
+    circuit_breakers.reset()
+
+
+@pytest.mark.parametrize(
+    "url, expected_template, expected_metric",
+    [
+        ("http://localhost:6011/service/6ce466d0-fd6a-11e5-82f5-e0accb9d11a6", "/service/{id}", "service.id"),
+        (
+            "/service/6ce466d0-fd6a-11e5-82f5-e0accb9d11a6/job/5a0eefe5-0ba2-4da5-b7c4-0e2d9d7ab9a0?page=2",
+            "/service/{id}/job/{id}",
+            "service.id.job.id",
+        ),
+        ("/organisations/unique-name", "/organisations/unique-name", "organisations.unique-name"),
+        ("/invite/service/IjEyMzQ1Njc4OTAi.abcdefghijk", "/invite/service/{id}", "invite.service.id"),
+        ("/platform-stats/1234", "/platform-stats/{id}", "platform-stats.id"),
+        ("/", "/", "root"),
+    ],
+)
+def test_route_template(url, expected_template, expected_metric):
+    assert route_template(url) == expected_template
+    assert metric_name(url) == expected_metric
+
+
+@pytest.mark.parametrize("attempt, upper_bound", [(1, 0.1), (2, 0.2), (3, 0.4), (10, 2)])
+def test_backoff_is_jittered_below_the_exponential_bound(mocker, attempt, upper_bound):
+    uniform = mocker.patch("app.notify_client.retry.random.uniform", return_value=0.05)
+    policy = RetryPolicy(backoff_base=0.1, backoff_max=2)
+
+    assert policy.backoff(attempt) == 0.05
+    uniform.assert_called_once_with(0, pytest.approx(upper_bound))
+
+
+@pytest.mark.parametrize(
+    "timeout, deadline, expected",
+    [
+        ((5, 30), None, (5, 30)),
+        ((5, 30), 110, (5, 10)),
+        (30, 103, 3),
+        (30, 90, 0.001),
+    ],
+)
+def test_timeout_within_deadline(mocker, timeout, deadline, expected):
+    mocker.patch("app.notify_client.retry.monotonic", return_value=100)
+
+    assert timeout_within_deadline(timeout, deadline) == expected
+
+
+def test_circuit_breaker_opens_after_consecutive_failures(mocker):
+    mock_statsd = mocker.patch("app.notify_client.retry.statsd_client")
+    breaker = CircuitBreaker("/service/{id}", failure_threshold=2, reset_timeout=30)
+
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitBreakerOpenError):
+        breaker.before_request()
+
+    mock_statsd.incr.assert_any_call("notify_api.circuit_breaker.service.id.open")
+    mock_statsd.incr.assert_any_call("notify_api.circuit_breaker.service.id.rejected")
+    mock_statsd.gauge.assert_called_once_with("notify_api.circuit_breaker.service.id.open", 1)
+
+
+def test_circuit_breaker_success_resets_the_failure_count():
+    breaker = CircuitBreaker("/service/{id}", failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_lets_one_trial_request_through_after_reset_timeout(mocker):
+    mock_monotonic = mocker.patch("app.notify_client.retry.monotonic", return_value=100)
+    breaker = CircuitBreaker("/service/{id}", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    mock_monotonic.return_value = 131
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    with pytest.raises(CircuitBreakerOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_request()
+
+
+def test_circuit_breaker_reopens_if_trial_request_fails(mocker):
+    mock_monotonic = mocker.patch("app.notify_client.retry.monotonic", return_value=100)
+    breaker = CircuitBreaker("/service/{id}", failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+
+    mock_monotonic.return_value = 131
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened_at == 131
+
+
+def test_circuit_breaker_lets_another_trial_through_once_trial_ends(mocker):
+    mock_monotonic = mocker.patch("app.notify_client.retry.monotonic", return_value=100)
+    breaker = CircuitBreaker("/service/{id}", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    mock_monotonic.return_value = 131
+    assert breaker.before_request() is True
+    breaker.end_trial()
+
+    assert breaker.before_request() is True
+
+
+def test_circuit_breakers_are_shared_by_route():
+    breakers = CircuitBreakers()
+    policy = RetryPolicy()
+
+    first = breakers.for_url("/service/6ce466d0-fd6a-11e5-82f5-e0accb9d11a6", policy)
+    second = breakers.for_url("/service/5a0eefe5-0ba2-4da5-b7c4-0e2d9d7ab9a0", policy)
+    other = breakers.for_url("/user/5a0eefe5-0ba2-4da5-b7c4-0e2d9d7ab9a0", policy)
+
+    assert first is second
+    assert first is not other
+    assert breakers.states() == {"/service/{id}": "closed", "/user/{id}": "closed"}
+
+
+def test_client_retries_503_and_then_succeeds(app_, api_client, mocker):
+    mock_sleep = mocker.patch("app.notify_client.time.sleep")
+    mock_request = mocker.patch("requests.Session.request", side_effect=[_response(503), _response(200, b'{"data": "ok"}')])
+
+    with app_.test_request_context():
+        g.current_service = None
+        assert api_client.get("/service/1234") == {"data": "ok"}
+
+    assert mock_request.call_count == 2
+    assert mock_sleep.call_count == 1
+    assert circuit_breakers.states() == {"/service/{id}": "closed"}
+
+
+def test_client_does_not_retry_client_errors(app_, api_client, mocker):
+    mock_request = mocker.patch("requests.Session.request", return_value=_response(404))
+
+    with app_.test_request_context(), pytest.raises(HTTPError) as exc:
+        g.current_service = None
+        api_client.get("/service/1234")
+
+    assert exc.value.status_code == 404
+    assert mock_request.call_count == 1
+    assert circuit_breakers.states() == {"/service/{id}": "closed"}
+
+
+def test_client_fails_fast_once_the_circuit_breaker_is_open(app_, api_client, mocker):
+    mocker.patch("app.notify_client.time.sleep")
+    mock_request = mocker.patch("requests.Session.request", return_value=_response(503))
+
+    with app_.test_request_context(), pytest.raises(CircuitBreakerOpenError):
+        g.current_service = None
+        api_client.get("/service/1234")
+
+    # The second failure opens the breaker, so the third attempt is never sent
+    assert mock_request.call_count == 2
+
+    with app_.test_request_context(), pytest.raises(CircuitBreakerOpenError):
+        g.current_service = None
+        api_client.get("/service/5678")
+
+    assert mock_request.call_count == 2
+
+
+def test_client_stops_retrying_at_the_deadline(app_, api_client, mocker):
+    api_client.retry_policy = RetryPolicy(attempts=3, backoff_base=1, backoff_max=1, deadline=0.5)
+    mocker.patch("app.notify_client.retry.random.uniform", return_value=1)
+    mock_sleep = mocker.patch("app.notify_client.time.sleep")
+    mock_request = mocker.patch("requests.Session.request", return_value=_response(503))
+
+    with app_.test_request_context(), pytest.raises(HTTPError) as exc:
+        g.current_service = None
+        api_client.get("/service/1234")
+
+    assert exc.value.status_code == 503
+    assert mock_request.call_count == 1
+    assert not mock_sleep.called
+    assert mock_request.call_args[1]["timeout"][1] <= 0.5
+
+
+@pytest.mark.parametrize("status_code", [500, 501])
+def test_client_does_not_open_circuit_breaker_for_other_server_errors(app_, api_client, mocker, status_code):
+    mock_request = mocker.patch("requests.Session.request", return_value=_response(status_code))
+
+    for _ in range(3):
+        with app_.test_request_context(), pytest.raises(HTTPError):
+            g.current_service = None
+            api_client.get("/service/1234")
+
+    assert mock_request.call_count == 3
+    assert circuit_breakers.states() == {"/service/{id}": "closed"}
+
+
+def test_client_counts_other_exceptions_as_failures_and_ends_trial(app_, api_client, mocker):
+    mock_monotonic = mocker.patch("app.notify_client.retry.monotonic", return_value=100)
+    breaker = circuit_breakers.for_url("/service/1234", api_client.retry_policy)
+    breaker.record_failure()
+    breaker.record_failure()
+    mock_monotonic.return_value = 131
+    mock_request = mocker.patch("requests.Session.request", side_effect=ValueError)
+
+    with app_.test_request_context(), pytest.raises(ValueError):
+        g.current_service = None
+        api_client.get("/service/1234")
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert mock_request.call_count == 1
+
+    # Once the reset timeout has passed again, the next trial is let through rather than rejected
+    mock_monotonic.return_value = 162
+    mock_request.side_effect = None
+    mock_request.return_value = _response(200, b'{"data": "ok"}')
+    with app_.test_request_context():
+        g.current_service = None
+        assert api_client.get("/service/1234") == {"data": "ok"}
+
+    assert breaker.state == CircuitBreaker.CLOSED
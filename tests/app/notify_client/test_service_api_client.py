@@ -5,7 +5,7 @@ import pytest
 from flask import g
 from freezegun import freeze_time
 
-from app import invite_api_client, service_api_client, user_api_client
+from app import inbound_number_client, invite_api_client, service_api_client, user_api_client
 from app.notify_client.service_api_client import ServiceAPIClient
 from tests.conftest import SERVICE_ONE_ID
 
@@ -346,8 +346,6 @@ def test_returns_value_from_cache(
             [SERVICE_ONE_ID],
             {"properties": {}},
         ),
-        (service_api_client, "archive_service", [SERVICE_ONE_ID], {}),
-        (service_api_client, "suspend_service", [SERVICE_ONE_ID], {}),
         (service_api_client, "resume_service", [SERVICE_ONE_ID], {}),
         (service_api_client, "remove_user_from_service", [SERVICE_ONE_ID, ""], {}),
         (service_api_client, "update_safelist", [SERVICE_ONE_ID, {}], {}),
@@ -405,6 +403,7 @@ def test_deletes_service_cache(
     mocker.patch("app.notify_client.current_user", id="1")
     mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
     mock_request = mocker.patch("notifications_python_client.base.BaseAPIClient.request")
+    mocker.patch("app.user_api_client.get_users_for_service", return_value=[])
 
     # set this to avoid the issue that our test isn't running in a real request and therefore this value won't be set
     g.current_service = None
@@ -414,6 +413,104 @@ def test_deletes_service_cache(
     assert len(mock_request.call_args_list) == 1
 
 
+@pytest.mark.parametrize(
+    "attributes, expected_deletes",
+    [
+        ({"name": "new name"}, [call("user-1-organisations-and-services", "user-2-organisations-and-services")]),
+        ({"restricted": False}, [call("user-1-organisations-and-services", "user-2-organisations-and-services")]),
+        ({"message_limit": 1000}, []),
+    ],
+)
+def test_update_service_drops_teams_cached_organisations_and_services_if_they_include_change(
+    app_, mocker, attributes, expected_deletes
+):
+    mocker.patch("app.notify_client.current_user", id="1")
+    mocker.patch("app.notify_client.service_api_client.ServiceAPIClient.post")
+    mock_get_users = mocker.patch("app.user_api_client.get_users_for_service", return_value=[{"id": "1"}, {"id": "2"}])
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+
+    service_api_client.update_service(SERVICE_ONE_ID, **attributes)
+
+    assert mock_get_users.called == bool(expected_deletes)
+    assert [
+        delete for delete in mock_redis_delete.call_args_list if "organisations-and-services" in delete[0][0]
+    ] == expected_deletes
+
+
+@pytest.mark.parametrize("method", ["archive_service", "suspend_service", "resume_service"])
+def test_changing_whether_service_is_active_drops_teams_cached_organisations_and_services(app_, mocker, method):
+    calls = mocker.Mock()
+    mocker.patch("app.notify_client.service_api_client.ServiceAPIClient.post", calls.post)
+    mocker.patch("app.user_api_client.get_users_for_service", calls.get_users_for_service)
+    calls.get_users_for_service.return_value = [{"id": "1"}]
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+    mock_bump = mocker.patch("app.notify_client.generations.bump")
+
+    getattr(service_api_client, method)(SERVICE_ONE_ID)
+
+    # The team is the one from before the change
+    assert [name for name, *_ in calls.mock_calls] == ["get_users_for_service", "post"]
+    calls.get_users_for_service.assert_called_once_with(SERVICE_ONE_ID)
+    assert call("user-1-organisations-and-services") in mock_redis_delete.call_args_list
+    assert call("organisations_and_services") not in mock_bump.call_args_list
+
+
+@pytest.mark.parametrize("method", ["archive_service", "suspend_service"])
+def test_archiving_or_suspending_service_drops_everything_cached_for_it(app_, mocker, method):
+    mocker.patch("app.notify_client.service_api_client.ServiceAPIClient.post")
+    mocker.patch("app.user_api_client.get_users_for_service", return_value=[])
+    mock_bump = mocker.patch("app.notify_client.generations.bump")
+
+    getattr(service_api_client, method)(SERVICE_ONE_ID)
+
+    assert call("service", SERVICE_ONE_ID) in mock_bump.call_args_list
+
+
+@pytest.mark.parametrize(
+    "client, method, extra_args, expected_cache_delete",
+    [
+        (service_api_client, "add_reply_to_email_address", [SERVICE_ONE_ID, ""], "email-reply-to"),
+        (service_api_client, "update_reply_to_email_address", [SERVICE_ONE_ID] + [""] * 2, "email-reply-to"),
+        (service_api_client, "delete_reply_to_email_address", [SERVICE_ONE_ID, ""], "email-reply-to"),
+        (service_api_client, "add_letter_contact", [SERVICE_ONE_ID, ""], "letter-contacts"),
+        (service_api_client, "update_letter_contact", [SERVICE_ONE_ID] + [""] * 2, "letter-contacts"),
+        (service_api_client, "delete_letter_contact", [SERVICE_ONE_ID, ""], "letter-contacts"),
+        (service_api_client, "add_sms_sender", [SERVICE_ONE_ID, ""], "sms-senders"),
+        (service_api_client, "add_sms_sender", [SERVICE_ONE_ID, ""], "inbound-number"),
+        (service_api_client, "update_sms_sender", [SERVICE_ONE_ID] + [""] * 2, "sms-senders"),
+        (service_api_client, "delete_sms_sender", [SERVICE_ONE_ID, ""], "sms-senders"),
+    ],
+)
+def test_deletes_service_sub_resource_cache(app_, mocker, client, method, extra_args, expected_cache_delete):
+    mocker.patch("app.notify_client.current_user", id="1")
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+    mocker.patch("notifications_python_client.base.BaseAPIClient.request")
+
+    g.current_service = None
+    getattr(client, method)(*extra_args)
+
+    assert call("service-{}-{}".format(SERVICE_ONE_ID, expected_cache_delete)) in mock_redis_delete.call_args_list
+
+
+@pytest.mark.parametrize(
+    "client, method, expected_cache_key",
+    [
+        (service_api_client, "get_reply_to_email_addresses", "email-reply-to"),
+        (service_api_client, "get_letter_contacts", "letter-contacts"),
+        (service_api_client, "get_sms_senders", "sms-senders"),
+        (inbound_number_client, "get_inbound_sms_number_for_service", "inbound-number"),
+    ],
+)
+def test_service_sub_resources_are_read_from_cache(app_, mocker, client, method, expected_cache_key):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=b'[{"id": "cached"}]')
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get")
+
+    assert getattr(client, method)(SERVICE_ONE_ID) == [{"id": "cached"}]
+
+    mock_redis_get.assert_called_once_with("service-{}-{}".format(SERVICE_ONE_ID, expected_cache_key))
+    assert not mock_api_get.called
+
+
 @pytest.mark.parametrize(
     "method, extra_args, expected_cache_deletes",
     [
@@ -0,0 +1,161 @@
+import pytest
+
+from app.notify_client import cache, single_flight
+from app.notify_client.organisations_api_client import OrganisationsClient
+from app.notify_client.single_flight import RecomputeTimes, lock_key
+
+
+@pytest.fixture
+def active_redis(mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+
+
+@pytest.fixture
+def mock_read(mocker):
+    def _mock_read(value, ttl=None):
+        return mocker.patch("app.notify_client.generations.read", return_value=(b"", value, ttl))
+
+    return _mock_read
+
+
+def test_acquire_sets_lock_only_if_not_held(mocker):
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set", return_value=True)
+
+    token = single_flight.acquire("organisations")
+
+    mock_redis_set.assert_called_once_with("organisations-lock", token, ex=single_flight.LOCK_TTL, nx=True)
+
+
+def test_acquire_returns_none_if_lock_held(mocker):
+    mocker.patch("app.extensions.RedisClient.set", return_value=None)
+
+    assert single_flight.acquire("organisations") is None
+
+
+def test_release_only_deletes_our_lock(mocker):
+    mock_redis = mocker.patch("app.notify_client.single_flight.redis_client")
+
+    single_flight.release("organisations", "abc")
+
+    mock_redis.redis_store.eval.assert_called_once_with(single_flight._RELEASE_SCRIPT, 1, "organisations-lock", "abc")
+
+
+def test_wait_for_returns_value_once_stored(mocker):
+    mocker.patch("app.notify_client.single_flight.time.sleep")
+    mocker.patch("app.extensions.RedisClient.get", return_value=b"locked")
+    get = mocker.Mock(side_effect=[None, None, b"[]"])
+
+    assert single_flight.wait_for("organisations", get) == b"[]"
+    assert get.call_count == 3
+
+
+def test_wait_for_stops_when_lock_released_without_value(mocker):
+    mocker.patch("app.notify_client.single_flight.time.sleep")
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    get = mocker.Mock(return_value=None)
+
+    assert single_flight.wait_for("organisations", get) is None
+    mock_redis_get.assert_called_once_with("organisations-lock")
+    assert get.call_count == 2
+
+
+def test_wait_for_gives_up_after_timeout(mocker):
+    mocker.patch("app.notify_client.single_flight.time.sleep")
+    mocker.patch("app.notify_client.single_flight.time.monotonic", side_effect=[0, 1, 2.5])
+    mocker.patch("app.extensions.RedisClient.get", return_value=b"locked")
+    get = mocker.Mock(return_value=None)
+
+    assert single_flight.wait_for("organisations", get, timeout=2) is None
+    assert get.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "ttl_remaining, random_value, expected",
+    [
+        (None, 0.99, False),
+        (-1, 0.99, False),
+        (-2, 0.99, False),
+        (3600, 0.99, False),
+        # -0.1 * log(1 - 0.99) is about 0.46 seconds
+        (1, 0.99, False),
+        (0.4, 0.99, True),
+        (0.4, 0.5, False),
+    ],
+)
+def test_should_refresh_early(mocker, ttl_remaining, random_value, expected):
+    mocker.patch("app.notify_client.single_flight.random.random", return_value=random_value)
+
+    assert single_flight.should_refresh_early(ttl_remaining, 0.1) is expected
+
+
+def test_recompute_times_are_a_moving_average():
+    times = RecomputeTimes(weight=0.5)
+
+    assert times.get("organisations") == single_flight.DEFAULT_RECOMPUTE_TIME
+
+    times.record("organisations", 1)
+    times.record("organisations", 2)
+
+    assert times.get("organisations") == 1.5
+
+
+def test_cache_set_calls_api_once_lock_is_taken(active_redis, mock_read, mocker):
+    mock_read(None, -2)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set", return_value=True)
+    mock_release = mocker.patch("app.notify_client.single_flight.release")
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get", return_value=[{"id": "1"}])
+
+    assert OrganisationsClient().get_organisations() == [{"id": "1"}]
+
+    mock_api_get.assert_called_once_with(url="/organisations")
+    assert mock_redis_set.call_args_list == [
+        mocker.call(lock_key("organisations"), mocker.ANY, ex=single_flight.LOCK_TTL, nx=True),
+        mocker.call("organisations", '[{"id": "1"}]', ex=cache.TTL),
+    ]
+    mock_release.assert_called_once_with("organisations", mock_redis_set.call_args_list[0][0][1])
+
+
+def test_cache_set_waits_for_lock_holder_instead_of_calling_api(active_redis, mock_read, mocker):
+    mock_read(None, -2)
+    mocker.patch("app.extensions.RedisClient.set", return_value=None)
+    mocker.patch("app.notify_client.single_flight.wait_for", return_value=b'[{"id": "2"}]')
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get")
+
+    assert OrganisationsClient().get_organisations() == [{"id": "2"}]
+
+    assert not mock_api_get.called
+
+
+def test_cache_set_calls_api_itself_if_lock_holder_takes_too_long(active_redis, mock_read, mocker):
+    mock_read(None, -2)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set", return_value=None)
+    mocker.patch("app.notify_client.single_flight.wait_for", return_value=None)
+    mock_release = mocker.patch("app.notify_client.single_flight.release")
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get", return_value=[])
+
+    assert OrganisationsClient().get_organisations() == []
+
+    mock_api_get.assert_called_once_with(url="/organisations")
+    mock_redis_set.assert_called_with("organisations", "[]", ex=cache.TTL)
+    assert not mock_release.called
+
+
+@pytest.mark.parametrize("refresh_early", [True, False])
+def test_cache_set_refreshes_early_when_chosen(active_redis, mock_read, mocker, refresh_early):
+    # 5 seconds before it goes stale
+    mock_read(b'[{"id": "old"}]', cache.TTL - cache.SOFT_TTL + 5)
+    mock_should_refresh_early = mocker.patch("app.notify_client.single_flight.should_refresh_early", return_value=refresh_early)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set", return_value=True)
+    mocker.patch("app.notify_client.single_flight.release")
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get", return_value=[{"id": "new"}])
+
+    # The cached value is returned straight away, whether or not it is refreshed
+    assert OrganisationsClient().get_organisations() == [{"id": "old"}]
+
+    mock_should_refresh_early.assert_called_once_with(5, mocker.ANY)
+    if refresh_early:
+        mock_api_get.assert_called_once_with(url="/organisations")
+        mock_redis_set.assert_called_with("organisations", '[{"id": "new"}]', ex=cache.TTL)
+    else:
+        assert not mock_api_get.called
+        assert not mock_redis_set.called
@@ -3,6 +3,7 @@ from unittest.mock import call
 import pytest
 from requests import HTTPError
 
+from app.notify_client import cache
 from app.notify_client.template_category_api_client import TemplateCategoryClient
 
 
@@ -85,6 +86,7 @@ def test_update_template_category(template_category_client, mocker):
     mock_redis_delete = mocker.patch(
         "app.extensions.RedisClient.delete",
     )
+    mock_bump = mocker.patch("app.notify_client.generations.bump")
 
     template_category_client.update_template_category(
         template_category_id="template_category_id",
@@ -111,6 +113,21 @@ def test_update_template_category(template_category_client, mocker):
     assert call("template_categories") in mock_redis_delete.call_args_list
     assert call("template_category-template_category_id") in mock_redis_delete.call_args_list
     assert len(mock_redis_delete.call_args_list) == 2
+    mock_bump.assert_called_once_with("template_category")
+
+
+def test_update_template_category_bumps_its_version(template_category_client, mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+    mocker.patch("app.notify_client.template_category_api_client.TemplateCategoryClient.post")
+    mocker.patch("app.notify_client.cache.delete_keys")
+    mocker.patch("app.notify_client.generations.bump")
+    mock_hincrby = mocker.patch("app.notify_client.cache.redis_client.redis_store.hincrby", create=True)
+    mock_invalidate_pattern = mocker.patch("app.notify_client.cache.local_cache.invalidate_pattern")
+
+    template_category_client.update_template_category("template_category_id", "", "", "", "", "", "", False, "")
+
+    mock_hincrby.assert_called_once_with(cache.TEMPLATE_CATEGORY_VERSIONS, "template_category_id", 1)
+    mock_invalidate_pattern.assert_called_once_with(cache.TEMPLATE_KEY_PATTERN)
 
 
 def test_delete_template_category(template_category_client, mocker):
@@ -5,8 +5,10 @@ from unittest.mock import call
 import pytest
 from flask import g
 from freezegun import freeze_time
+from notifications_python_client.errors import HTTPError
 
-from app import invite_api_client, service_api_client, user_api_client
+from app import invite_api_client, organisations_client, service_api_client, user_api_client
+from app.notify_client import cache
 from tests import sample_uuid
 from tests.conftest import SERVICE_ONE_ID
 
@@ -218,6 +220,40 @@ def test_deletes_user_cache(
     assert len(mock_request.call_args_list) == 1
 
 
+def test_get_organisations_and_services_for_user_is_cached(app_, mocker):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mocker.patch("app.notify_client.NotifyAdminAPIClient.get", return_value={"organisations": [], "services": []})
+
+    user_api_client.get_organisations_and_services_for_user(user_id)
+
+    mock_redis_get.assert_called_once_with("user-{}-organisations-and-services".format(user_id))
+    mock_redis_set.assert_called_once_with(
+        "user-{}-organisations-and-services".format(user_id), '{"organisations": [], "services": []}', ex=cache.TTL
+    )
+
+
+@pytest.mark.parametrize(
+    "client, method, extra_args",
+    [
+        (user_api_client, "add_user_to_service", [SERVICE_ONE_ID, user_id, [], []]),
+        (user_api_client, "add_user_to_organisation", [sample_uuid(), user_id]),
+        (service_api_client, "remove_user_from_service", [SERVICE_ONE_ID, user_id]),
+        (service_api_client, "create_service", ["", "", 0, 0, False, user_id, sample_uuid(), False]),
+        (organisations_client, "remove_user_from_organisation", [sample_uuid(), user_id]),
+    ],
+)
+def test_membership_changes_delete_cached_organisations_and_services(app_, mocker, client, method, extra_args):
+    mocker.patch("app.notify_client.current_user", id="1")
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+    mocker.patch("notifications_python_client.base.BaseAPIClient.request")
+
+    g.current_service = None
+    getattr(client, method)(*extra_args)
+
+    assert call("user-{}-organisations-and-services".format(user_id)) in mock_redis_delete.call_args_list
+
+
 def test_add_user_to_service_calls_correct_endpoint_and_deletes_keys_from_cache(mocker):
     mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
 
@@ -234,6 +270,7 @@ def test_add_user_to_service_calls_correct_endpoint_and_deletes_keys_from_cache(
 
     mock_post.assert_called_once_with(expected_url, data=data)
     assert mock_redis_delete.call_args_list == [
+        call("user-{user_id}-organisations-and-services".format(user_id=user_id)),
         call("user-{user_id}".format(user_id=user_id)),
         call("service-{service_id}-template-folders".format(service_id=service_id)),
         call("service-{service_id}".format(service_id=service_id)),
@@ -298,3 +335,58 @@ class TestFreshdesk:
         }
         del data["user_id"]
         mock_post.assert_called_once_with(f"/user/{user_id}/new-template-category-request", data=expected_data)
+
+
+@pytest.mark.parametrize("email_address", ["new@example.gc.ca", " New@Example.GC.ca "])
+def test_get_user_by_email_or_none_caches_not_finding_user(mocker, email_address):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mocker.patch(
+        "app.notify_client.user_api_client.UserApiClient.get",
+        side_effect=HTTPError(response=mocker.Mock(status_code=404, json={}), message={}),
+    )
+
+    assert user_api_client.get_user_by_email_or_none(email_address) is None
+
+    mock_redis_set.assert_called_once_with("user-by-email-not-found--new@example.gc.ca", "null", ex=cache.NOT_FOUND_TTL)
+
+
+@pytest.mark.parametrize("email_address", ["new@example.gc.ca", "NEW@example.gc.ca"])
+def test_get_user_by_email_or_none_uses_cached_not_found(mocker, email_address):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=b"null")
+    mock_api_get = mocker.patch("app.notify_client.user_api_client.UserApiClient.get")
+
+    assert user_api_client.get_user_by_email_or_none(email_address) is None
+
+    mock_redis_get.assert_called_once_with("user-by-email-not-found--new@example.gc.ca")
+    assert not mock_api_get.called
+
+
+def test_get_user_by_email_or_none_does_not_cache_found_user(mocker, api_user_active):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mocker.patch("app.notify_client.user_api_client.UserApiClient.get", return_value={"data": api_user_active})
+
+    assert user_api_client.get_user_by_email_or_none(api_user_active["email_address"]) == api_user_active
+
+    assert not mock_redis_set.called
+
+
+@pytest.mark.parametrize(
+    "method, args, kwargs",
+    [
+        ("register_user", ["Name", "new@example.gc.ca", "6502532222", "password", "sms_auth"], {}),
+        ("register_user", ["Name", " New@Example.gc.ca", "6502532222", "password", "sms_auth"], {}),
+        ("update_user_attribute", [user_id], {"email_address": "new@example.gc.ca"}),
+        ("update_user_attribute", [user_id], {"email_address": "NEW@example.gc.ca "}),
+    ],
+)
+def test_creating_user_or_changing_email_deletes_cached_not_found(mocker, method, args, kwargs):
+    mocker.patch("app.notify_client.current_user", id="1")
+    mock_redis_delete = mocker.patch("app.extensions.RedisClient.delete")
+    mocker.patch("app.notify_client.user_api_client.UserApiClient.post", return_value={"data": {}})
+    mocker.patch("app.notify_client.user_api_client.UserApiClient._create_message_digest", return_value="hashed")
+
+    getattr(user_api_client, method)(*args, **kwargs)
+
+    assert call("user-by-email-not-found--new@example.gc.ca") in mock_redis_delete.call_args_list
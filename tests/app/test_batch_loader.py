@@ -0,0 +1,68 @@
+import pytest
+
+from app.batch_loader import BatchLoader, reset
+
+
+def test_load_many_fetches_each_key_once_per_request(app_, mocker):
+    load_one = mocker.Mock(side_effect=lambda key: key.upper())
+    loader = BatchLoader("test", load_one=load_one)
+
+    with app_.test_request_context():
+        reset()
+        assert loader.load_many(["a", "b", "a"]) == ["A", "B", "A"]
+        assert loader.load("b") == "B"
+
+    assert [call.args for call in load_one.call_args_list] == [("a",), ("b",)]
+
+
+def test_load_fetches_primed_keys_together(app_, mocker):
+    load_many = mocker.Mock(side_effect=lambda keys: {key: key.upper() for key in keys})
+    loader = BatchLoader("test", load_many=load_many)
+
+    with app_.test_request_context():
+        reset()
+        loader.prime(["b", "c"])
+        assert loader.load("a") == "A"
+        assert loader.load("c") == "C"
+
+    load_many.assert_called_once_with(["a", "b", "c"])
+
+
+def test_load_one_calls_are_made_concurrently(app_, mocker):
+    mock_gather = mocker.patch("app.batch_loader.gather", return_value=["A", "B"])
+    loader = BatchLoader("test", load_one=str.upper)
+
+    with app_.test_request_context():
+        reset()
+        assert loader.load_many(["a", "b"]) == ["A", "B"]
+
+    assert len(mock_gather.call_args.args) == 2
+
+
+def test_results_do_not_outlive_the_request(app_, mocker):
+    load_one = mocker.Mock(side_effect=lambda key: key.upper())
+    loader = BatchLoader("test", load_one=load_one)
+
+    with app_.test_request_context():
+        reset()
+        loader.load("a")
+        reset()
+        loader.load("a")
+
+    assert load_one.call_count == 2
+
+
+def test_load_outside_request_is_not_cached(mocker):
+    load_one = mocker.Mock(side_effect=lambda key: key.upper())
+    loader = BatchLoader("test", load_one=load_one)
+
+    assert loader.load("a") == "A"
+    assert loader.load("a") == "A"
+    assert load_one.call_count == 2
+
+
+def test_needs_exactly_one_way_to_load():
+    with pytest.raises(TypeError):
+        BatchLoader("test")
+    with pytest.raises(TypeError):
+        BatchLoader("test", load_one=str.upper, load_many=dict)
@@ -0,0 +1,89 @@
+from unittest.mock import call
+
+from notifications_python_client.errors import HTTPError
+
+from app.commands import RateLimiter
+
+
+def _live_services(*totals):
+    return {
+        "data": [
+            {"service_id": "service-{}".format(i), "sms_totals": sms, "email_totals": email}
+            for i, (sms, email) in enumerate(totals)
+        ]
+    }
+
+
+def test_warm_cache_warms_most_active_services(app_, mocker):
+    mocker.patch(
+        "app.notify_client.service_api_client.service_api_client.get_live_services_data",
+        return_value=_live_services((1, 1), (None, 500), (10, None)),
+    )
+    mock_get_service = mocker.patch("app.notify_client.service_api_client.service_api_client.get_service")
+    mock_get_templates = mocker.patch("app.notify_client.service_api_client.service_api_client.get_service_templates")
+    mock_get_folders = mocker.patch(
+        "app.notify_client.template_folder_api_client.template_folder_api_client.get_template_folders"
+    )
+    mock_get_categories = mocker.patch(
+        "app.notify_client.template_category_api_client.template_category_api_client.get_all_template_categories"
+    )
+    mock_get_organisations = mocker.patch("app.notify_client.organisations_api_client.organisations_client.get_organisations")
+    mock_get_branding = mocker.patch("app.notify_client.email_branding_client.email_branding_client.get_all_email_branding")
+
+    result = app_.test_cli_runner().invoke(
+        args=["warm-cache", "--services", "2", "--concurrency", "1", "--rate", "0", "--no-articles"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Warming 9 keys for 2 services" in result.output
+    assert "[9/9]" in result.output
+    assert "Warmed 9 keys" in result.output
+    assert mock_get_service.call_args_list == [call("service-1"), call("service-2")]
+    assert mock_get_templates.call_args_list == [call("service-1"), call("service-2")]
+    assert mock_get_folders.call_args_list == [call("service-1"), call("service-2")]
+    mock_get_categories.assert_called_once_with()
+    mock_get_organisations.assert_called_once_with()
+    mock_get_branding.assert_called_once_with()
+
+
+def test_warm_cache_warms_gc_articles_pages_in_each_language(app_, mocker):
+    mock_get_page = mocker.patch("app.articles.pages.get_page_by_slug_with_cache")
+    mock_get_nav_items = mocker.patch("app.articles.menu.get_nav_items")
+    mocker.patch("app.notify_client.template_category_api_client.template_category_api_client.get_all_template_categories")
+    mocker.patch("app.notify_client.organisations_api_client.organisations_client.get_organisations")
+    mocker.patch("app.notify_client.email_branding_client.email_branding_client.get_all_email_branding")
+
+    result = app_.test_cli_runner().invoke(args=["warm-cache", "--services", "0", "--rate", "0"])
+
+    assert result.exit_code == 0, result.output
+    assert mock_get_nav_items.call_count == 2
+    assert call("wp/v2/pages", params={"slug": "home", "lang": "en"}) in mock_get_page.call_args_list
+    assert call("wp/v2/pages", params={"slug": "accueil", "lang": "fr"}) in mock_get_page.call_args_list
+
+
+def test_warm_cache_reports_failures(app_, mocker):
+    mocker.patch(
+        "app.notify_client.template_category_api_client.template_category_api_client.get_all_template_categories",
+        side_effect=HTTPError(response=mocker.Mock(status_code=503, json={}), message="API down"),
+    )
+    mocker.patch("app.notify_client.organisations_api_client.organisations_client.get_organisations")
+    mocker.patch("app.notify_client.email_branding_client.email_branding_client.get_all_email_branding")
+
+    result = app_.test_cli_runner().invoke(args=["warm-cache", "--services", "0", "--rate", "0", "--no-articles"])
+
+    assert result.exit_code == 1
+    assert "template_categories failed" in result.output
+    assert "Warmed 2 keys" in result.output
+    assert "Failed to warm 1 keys" in result.output
+
+
+def test_rate_limiter_spaces_out_calls(mocker):
+    mocker.patch("app.commands.time.monotonic", return_value=100)
+    mock_sleep = mocker.patch("app.commands.time.sleep")
+    limiter = RateLimiter(rate=4)
+
+    limiter.wait()
+    limiter.wait()
+    limiter.wait()
+
+    assert mock_sleep.call_args_list == [call(0.25), call(0.5)]
@@ -0,0 +1,68 @@
+from functools import partial
+
+import gevent
+import pytest
+from flask import g, request
+
+from app.fan_out import GatherTimeout, gather
+from tests.conftest import set_config
+
+
+def test_gather_returns_results_in_order(app_):
+    def slow(value, delay):
+        gevent.sleep(delay)
+        return value
+
+    with app_.test_request_context():
+        assert gather(partial(slow, "a", 0.03), partial(slow, "b", 0.01), partial(slow, "c", 0)) == ["a", "b", "c"]
+
+
+def test_gather_runs_calls_concurrently(app_):
+    finished = []
+
+    def slow(value, delay):
+        gevent.sleep(delay)
+        finished.append(value)
+
+    with app_.test_request_context():
+        gather(partial(slow, "slow", 0.05), partial(slow, "fast", 0))
+
+    assert finished == ["fast", "slow"]
+
+
+def test_gather_keeps_the_request_context(app_):
+    with app_.test_request_context("/services/1234"):
+        g.current_service = "service one"
+        results = gather(lambda: g.current_service, lambda: request.path)
+
+    assert results == ["service one", "/services/1234"]
+
+
+def test_gather_raises_first_exception_after_all_calls_finish(app_):
+    finished = []
+
+    def fail(message):
+        raise ValueError(message)
+
+    def succeed():
+        gevent.sleep(0.01)
+        finished.append(True)
+
+    with app_.test_request_context(), pytest.raises(ValueError, match="first"):
+        gather(partial(fail, "first"), succeed, partial(fail, "second"))
+
+    assert finished == [True]
+
+
+def test_gather_times_out(app_):
+    with app_.test_request_context(), pytest.raises(GatherTimeout):
+        gather(partial(gevent.sleep, 1), lambda: None, timeout=0.01)
+
+
+def test_gather_runs_calls_one_after_another_with_a_pool_of_one(app_, mocker):
+    spawn = mocker.patch("app.fan_out.Pool.spawn")
+
+    with set_config(app_, "API_FAN_OUT_POOL_SIZE", 1), app_.test_request_context():
+        assert gather(lambda: 1, lambda: 2) == [1, 2]
+
+    assert not spawn.called
@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+
+from app import json_codec
+
+PAYLOAD = {
+    "data": [
+        {"id": "6ce466d0-fd6a-11e5-82f5-e0accb9d11a6", "name": "Modèle", "content": "Hello ((name))", "version": 3},
+        {"id": "fd6a0aa0-6ce4-11e5-82f5-e0accb9d11a6", "name": "Two", "content": None, "archived": False},
+    ],
+    "links": {},
+}
+
+
+@pytest.fixture
+def restore_codec():
+    codec = json_codec.current()
+    yield
+    json_codec.use(codec)
+
+
+@pytest.mark.parametrize(
+    "codec",
+    [json_codec.StdlibCodec, json_codec.OrjsonCodec],
+)
+def test_codecs_round_trip(codec):
+    encoded = codec.dumps(PAYLOAD)
+
+    assert isinstance(encoded, str)
+    assert codec.loads(encoded) == PAYLOAD
+    assert codec.loads(encoded.encode("utf-8")) == PAYLOAD
+    assert codec.loads(codec.dumps({1: "a"})) == {"1": "a"}
+
+
+@pytest.mark.parametrize(
+    "codec",
+    [json_codec.StdlibCodec, json_codec.OrjsonCodec],
+)
+def test_codecs_reject_invalid_json_with_value_error(codec):
+    with pytest.raises(ValueError):
+        codec.loads(b"<html>")
+
+
+def test_auto_picks_orjson_when_installed(restore_codec):
+    json_codec.use(json_codec.AUTO)
+
+    assert json_codec.current() == "orjson"
+
+
+def test_auto_falls_back_to_stdlib_if_orjson_not_installed(mocker, restore_codec):
+    mocker.patch("app.json_codec.orjson", None)
+
+    json_codec.use(json_codec.AUTO)
+
+    assert json_codec.current() == "stdlib"
+
+
+def test_use_orjson(restore_codec):
+    json_codec.use(json_codec.ORJSON)
+
+    assert json_codec.current() == "orjson"
+    assert json_codec.dumps({"a": [1, 2], 3: None}) == '{"a":[1,2],"3":null}'
+    assert json_codec.loads('{"name": "Modèle"}') == {"name": "Modèle"}
+    assert json_codec.loads("{}".encode("utf-8")) == {}
+    assert json_codec.dumps({"created_at": datetime(2024, 1, 1)}) == '{"created_at":"2024-01-01T00:00:00"}'
+
+
+def test_use_stdlib(restore_codec):
+    json_codec.use(json_codec.STDLIB)
+
+    assert json_codec.current() == "stdlib"
+    assert json_codec.dumps({"a": [1, 2]}) == '{"a": [1, 2]}'
+    assert json_codec.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+    with pytest.raises(TypeError):
+        json_codec.dumps({"created_at": datetime(2024, 1, 1)})
+
+
+def test_use_orjson_fails_if_not_installed(mocker, restore_codec):
+    mocker.patch("app.json_codec.orjson", None)
+
+    with pytest.raises(ImportError):
+        json_codec.use(json_codec.ORJSON)
+
+
+def test_use_unknown_codec(restore_codec):
+    with pytest.raises(ValueError) as exception:
+        json_codec.use("simplejson")
+
+    assert str(exception.value) == "JSON_CODEC must be one of auto, stdlib, orjson, not 'simplejson'"
+
+
+def test_app_uses_codec_from_config(app_):
+    assert app_.config["JSON_CODEC"] == "stdlib"
+    assert json_codec.current() == "stdlib"
@@ -0,0 +1,131 @@
+import pickle
+
+import pytest
+
+from app.memoize_cache import SharedCache
+
+
+@pytest.fixture
+def active_redis(mocker):
+    mocker.patch("app.extensions.RedisClient.active", True, create=True)
+
+
+def test_factory_uses_app_config(app_):
+    shared_cache = SharedCache.factory(
+        app_,
+        {"CACHE_KEY_PREFIX": "prefix-", "CACHE_LOCAL_TIMEOUT": 5, "CACHE_THRESHOLD": 10},
+        [],
+        {"default_timeout": 300},
+    )
+
+    assert shared_cache.key_prefix == "prefix-"
+    assert shared_cache.local_timeout == 5
+    assert shared_cache.default_timeout == 300
+
+
+def test_keeps_values_in_memory_without_redis(mocker):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get")
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    shared_cache = SharedCache()
+
+    shared_cache.set("stats", {"total": 1}, timeout=300)
+
+    assert shared_cache.get("stats") == {"total": 1}
+    assert shared_cache.get("other") is None
+    assert not mock_redis_get.called
+    assert not mock_redis_set.called
+
+
+def test_get_reads_from_redis_then_from_memory(active_redis, mocker):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=pickle.dumps({"total": 1}))
+    shared_cache = SharedCache(key_prefix="memoize-")
+
+    assert shared_cache.get("stats") == {"total": 1}
+    assert shared_cache.get("stats") == {"total": 1}
+
+    mock_redis_get.assert_called_once_with("memoize-stats")
+
+
+def test_first_miss_takes_lock_and_set_releases_it(active_redis, mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mock_acquire = mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mock_release = mocker.patch("app.notify_client.single_flight.release")
+    mock_wait_for = mocker.patch("app.notify_client.single_flight.wait_for")
+    shared_cache = SharedCache(key_prefix="memoize-")
+
+    assert shared_cache.get("stats") is None
+    shared_cache.set("stats", {"total": 1}, timeout=300)
+
+    mock_acquire.assert_called_once_with("memoize-stats")
+    assert not mock_wait_for.called
+    mock_redis_set.assert_called_once_with("memoize-stats", pickle.dumps({"total": 1}), ex=300)
+    mock_release.assert_called_once_with("memoize-stats", "token")
+
+
+def test_failed_computation_releases_lock_when_asked_again(active_redis, mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_acquire = mocker.patch("app.notify_client.single_flight.acquire", side_effect=["token-1", "token-2"])
+    mock_release = mocker.patch("app.notify_client.single_flight.release")
+    shared_cache = SharedCache(key_prefix="memoize-")
+
+    # `memoize` never calls `set` if the function raises
+    assert shared_cache.get("stats") is None
+    assert shared_cache.get("stats") is None
+
+    mock_release.assert_called_once_with("memoize-stats", "token-1")
+    assert mock_acquire.call_count == 2
+    assert shared_cache._lock_tokens["memoize-stats"][0] == "token-2"
+
+
+def test_release_locks_releases_locks_for_values_never_stored(active_redis, mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mock_release = mocker.patch("app.notify_client.single_flight.release")
+    shared_cache = SharedCache(key_prefix="memoize-")
+
+    assert shared_cache.get("stats") is None
+    shared_cache.release_locks()
+
+    mock_release.assert_called_once_with("memoize-stats", "token")
+    assert shared_cache._lock_tokens == {}
+
+
+def test_factory_releases_locks_at_end_of_request(app_, active_redis, mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.notify_client.single_flight.acquire", return_value="token")
+    mock_release = mocker.patch("app.notify_client.single_flight.release")
+    shared_cache = SharedCache.factory(
+        app_,
+        {"CACHE_KEY_PREFIX": "memoize-", "CACHE_LOCAL_TIMEOUT": 5, "CACHE_THRESHOLD": 10},
+        [],
+        {"default_timeout": 300},
+    )
+
+    with app_.test_request_context():
+        assert shared_cache.get("stats") is None
+
+    mock_release.assert_called_once_with("memoize-stats", "token")
+
+
+def test_miss_waits_for_worker_holding_lock(active_redis, mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.notify_client.single_flight.acquire", return_value=None)
+    mock_wait_for = mocker.patch("app.notify_client.single_flight.wait_for", return_value=pickle.dumps({"total": 2}))
+    shared_cache = SharedCache(key_prefix="memoize-")
+
+    assert shared_cache.get("stats") == {"total": 2}
+
+    assert mock_wait_for.call_args[0][0] == "memoize-stats"
+
+
+def test_get_many_reads_missing_values_in_one_round_trip(active_redis, mocker):
+    mock_mget = mocker.patch(
+        "app.memoize_cache.redis_client.redis_store.mget", create=True, return_value=[pickle.dumps("v2"), None]
+    )
+    shared_cache = SharedCache(key_prefix="memoize-")
+    shared_cache._local.set("a", "v1")
+
+    assert shared_cache.get_many("a", "b", "c") == ["v1", "v2", None]
+
+    mock_mget.assert_called_once_with(["memoize-b", "memoize-c"])
@@ -0,0 +1,144 @@
+import pytest
+from flask import render_template_string, request
+
+from app import request_timing
+from tests.conftest import set_config
+
+
+def test_record_adds_up_time_and_calls_per_component(app_):
+    with app_.test_request_context():
+        request_timing.reset()
+        request_timing.record(request_timing.API, 0.1)
+        request_timing.record(request_timing.API, 0.2)
+        request_timing.record(request_timing.REDIS, 0.01)
+
+        assert request_timing.summary() == {
+            "api": (pytest.approx(0.3), 2),
+            "redis": (0.01, 1),
+        }
+
+
+def test_server_timing_header():
+    assert request_timing.server_timing_header({"redis": (0.0012, 1), "api": (0.25, 3)}, total=0.5) == (
+        'api;dur=250.0;desc="3 call(s)", redis;dur=1.2;desc="1 call(s)", total;dur=500.0'
+    )
+
+
+def test_render_time_is_only_counted_for_outer_template(app_, mocker):
+    mocker.patch("app.request_timing.monotonic", side_effect=[10, 11, 12, 14])
+
+    with app_.test_request_context():
+        request_timing.reset()
+        request_timing._start_render(app_, None, {})
+        request_timing._start_render(app_, None, {})
+        request_timing._finish_render(app_, None, {})
+        request_timing._finish_render(app_, None, {})
+
+        assert request_timing.summary() == {"render": (4, 1)}
+
+
+def test_rendering_a_template_records_render_time(app_):
+    with app_.test_request_context():
+        request_timing.reset()
+        render_template_string("{{ 1 + 1 }}")
+
+        assert request_timing.summary()["render"][1] == 1
+
+
+def test_server_timing_header_only_added_when_enabled(app_):
+    with app_.test_client() as client:
+        response = client.get("/_status?elb=True")
+        assert "Server-Timing" not in response.headers
+
+        with set_config(app_, "SERVER_TIMING_HEADER_ENABLED", True):
+            response = client.get("/_status?elb=True")
+        assert "total;dur=" in response.headers["Server-Timing"]
+
+
+def test_timings_are_added_to_environ_for_access_log(app_, mocker):
+    mock_info = mocker.patch.object(app_.logger, "info")
+    mock_debug = mocker.patch.object(app_.logger, "debug")
+
+    with app_.test_request_context("/services", method="GET"):
+        request_timing.reset()
+        request_timing.record(request_timing.API, 0.25)
+        request_timing.record(request_timing.REDIS, 0.0012)
+        request_timing.add_timings_after_request(app_.response_class(status=200))
+
+        assert request.environ["notify.timings"] == "api=250.0ms/1 redis=1.2ms/1"
+
+    assert not mock_info.called
+    assert not mock_debug.called
+
+
+def test_environ_says_when_nothing_was_timed(app_):
+    with app_.test_request_context("/_status"):
+        request_timing.reset()
+        request_timing.add_timings_after_request(app_.response_class(status=200))
+
+        assert request.environ["notify.timings"] == "none"
+
+
+def test_redis_pipeline_is_timed_as_one_call(app_, mocker):
+    mocker.patch("redis.client.Pipeline.execute", return_value=[1, True])
+    mocker.patch("app.request_timing.monotonic", side_effect=[10, 10.25])
+    client = request_timing.TimedRedis()
+
+    with app_.test_request_context():
+        request_timing.reset()
+        with client.pipeline(transaction=False) as pipe:
+            pipe.incr("key")
+            pipe.expire("key", 60)
+            assert isinstance(pipe, request_timing.TimedPipeline)
+            assert pipe.execute() == [1, True]
+
+        assert request_timing.summary() == {"redis": (0.25, 1)}
+
+
+def test_call_budget_is_kept_on_view():
+    @request_timing.call_budget(api=2, redis=5)
+    def view():
+        pass
+
+    assert view.call_budget == {"api": 2, "redis": 5}
+
+
+def test_timed_records_elapsed_time(app_, mocker):
+    mocker.patch("app.request_timing.monotonic", side_effect=[10, 10.5])
+
+    with app_.test_request_context():
+        request_timing.reset()
+        with request_timing.timed(request_timing.HTTP):
+            pass
+
+        assert request_timing.summary() == {"http": (0.5, 1)}
+
+
+@pytest.mark.parametrize(
+    "api_calls, expect_warning",
+    [
+        (2, False),
+        (3, True),
+    ],
+)
+def test_going_over_call_budget_logs_a_warning(app_, mocker, api_calls, expect_warning):
+    mock_warning = mocker.patch.object(app_.logger, "warning")
+    mock_incr = mocker.patch("app.request_timing.statsd_client.incr")
+
+    @request_timing.call_budget(api=2)
+    def view():
+        for _ in range(api_calls):
+            request_timing.record(request_timing.API, 0.1)
+
+    with app_.test_request_context("/_status"):
+        request_timing.reset()
+        view()
+        request_timing.add_timings_after_request(app_.response_class(status=200))
+        endpoint = request.endpoint
+
+    if expect_warning:
+        mock_warning.assert_called_once_with("{} made 3 api calls, more than its budget of 2".format(endpoint))
+        mock_incr.assert_called_once_with("call_budget.{}.api.exceeded".format(endpoint))
+    else:
+        assert mock_warning.called is False
+        assert mock_incr.called is False
@@ -56,6 +56,7 @@ def _get_notifications_csv(
         page=1,
         job_id=None,
         template_type=template_type,
+        stream=False,
     ):
         links = {}
         if with_links:
@@ -328,6 +329,7 @@ def test_generate_notifications_csv_only_calls_once_if_no_next_link(
         list(generate_notifications_csv(service_id="1234"))
 
         assert _get_notifications_csv_mock.call_count == 1
+        assert _get_notifications_csv_mock.call_args[1]["stream"] is True
 
 
 @pytest.mark.parametrize("job_id", ["some", None])
@@ -3,13 +3,14 @@ import os
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from typing import List
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+from urllib.parse import urlparse
 from uuid import UUID, uuid4
 
 import pytest
 import requests
 from bs4 import BeautifulSoup
-from flask import Flask, template_rendered, url_for
+from flask import Flask, current_app, template_rendered, url_for
 from notifications_python_client.errors import HTTPError
 from notifications_utils.url_safe_token import generate_token
 from pytest_mock import MockerFixture
@@ -3763,6 +3764,44 @@ def captured_templates(app):
         template_rendered.disconnect(record, app)
 
 
+def declared_api_call_budget(endpoint):
+    """The number of API calls the view for `endpoint` declares it needs with `call_budget`."""
+    return current_app.view_functions[endpoint].call_budget["api"]
+
+
+@contextmanager
+def api_call_budget(max_calls, responses):
+    """
+    Fail if the code inside makes more than `max_calls` calls to the Notify API. Every request the
+    API clients send, after the request memo and the caches, goes through
+    `NotifyAdminAPIClient._send_request`, so that is patched to count them. It answers from
+    `responses`, the JSON (or an error status code) to return for each path:
+
+        with api_call_budget(5, {"/service/{}/template-folder".format(SERVICE_ONE_ID): {"template_folders": []}}):
+            client_request.get("main.choose_template", service_id=SERVICE_ONE_ID)
+
+    Client methods patched by the test don’t send a request, so aren’t counted. Only patch the ones
+    `client_request` logs in with.
+    """
+    calls = []
+
+    def send_request(client, method, url, kwargs):
+        path = urlparse(url).path
+        calls.append("{} {}".format(method, path))
+        assert path in responses, "No response for {} {}".format(method, path)
+
+        response = requests.Response()
+        if isinstance(responses[path], int):
+            response.status_code, response._content = responses[path], b"{}"
+            raise HTTPError(response)
+        response.status_code, response._content = 200, json.dumps(responses[path], default=str).encode("utf-8")
+        return response
+
+    with patch("app.notify_client.NotifyAdminAPIClient._send_request", autospec=True, side_effect=send_request):
+        yield
+    assert len(calls) <= max_calls, "Made {} API calls, more than the budget of {}: {}".format(len(calls), max_calls, calls)
+
+
 @contextmanager
 def set_config(app, name, value):
     old_val = app.config.get(name)